@@ -0,0 +1,88 @@
+"""
+This module compares two results of `benchmarks.run` (e.g. of two commits): the median
+of every benchmark they share and the ratio between them.
+
+A benchmark whose ratio (head / base) exceeds the threshold is a regression, and the
+exit status is 1 if there is any, so the comparison can gate a CI job. Results of
+different datasets or machines are compared anyway, with a warning.
+
+Usage:
+    python -m benchmarks.compare base.json head.json --threshold 1.10
+"""
+
+import argparse
+import sys
+import orjson
+
+
+def load(file_path: str) -> dict:
+    """
+    Reads a results document.
+    """
+    with open(file_path, "rb") as file:
+        return orjson.loads(file.read())
+
+
+def compare(base: dict, head: dict, threshold: float = 1.10) -> list[dict]:
+    """
+    Compares the medians of the benchmarks present in both results.
+
+    Args:
+        base (dict): The results to compare against.
+        head (dict): The new results.
+        threshold (float): Ratio (head / base) above which a benchmark regressed.
+
+    Returns:
+        list[dict]: The name, medians, ratio and verdict of every shared benchmark.
+    """
+    rows = []
+
+    for name, before in base["benchmarks"].items():
+        after = head["benchmarks"].get(name)
+
+        if after is None:
+            continue
+
+        ratio = after["median"] / before["median"] if before["median"] else float("inf")
+        rows.append({
+            "name": name,
+            "base": before["median"],
+            "head": after["median"],
+            "ratio": ratio,
+            "verdict": (
+                "regression" if ratio > threshold
+                else "improvement" if ratio < 1 / threshold
+                else "unchanged"
+            ),
+        })
+
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compares two benchmark results.")
+    parser.add_argument("base")
+    parser.add_argument("head")
+    parser.add_argument("--threshold", type=float, default=1.10)
+    arguments = parser.parse_args()
+
+    base, head = load(arguments.base), load(arguments.head)
+
+    if base["dataset"]["records"] != head["dataset"]["records"]:
+        print("Warning: the results were taken on different datasets.")
+    if base["machine"] != head["machine"]:
+        print("Warning: the results were taken on different machines.")
+
+    print(f"{'benchmark':<22} {'base (s)':>10} {'head (s)':>10} {'ratio':>7}")
+
+    rows = compare(base, head, arguments.threshold)
+
+    for row in rows:
+        print(f"{row['name']:<22} {row['base']:>10.4f} {row['head']:>10.4f} "
+              f"{row['ratio']:>7.2f}  {row['verdict']}")
+
+    sys.exit(1 if any(row["verdict"] == "regression" for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+This module generates a synthetic school: the `alumnos.dbf`, `cargas.dbf`,
+`asignaturas.dbf` and `HISTORIALES.dbf` tables of the system, at any scale (from a
+thousand to a million students), for the benchmarks (`benchmarks.run`).
+
+The school has six grades of `subjects` subjects each, and groups of `group_size`
+students. Every student has:
+- An academic load of one record per subject of their grade, with the first one, two
+  or three partials completed (the same for every subject).
+- The complete history of the previous grade (from the second grade on).
+- For `history_rate` of the students, a history of the current grade that lags one
+  partial behind the load, so the history rebuild has updates as well as inserts.
+
+`HISTORIALES.dbf` also carries the histories of `orphan_rate` students who are no
+longer in `alumnos.dbf` (former students), which `check_student_status` deletes.
+
+The tables are written directly as dBase III files (code page cp1252, like the ones of
+the school system), a chunk of students at a time with NumPy, so a million students
+take seconds instead of the hours of appending record by record. The same arguments
+always produce the same files.
+
+Usage:
+    python -m benchmarks.dataset --students 100000 --out /tmp/school
+"""
+
+import argparse
+from datetime import date
+from os import makedirs, path
+from struct import pack
+from time import perf_counter
+import numpy as np
+
+GRADES = 6
+CHUNK = 50_000
+CODEPAGE = 0x03
+ENCODING = "cp1252"
+
+STUDENT_FIELDS = [
+    ("MATRICULA", "C", 15, 0), ("NOMBRES", "C", 30, 0), ("APELLIDOS", "C", 30, 0),
+    ("CURP", "C", 18, 0), ("GRADO", "N", 1, 0), ("GRUPO", "C", 2, 0), ("STATUSA", "C", 1, 0),
+]
+SUBJECT_FIELDS = [
+    ("ASIGNATURA", "C", 30, 0), ("CLAVE", "C", 10, 0), ("CLAVE_IN", "C", 10, 0),
+    ("PERIODO", "C", 2, 0),
+]
+LOAD_FIELDS = [
+    ("MATRICULA", "C", 15, 0), ("CLAVE_IN", "C", 10, 0), ("CLAVEMAT", "C", 10, 0),
+    ("PARCIAL_1", "N", 4, 1), ("FALTAS_1", "N", 2, 0),
+    ("PARCIAL_2", "N", 4, 1), ("FALTAS_2", "N", 2, 0),
+    ("PARCIAL_3", "N", 4, 1), ("FALTAS_3", "N", 2, 0),
+    ("PROMEDIO", "N", 4, 1), ("OBSERVA", "C", 20, 0), ("PALABRA", "C", 20, 0),
+]
+HISTORY_FIELDS = [
+    ("MATRICULA", "C", 15, 0), ("GRADO", "N", 1, 0), ("GRUPO", "C", 2, 0),
+    ("CLAVEMAT", "C", 10, 0), ("ASIGNATURA", "C", 30, 0),
+    ("PARCIAL_1", "N", 4, 1), ("PARCIAL_2", "N", 4, 1), ("PARCIAL_3", "N", 4, 1),
+    ("PROMEDIO", "N", 4, 1), ("OBSERVA", "C", 20, 0),
+]
+
+NAMES = [
+    "JOSÉ", "MARÍA", "JUAN", "GUADALUPE", "LUIS", "ANA", "CARLOS", "FERNANDA", "JESÚS",
+    "SOFÍA", "MIGUEL", "XIMENA", "ÁNGEL", "VALERIA", "DIEGO", "RENATA",
+]
+SURNAMES = [
+    "HERNÁNDEZ", "GARCÍA", "MARTÍNEZ", "LÓPEZ", "GONZÁLEZ", "PÉREZ", "RODRÍGUEZ",
+    "SÁNCHEZ", "RAMÍREZ", "CRUZ", "FLORES", "GÓMEZ", "MUÑOZ", "DÍAZ", "REYES", "MORALES",
+]
+SUBJECTS = [
+    "MATEMÁTICAS", "QUÍMICA", "FÍSICA", "BIOLOGÍA", "INGLÉS", "HISTORIA", "LITERATURA",
+    "FILOSOFÍA", "INFORMÁTICA", "ECONOMÍA", "GEOGRAFÍA", "ÉTICA",
+]
+GROUPS = [chr(65 + first) for first in range(26)] + [
+    chr(65 + first) + chr(65 + second) for first in range(26) for second in range(26)
+]
+
+
+class DBFTableWriter:
+    """
+    Sequential writer of a dBase III table.
+
+    The header is written when the table is closed, with the number of records written.
+
+    Attributes:
+        file_path (str): Path of the DBF file.
+        fields (list[tuple[str, str, int, int]]): Name, type ("C" or "N"), length and
+        decimals of every field.
+        count (int): Number of records written.
+    """
+
+    def __init__(self, file_path: str, fields: list[tuple[str, str, int, int]]) -> None:
+        self.file_path = file_path
+        self.fields = fields
+        self.count = 0
+        self.header_length = 32 * (len(fields) + 1) + 1
+        self.record_length = 1 + sum(length for _, _, length, _ in fields)
+        self._file = open(file_path, "wb")
+        self._file.write(b"\x00" * self.header_length)
+
+    def __enter__(self) -> "DBFTableWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, columns: dict[str, np.ndarray]) -> None:
+        """
+        Appends records, given as one array per field: bytes for character fields and
+        floats (NaN for blank) for numeric ones.
+        """
+        count = len(columns[self.fields[0][0]])
+        records = np.full((count, self.record_length), ord(" "), dtype=np.uint8)
+        offset = 1
+
+        for name, type_, length, decimals in self.fields:
+            values = columns.get(name)
+
+            if values is not None:
+                cells = (
+                    format_numbers(values, length, decimals) if type_ == "N"
+                    else format_text(values, length)
+                )
+                records[:, offset:offset + length] = cells
+            offset += length
+
+        self._file.write(records.tobytes())
+        self.count += count
+
+    def header(self) -> bytes:
+        """
+        Returns the header of the table, with the field descriptors.
+        """
+        today = date.today()
+        header = pack(
+            "<BBBBIHH20x", 0x03, today.year - 1900, today.month, today.day,
+            self.count, self.header_length, self.record_length
+        )
+        header = header[:29] + bytes([CODEPAGE]) + header[30:]
+        offset = 1
+
+        for name, type_, length, decimals in self.fields:
+            header += pack(
+                "<11scIBB14x", name.encode("ascii"), type_.encode("ascii"), offset,
+                length, decimals
+            )
+            offset += length
+
+        return header + b"\x0d"
+
+    def close(self) -> None:
+        """
+        Writes the end-of-file marker and the header, and closes the file.
+        """
+        if self._file.closed:
+            return
+
+        self._file.write(b"\x1a")
+        self._file.seek(0)
+        self._file.write(self.header())
+        self._file.close()
+
+
+def format_text(values: np.ndarray, length: int) -> np.ndarray:
+    """
+    Returns the cells (a `uint8` matrix) of a character field: the bytes, left aligned
+    and padded with spaces (truncated to `length`).
+    """
+    cells = np.ascontiguousarray(np.asarray(values).astype(f"S{length}"))
+    cells = cells.view(np.uint8).reshape(len(cells), length).copy()
+    cells[cells == 0] = ord(" ")
+
+    return cells
+
+
+def format_numbers(values: np.ndarray, length: int, decimals: int) -> np.ndarray:
+    """
+    Returns the cells (a `uint8` matrix) of a numeric field: the non-negative numbers
+    right aligned with `decimals` places, or blank for NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    blank = np.isnan(values)
+    remaining = np.rint(np.where(blank, 0, values) * 10 ** decimals).astype(np.int64)
+    cells = np.full((len(values), length), ord(" "), dtype=np.uint8)
+    column = length - 1
+
+    for _ in range(decimals):
+        cells[:, column] = ord("0") + remaining % 10
+        remaining //= 10
+        column -= 1
+
+    if decimals:
+        cells[:, column] = ord(".")
+        column -= 1
+
+    cells[:, column] = ord("0") + remaining % 10
+    remaining //= 10
+
+    for column in range(column - 1, -1, -1):
+        digits = remaining > 0
+        cells[digits, column] = ord("0") + remaining[digits] % 10
+        remaining //= 10
+
+    cells[blank] = ord(" ")
+    return cells
+
+
+def encode(values: list[str]) -> np.ndarray:
+    """
+    Returns a list of strings as an array of cp1252 bytes.
+    """
+    return np.array([value.encode(ENCODING) for value in values])
+
+
+def enrollments(ids: np.ndarray, grades: np.ndarray) -> np.ndarray:
+    """
+    Returns the enrollments (MATRICULA) of the students, e.g. "22A0710217M0001": year of
+    admission, school, sex and a number, unique for every ID.
+    """
+    return encode([
+        f"{22 - (grade - 1) // 2:02d}A07{10217 + index // 10000:05d}"
+        f"{'HM'[index % 2]}{index % 10000:04d}"
+        for index, grade in zip(ids.tolist(), grades.tolist())
+    ])
+
+
+def curps(ids: np.ndarray, births: np.ndarray) -> np.ndarray:
+    """
+    Returns the CURPs of the students, unique for every ID.
+    """
+    def letters(index: int) -> str:
+        return "".join(chr(65 + index // 26 ** power % 26) for power in (3, 2, 1, 0))
+
+    return encode([
+        f"{letters(index)}{birth:06d}{'HM'[index % 2]}DFRRN{index // 26 ** 4 % 100:02d}"
+        for index, birth in zip(ids.tolist(), births.tolist())
+    ])
+
+
+def subject_codes(subjects: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the `CLAVE_IN`, `CLAVEMAT` and name of every subject, as (grade, subject)
+    matrices.
+    """
+    keys = [[f"{grade}{subject:02d}" for subject in range(subjects)] for grade in range(1, 7)]
+
+    return (
+        np.array([[f"IN{key}".encode() for key in row] for row in keys]),
+        np.array([[f"M{key}".encode() for key in row] for row in keys]),
+        np.array([
+            [f"{SUBJECTS[subject % len(SUBJECTS)]} {grade}".encode(ENCODING)
+             for subject in range(subjects)]
+            for grade in range(1, 7)
+        ]),
+    )
+
+
+def histories(
+        students: dict, grades: np.ndarray, completed: np.ndarray, subjects: int,
+        codes: tuple, rng: np.random.Generator
+) -> dict[str, np.ndarray]:
+    """
+    Returns the history records of a set of students (`students` has their MATRICULA and
+    GRUPO) for the given grades, with the first `completed` partials of every subject.
+    """
+    student = np.repeat(np.arange(len(grades)), subjects)
+    subject = np.tile(np.arange(subjects), len(grades))
+    grade = grades[student]
+    partials = rng.integers(5, 11, size=(3, len(student))).astype(np.float64)
+
+    for number in range(3):
+        partials[number, completed[student] <= number] = np.nan
+
+    average = np.where(completed[student] == 3, np.rint(partials.mean(axis=0)), np.nan)
+
+    return {
+        "MATRICULA": students["MATRICULA"][student],
+        "GRADO": grade.astype(np.float64),
+        "GRUPO": students["GRUPO"][student],
+        "CLAVEMAT": codes[1][grade - 1, subject],
+        "ASIGNATURA": codes[2][grade - 1, subject],
+        "PARCIAL_1": partials[0],
+        "PARCIAL_2": partials[1],
+        "PARCIAL_3": partials[2],
+        "PROMEDIO": average,
+        "OBSERVA": np.where(
+            np.isnan(average), b"", np.where(average >= 6, b"APROBADO", b"REPROBADO")
+        ),
+    }
+
+
+def write_chunk(
+        writers: dict[str, DBFTableWriter], ids: np.ndarray, subjects: int, group_size: int,
+        history_rate: float, codes: tuple, rng: np.random.Generator
+) -> None:
+    """
+    Writes the students of a chunk (consecutive IDs), their academic loads and histories.
+    """
+    count = len(ids)
+    grades = (ids % GRADES + 1).astype(np.int64)
+    groups = np.array([group.encode() for group in GROUPS])[
+        ids // GRADES // group_size % len(GROUPS)
+    ]
+    students = {
+        "MATRICULA": enrollments(ids, grades),
+        "NOMBRES": encode(NAMES)[rng.integers(0, len(NAMES), count)],
+        "APELLIDOS": np.char.add(
+            np.char.add(encode(SURNAMES)[rng.integers(0, len(SURNAMES), count)], b" "),
+            encode(SURNAMES)[rng.integers(0, len(SURNAMES), count)]
+        ),
+        "CURP": curps(ids, rng.integers(1, 29, count) + 100 * rng.integers(1, 13, count)
+                      + 10000 * rng.integers(0, 10, count)),
+        "GRADO": grades.astype(np.float64),
+        "GRUPO": groups,
+        "STATUSA": np.full(count, b"A"),
+    }
+    writers["alumnos.dbf"].write(students)
+
+    completed = rng.integers(1, 4, count)
+    student = np.repeat(np.arange(count), subjects)
+    subject = np.tile(np.arange(subjects), count)
+    loads = {
+        "MATRICULA": students["MATRICULA"][student],
+        "CLAVE_IN": codes[0][grades[student] - 1, subject],
+        "CLAVEMAT": codes[1][grades[student] - 1, subject],
+    }
+
+    for number in range(1, 4):
+        pending = completed[student] < number
+        loads[f"PARCIAL_{number}"] = np.where(
+            pending, np.nan, rng.integers(5, 11, len(student)).astype(np.float64)
+        )
+        loads[f"FALTAS_{number}"] = np.where(
+            pending, np.nan, rng.integers(0, 6, len(student)).astype(np.float64)
+        )
+
+    writers["cargas.dbf"].write(loads)
+
+    previous = np.flatnonzero(grades > 1)
+    writers["HISTORIALES.dbf"].write(histories(
+        {name: students[name][previous] for name in ("MATRICULA", "GRUPO")},
+        grades[previous] - 1, np.full(len(previous), 3), subjects, codes, rng
+    ))
+
+    current = np.flatnonzero(rng.random(count) < history_rate)
+    writers["HISTORIALES.dbf"].write(histories(
+        {name: students[name][current] for name in ("MATRICULA", "GRUPO")},
+        grades[current], completed[current] - 1, subjects, codes, rng
+    ))
+
+
+def generate(
+        directory: str, students: int, subjects: int = 8, group_size: int = 40,
+        history_rate: float = 0.5, orphan_rate: float = 0.01, seed: int = 0
+) -> dict:
+    """
+    Writes the tables of a synthetic school.
+
+    Args:
+        directory (str): Directory the tables are written to (created if needed).
+        students (int): Number of students.
+        subjects (int): Subjects per grade.
+        group_size (int): Students per group.
+        history_rate (float): Share of the students with a history of their current grade.
+        orphan_rate (float): Former students with histories, as a share of `students`.
+        seed (int): Seed of the random grades, names and CURPs.
+
+    Returns:
+        dict: The arguments, the records of every table and the seconds spent.
+    """
+    started = perf_counter()
+    makedirs(directory, exist_ok=True)
+    codes = subject_codes(subjects)
+    orphans = int(students * orphan_rate)
+
+    with DBFTableWriter(path.join(directory, "asignaturas.dbf"), SUBJECT_FIELDS) as catalog:
+        grade = np.repeat(np.arange(1, 7), subjects)
+        catalog.write({
+            "ASIGNATURA": codes[2].ravel(),
+            "CLAVE": codes[1].ravel(),
+            "CLAVE_IN": codes[0].ravel(),
+            "PERIODO": np.array([str(number).encode() for number in grade]),
+        })
+
+    writers = {
+        name: DBFTableWriter(path.join(directory, name), fields)
+        for name, fields in (
+            ("alumnos.dbf", STUDENT_FIELDS), ("cargas.dbf", LOAD_FIELDS),
+            ("HISTORIALES.dbf", HISTORY_FIELDS),
+        )
+    }
+
+    try:
+        for number, first in enumerate(range(0, students, CHUNK)):
+            write_chunk(
+                writers, np.arange(first, min(first + CHUNK, students)), subjects,
+                group_size, history_rate, codes, np.random.default_rng([seed, number])
+            )
+
+        if orphans:
+            ids = np.arange(students, students + orphans)
+            writers["HISTORIALES.dbf"].write(histories(
+                {"MATRICULA": enrollments(ids, np.full(orphans, GRADES)),
+                 "GRUPO": np.full(orphans, b"A")},
+                np.full(orphans, GRADES), np.full(orphans, 3), subjects, codes,
+                np.random.default_rng(seed)
+            ))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {
+        "students": students,
+        "subjects": subjects,
+        "group_size": group_size,
+        "history_rate": history_rate,
+        "orphans": orphans,
+        "seed": seed,
+        "records": {
+            "alumnos.dbf": students,
+            "asignaturas.dbf": catalog.count,
+            **{name: writer.count for name, writer in writers.items() if name != "alumnos.dbf"},
+        },
+        "seconds": round(perf_counter() - started, 3),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generates a synthetic school dataset.")
+    parser.add_argument("--students", type=int, default=1000)
+    parser.add_argument("--subjects", type=int, default=8)
+    parser.add_argument("--group-size", type=int, default=40)
+    parser.add_argument("--history-rate", type=float, default=0.5)
+    parser.add_argument("--orphan-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", required=True, help="Directory of the tables.")
+    arguments = parser.parse_args()
+
+    print(generate(
+        arguments.out, arguments.students, arguments.subjects, arguments.group_size,
+        arguments.history_rate, arguments.orphan_rate, arguments.seed
+    ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+"""
+This module runs the benchmarks of the services over a synthetic school
+(`benchmarks.dataset`) and stores the timings as JSON, to compare them between commits
+(`benchmarks.compare`).
+
+Benchmarks:
+- `snapshot`: Builds the read-side snapshot (`utils.snapshot_tools`) from the tables.
+- `load_services`: `LoadServices.get_academic_load` (first partial) for the sample.
+- `history_services`: `HistoryServices.get_histories` (semiannual of the previous grade)
+  for the sample. Every call scans `HISTORIALES.dbf`, so use a small `--sample` at the
+  larger scales.
+- `auth_services`: `AuthServices.login` for the sample.
+- `ratings_partial` and `ratings_semiannual`: The `Ratings` engine over the academic
+  loads and the previous histories of the sample (the records are copied beforehand).
+- `rebuild`: `RebuildServices.rebuild`, inline (the successor of `each_student`). The
+  sharded backends re-import the models in their workers, which would read the tables
+  of the server instead of the dataset.
+- `check_student_status`: The reconciliation task, forced.
+
+Every benchmark runs `warmup` times untimed and `repeat` times timed, with the garbage
+collector disabled while timed; the services are timed with a warm snapshot. The
+benchmarks that write the tables (`rebuild`, `check_student_status`) run every time on
+a fresh copy of the dataset, so the dataset is never modified.
+
+The tables of the system are redirected to a scratch copy of the dataset for the whole
+run (`workspace`), so the `db` directory of the server is not touched. The run needs
+the environment of the server (`.env`: `SECRET_KEY`, `ALGORITHM`, `TOKEN_EXPIRE_DAYS`).
+
+Usage:
+    python -m benchmarks.run --students 10000
+    python -m benchmarks.run --dataset /tmp/school --repeat 10 --only rebuild auth_services
+    python -m benchmarks.compare benchmarks/results/<base>.json benchmarks/results/<head>.json
+"""
+
+import argparse
+import gc
+import platform
+import shutil
+import subprocess
+from contextlib import ExitStack, contextmanager
+from copy import deepcopy
+from datetime import datetime, timezone
+from os import cpu_count, makedirs, path
+from statistics import mean, median, stdev
+from tempfile import mkdtemp
+from time import perf_counter
+from typing import Callable
+from unittest import mock
+import numpy as np
+import orjson
+from benchmarks.dataset import generate
+from models.history_model import HISTORIAL
+from models.load_model import CARGA
+from models.student_model import ALUMNO
+from models.topic_model import ASIGNATURA
+from services.auth_services import AuthServices
+from services.history_services import HistoryServices
+from services.load_services import LoadServices
+from services.rebuild_services import RebuildServices
+from tasks import celery_tasks
+from utils import dataset_tools, report_tools
+from utils.dbf_tools import DBFReader
+from utils.rating_tools import Ratings
+from utils.snapshot_tools import SnapshotRecord, snapshots
+
+ROOT = path.abspath(path.join(path.dirname(__file__), ".."))
+DATA_DIR = path.join(ROOT, "benchmarks", "data")
+RESULTS_DIR = path.join(ROOT, "benchmarks", "results")
+TABLES = {
+    ALUMNO: "alumnos.dbf",
+    CARGA: "cargas.dbf",
+    ASIGNATURA: "asignaturas.dbf",
+    HISTORIAL: "HISTORIALES.dbf",
+}
+
+BENCHMARKS: dict[str, "Benchmark"] = {}
+
+
+class Benchmark:
+    """
+    A registered benchmark.
+
+    Attributes:
+        name (str): Name of the benchmark in the results.
+        setup (Callable): Receives the `Context` and returns the function to time and the
+        number of operations it performs.
+        fresh (bool): Whether it needs a fresh copy of the dataset on every run.
+    """
+
+    def __init__(self, name: str, setup: Callable, fresh: bool) -> None:
+        self.name = name
+        self.setup = setup
+        self.fresh = fresh
+
+
+def benchmark(name: str, fresh: bool = False) -> Callable:
+    """
+    Registers the setup function of a benchmark.
+    """
+    def register(setup: Callable) -> Callable:
+        BENCHMARKS[name] = Benchmark(name, setup, fresh)
+        return setup
+
+    return register
+
+
+class Context:
+    """
+    The dataset the benchmarks run on, and the sample of students they query.
+
+    Attributes:
+        dataset (str): Directory of the generated tables (never modified).
+        directory (str): Scratch directory the tables of the system point to.
+        sample (list[dict]): MATRICULA, CURP and GRADO of the sampled students (from the
+        second grade on, so they have a previous history).
+    """
+
+    def __init__(self, dataset: str, directory: str, size: int, seed: int) -> None:
+        self.dataset = dataset
+        self.directory = directory
+
+        with DBFReader(path.join(dataset, "alumnos.dbf")) as students:
+            rows = [
+                row for row in students.rows(["MATRICULA", "CURP", "GRADO"]) if row["GRADO"] > 1
+            ]
+
+        picked = np.random.default_rng(seed).choice(
+            len(rows), min(size, len(rows)), replace=False
+        )
+        self.sample = [rows[index] for index in sorted(picked.tolist())]
+        self._histories = None
+
+    def histories(self) -> list[list[dict]]:
+        """
+        Returns the history records of the previous grade of every sampled student.
+        """
+        if self._histories is None:
+            self._histories = [
+                HISTORIAL().get_all(
+                    MATRICULA=student["MATRICULA"], GRADO=str(student["GRADO"] - 1),
+                    easy_view=True
+                )
+                for student in self.sample
+            ]
+        return self._histories
+
+    def reset(self) -> None:
+        """
+        Replaces the scratch tables with a fresh copy of the dataset and drops the state
+        derived from them (generation, reports and snapshot).
+        """
+        shutil.rmtree(self.directory, ignore_errors=True)
+        makedirs(self.directory)
+
+        for name in TABLES.values():
+            shutil.copyfile(path.join(self.dataset, name), path.join(self.directory, name))
+
+        snapshots._key = snapshots._snapshot = None
+
+
+@contextmanager
+def workspace(directory: str):
+    """
+    Points the tables of the system, the dataset generation and the derived files
+    (reports, reconciliation) to `directory` while the block runs.
+    """
+    with ExitStack() as stack:
+        for model, name in TABLES.items():
+            stack.enter_context(mock.patch.object(model, "__ctx__", path.join(directory, name)))
+
+        for module, attribute, target in (
+                (dataset_tools, "DB_DIR", directory),
+                (dataset_tools, "STAGING_DIR", path.join(directory, ".staging")),
+                (dataset_tools, "GENERATION_FILE", path.join(directory, "generation.json")),
+                (dataset_tools, "LOCK_FILE", path.join(directory, ".generation.lock")),
+                (report_tools, "REPORTS_DIR", path.join(directory, "reports")),
+                (celery_tasks, "RECONCILE_FILE", path.join(directory, "reconcile.json")),
+        ):
+            stack.enter_context(mock.patch.object(module, attribute, target))
+
+        try:
+            yield
+        finally:
+            snapshots._key = snapshots._snapshot = None
+
+
+@benchmark("snapshot")
+def snapshot_setup(context: Context):
+    snapshots._key = snapshots._snapshot = None
+    return snapshots.current, 1
+
+
+@benchmark("load_services")
+def load_services_setup(context: Context):
+    snapshots.current()
+    services = LoadServices()
+
+    def calls():
+        for student in context.sample:
+            services.get_academic_load(student["MATRICULA"], 1)
+
+    return calls, len(context.sample)
+
+
+@benchmark("history_services")
+def history_services_setup(context: Context):
+    services = HistoryServices()
+
+    def calls():
+        for student in context.sample:
+            services.get_histories(student["MATRICULA"], 6, str(student["GRADO"] - 1))
+
+    return calls, len(context.sample)
+
+
+@benchmark("auth_services")
+def auth_services_setup(context: Context):
+    snapshots.current()
+    services = AuthServices()
+
+    def calls():
+        for student in context.sample:
+            services.login(student["CURP"], student["MATRICULA"])
+
+    return calls, len(context.sample)
+
+
+def ratings_setup(partial: int, reports: list[list[dict]]):
+    """
+    Returns a run of the `Ratings` engine over copies of the records of every student.
+    """
+    copies = deepcopy(reports)
+
+    def calls():
+        for records in copies:
+            Ratings(records, partial) + SnapshotRecord()
+
+    return calls, len(copies)
+
+
+@benchmark("ratings_partial")
+def ratings_partial_setup(context: Context):
+    snapshot = snapshots.current()
+    return ratings_setup(1, [
+        snapshot.get_academic_load(student["MATRICULA"]) for student in context.sample
+    ])
+
+
+@benchmark("ratings_semiannual")
+def ratings_semiannual_setup(context: Context):
+    return ratings_setup(6, context.histories())
+
+
+@benchmark("rebuild", fresh=True)
+def rebuild_setup(context: Context):
+    return lambda: RebuildServices().rebuild(backend="inline"), 1
+
+
+@benchmark("check_student_status", fresh=True)
+def check_student_status_setup(context: Context):
+    def reconcile() -> dict:
+        summary = celery_tasks.check_student_status(force=True)
+
+        # The task logs its errors and returns None: a failed run must not be timed.
+        if not isinstance(summary, dict) or "deleted" not in summary:
+            raise RuntimeError("check_student_status failed, see the error log")
+        return summary
+
+    return reconcile, 1
+
+
+def measure(case: Benchmark, context: Context, repeat: int, warmup: int) -> dict:
+    """
+    Times a benchmark.
+
+    Returns:
+        dict: The operations of a run, the seconds of every timed run and their
+        statistics, the seconds per operation (median) and the summary returned by the
+        last run, if any (e.g. the inserts and updates of the rebuild).
+    """
+    runs, result = [], None
+
+    for number in range(warmup + repeat):
+        if case.fresh:
+            context.reset()
+
+        func, operations = case.setup(context)
+        gc.collect()
+        gc.disable()
+
+        try:
+            started = perf_counter()
+            result = func()
+            elapsed = perf_counter() - started
+        finally:
+            gc.enable()
+
+        if number >= warmup:
+            runs.append(elapsed)
+
+    return {
+        "operations": operations,
+        "runs": [round(run, 6) for run in runs],
+        "min": round(min(runs), 6),
+        "median": round(median(runs), 6),
+        "mean": round(mean(runs), 6),
+        "stdev": round(stdev(runs), 6) if len(runs) > 1 else 0.0,
+        "per_operation": round(median(runs) / max(operations, 1), 9),
+        "result": result if isinstance(result, dict) else None,
+    }
+
+
+def revision() -> dict:
+    """
+    Returns the commit of the tree and whether it has uncommitted changes.
+    """
+    def git(*arguments: str) -> str:
+        return subprocess.run(
+            ["git", *arguments], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain"))}
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+
+
+def run(
+        dataset: str, names: list[str], repeat: int = 5, warmup: int = 1, sample: int = 20,
+        seed: int = 0
+) -> dict:
+    """
+    Runs benchmarks over a dataset.
+
+    Args:
+        dataset (str): Directory of the generated tables.
+        names (list[str]): The benchmarks to run.
+        repeat (int): Timed runs of every benchmark.
+        warmup (int): Untimed runs before them.
+        sample (int): Students queried by the service benchmarks.
+        seed (int): Seed of the sample.
+
+    Returns:
+        dict: The results document.
+    """
+    scratch = mkdtemp(prefix="benchmark-")
+
+    try:
+        with workspace(scratch):
+            context = Context(dataset, scratch, sample, seed)
+            results = {}
+
+            for name in names:
+                context.reset()
+                results[name] = measure(BENCHMARKS[name], context, repeat, warmup)
+                print(f"{name:<22} {results[name]['median']:>10.4f} s "
+                      f"({results[name]['per_operation'] * 1000:.3f} ms/op)")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    records = {}
+
+    for name in TABLES.values():
+        with DBFReader(path.join(dataset, name)) as table:
+            records[name] = len(table)
+
+    return {
+        **revision(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpus": cpu_count(),
+        },
+        "dataset": {
+            "path": path.abspath(dataset),
+            "students": records["alumnos.dbf"],
+            "records": records,
+        },
+        "settings": {"repeat": repeat, "warmup": warmup, "sample": sample, "seed": seed},
+        "benchmarks": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmarks the services of the API.")
+    parser.add_argument("--dataset", help="Directory of the tables (see benchmarks.dataset).")
+    parser.add_argument("--students", type=int, default=10000,
+                        help="Students of the dataset generated when --dataset is not given.")
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--sample", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="File of the results (benchmarks/results by default).")
+    arguments = parser.parse_args()
+
+    dataset = arguments.dataset
+
+    if dataset is None:
+        dataset = path.join(DATA_DIR, f"{arguments.students}-{arguments.seed}")
+
+        if not path.exists(path.join(dataset, "HISTORIALES.dbf")):
+            print(generate(dataset, arguments.students, seed=arguments.seed))
+
+    results = run(
+        dataset, arguments.only, arguments.repeat, arguments.warmup, arguments.sample,
+        arguments.seed
+    )
+    target = arguments.out or path.join(
+        RESULTS_DIR,
+        f"{(results['commit'] or 'unknown')[:10]}-{results['dataset']['students']}.json"
+    )
+    makedirs(path.dirname(path.abspath(target)), exist_ok=True)
+
+    with open(target, "wb") as file:
+        file.write(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+    print(f"Results written to {target}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,16 @@ The primary functionality of this module is:
 
 Components:
 - The `authenticate` decorator: Wraps a function to add authentication logic.
-- Custom error handling: Raises `IncorrectUserError` if validation fails.
+- The `administrator` decorator: Restricts an endpoint to the administration, which
+  identifies itself with the `access` query parameter (`Config.ACCESS_TOKEN`).
+- Custom error handling: Raises `IncorrectUserError` or `TokenNotAllowed` if validation fails.
 """
 
 from functools import wraps
 from typing import Callable
 from fastapi.requests import Request
-from errors.errors import IncorrectUserError
+from errors.errors import IncorrectUserError, TokenNotAllowed
+from utils.config_secrets import Config
 from utils.token_tools import verify_token
 
 
@@ -24,6 +27,8 @@ def authenticate(func: Callable) -> Callable:
 
     This decorator validates the JWT token provided in the 'Authorization' header of the request
     and checks whether the user enrollment matches the enrollment specified in the request.
+    The claims verified by `CustomHTTPBearer` (`request.state.claims`) are reused, so the
+    token is not decoded twice.
 
     Args:
         func (Callable): The function to be wrapped by the decorator.
@@ -52,10 +57,52 @@ def authenticate(func: Callable) -> Callable:
             IncorrectUserError: If the user's enrollment does not match the expected enrollment.
         """
         request: Request = kwargs.get("request")
-        user_req: dict = verify_token(request.headers.get("authorization")[7:])
+        user_req: dict | None = getattr(request.state, "claims", None)
+
+        if user_req is None:
+            user_req = verify_token(request.headers.get("authorization")[7:])
 
         if user_req["enrollment"] == kwargs.get("enrollment"):
             return await func(*args, **kwargs)
         raise IncorrectUserError()
 
     return wrapper
+
+
+def administrator(func: Callable) -> Callable:
+    """
+    A decorator that restricts an endpoint to the administration.
+
+    The request must carry the access token of the administration (`Config.ACCESS_TOKEN`)
+    in the `access` query parameter, as the database upload does.
+
+    Args:
+        func (Callable): The function to be wrapped by the decorator.
+
+    Returns:
+        Callable: The wrapped function with the access check.
+
+    Raises:
+        TokenNotAllowed: If the access token is missing or wrong.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> Callable:
+        """
+        Inner function that checks the access token before executing the decorated function.
+
+        Args:
+            *args: Positional arguments passed to the decorated function.
+            **kwargs: Keyword arguments passed to the decorated function.
+                      It must include the 'access' key.
+
+        Returns:
+            The result of the decorated function if the access token is correct.
+
+        Raises:
+            TokenNotAllowed: If the access token is missing or wrong.
+        """
+        if Config.ACCESS_TOKEN and kwargs.get("access") == Config.ACCESS_TOKEN:
+            return await func(*args, **kwargs)
+        raise TokenNotAllowed()
+
+    return wrapper
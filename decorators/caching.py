@@ -0,0 +1,169 @@
+"""
+This module provides a response-caching decorator for the read endpoints of the API.
+
+The responses of the student, load and history endpoints only change when a DBF table
+is uploaded, so the serialized body of every successful response is kept in an
+in-process `ResponseCache` (see `utils.cache_tools`), keyed by:
+- The route (the name of the decorated endpoint).
+- The `enrollment`, `partial` and `rank` arguments of the request.
+- The current dataset generation (see `utils.dataset_tools`).
+
+Bodies are cached as `EncodedBody` objects (see `utils.response_tools`), which compress
+a body only for the coding a request negotiates with `Accept-Encoding` and keep that
+variant, so a body is compressed at most once per coding, and a body the cache does not
+admit is compressed at most for the one coding it is served with.
+
+A repeated request of the same generation costs a dictionary lookup: no `Ratings`
+evaluation and no JSON serialization. Promoting an upload bumps the generation, which
+drops the whole cache on the next request.
+
+On a cache miss, the body is looked up in the report cards materialized at ingest
+(`utils.report_tools`) before falling back to the endpoint itself.
+
+Conditional GET:
+- Every successful response carries a strong `ETag` derived from the same key (route,
+  request arguments and dataset generation) and its content-coding: the body of a key
+  can only change with the generation, so no hashing of the body is needed.
+- A request whose `If-None-Match` matches the current `ETag` gets a `304 Not Modified`
+  before any cache lookup, service call or `Ratings` work.
+- `If-None-Match: *` only gets a 304 when the body of the key is cached or materialized;
+  otherwise the request is served normally, since there is no representation to match
+  without computing it.
+- `Cache-Control: private, no-cache` lets the student's client (but no shared cache)
+  keep the body and revalidate it on every poll; `Vary: Authorization, Accept-Encoding`
+  keeps bodies of different users and codings apart.
+
+Usage:
+Apply `caching` below `authenticate`, so the token is always verified before a cached
+body is served:
+
+    @student_routes.get("/{enrollment}", dependencies=[Depends(bearer)])
+    @authenticate
+    @caching
+    async def get_student(request: Request, enrollment: str) -> ORJSONResponse:
+        ...
+"""
+
+from functools import wraps
+from hashlib import blake2b
+from typing import Callable
+from fastapi.requests import Request
+from fastapi.responses import Response
+from utils.cache_tools import ResponseCache
+from utils.config_secrets import Config
+from utils.dataset_tools import current_generation
+from utils.report_tools import reports
+from utils.response_tools import EncodedBody, encoded_response
+
+responses = ResponseCache(Config.RESPONSE_CACHE_BYTES)
+
+CACHE_HEADERS = {"Cache-Control": "private, no-cache", "Vary": "Authorization, Accept-Encoding"}
+
+
+CODINGS = ("identity", "gzip", "br")
+
+
+def entity_tag(key: tuple, generation: int, coding: str = "identity") -> str:
+    """
+    Returns the strong ETag of a response from its cache key, dataset generation and
+    content-coding (each coding of a body is a different representation).
+    """
+    digest = blake2b(repr((generation, *key)).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"' if coding == "identity" else f'"{digest}-{coding}"'
+
+
+def matches(if_none_match: str | None, tag: str) -> bool:
+    """
+    Tells whether an `If-None-Match` header matches an ETag (weak comparison, as
+    RFC 9110 requires for `If-None-Match`). The wildcard is handled by `wildcard`.
+    """
+    if not if_none_match:
+        return False
+
+    return any(
+        candidate.strip().removeprefix("W/") == tag for candidate in if_none_match.split(",")
+    )
+
+
+def wildcard(if_none_match: str | None) -> bool:
+    """
+    Tells whether an `If-None-Match` header is "*", which matches any current
+    representation of the resource (but none when it has no representation yet).
+    """
+    return bool(if_none_match) and any(
+        candidate.strip() == "*" for candidate in if_none_match.split(",")
+    )
+
+
+def caching(func: Callable) -> Callable:
+    """
+    A decorator that caches the serialized body of the successful (200) responses of an
+    endpoint for the current dataset generation, tags them with an ETag and answers
+    matching conditional requests with 304.
+
+    Args:
+        func (Callable): The endpoint to be wrapped by the decorator.
+
+    Returns:
+        Callable: The wrapped endpoint, which serves cached bodies when available.
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs) -> Response:
+        """
+        Inner function that answers a conditional request with 304, or serves the cached
+        or materialized body of the request, or computes and caches it.
+
+        Args:
+            *args: Positional arguments passed to the decorated function.
+            **kwargs: Keyword arguments passed to the decorated function. The
+                      'enrollment', 'partial' and 'rank' keys are part of the cache key
+                      and the 'request' object provides the `If-None-Match` header.
+
+        Returns:
+            Response: A 304 response, the cached response or the one computed by the endpoint.
+        """
+        generation = current_generation()
+        key = (
+            func.__name__, kwargs.get("enrollment"), kwargs.get("partial"), kwargs.get("rank")
+        )
+        request: Request = kwargs.get("request")
+        if_none_match = request.headers.get("if-none-match") if request is not None else None
+        accept_encoding = request.headers.get("accept-encoding") if request is not None else None
+
+        for coding in CODINGS if if_none_match else ():
+            tag = entity_tag(key, generation, coding)
+
+            if matches(if_none_match, tag):
+                return Response(status_code=304, headers={"ETag": tag, **CACHE_HEADERS})
+
+        body: EncodedBody | None = responses.get(key, generation)
+
+        if body is None:
+            content = reports.get(*key, generation=generation)
+
+            if content is not None:
+                body = EncodedBody(content)
+                responses.put(key, generation, body, body.size)
+
+        if body is not None:
+            coding = body.coding(accept_encoding)
+            headers = {"ETag": entity_tag(key, generation, coding), **CACHE_HEADERS}
+
+            if wildcard(if_none_match):
+                return Response(status_code=304, headers=headers)
+            return encoded_response(body, coding, headers)
+
+        response: Response = await func(*args, **kwargs)
+
+        if response.status_code != 200:
+            return response
+
+        body = EncodedBody(response.body)
+        responses.put(key, generation, body, body.size)
+        coding = body.coding(accept_encoding)
+
+        return encoded_response(
+            body, coding, {"ETag": entity_tag(key, generation, coding), **CACHE_HEADERS}
+        )
+
+    return wrapper
@@ -0,0 +1,64 @@
+"""
+This module provides the decorator that measures the DBF access of the model layer.
+
+`dbfmapper` opens the DBF file of a model on every query, so every call to `get`,
+`get_all` or `save` of a decorated model counts as one open in `dbf_opens_total` and
+its duration is observed in `dbf_read_duration_seconds` (see `utils.metrics_tools`).
+Queries made from inside another query of the same thread (e.g. a `get` built on
+`get_all`) are only measured once.
+
+Usage:
+    @instrumented
+    class ALUMNO(Model):
+        ...
+"""
+
+from functools import wraps
+from threading import local
+from typing import Callable
+from utils.metrics_tools import DBF_OPENS, DBF_READS, table, timed
+
+OPERATIONS = ("get", "get_all", "save")
+
+_state = local()
+
+
+def _measure(method: Callable, operation: str) -> Callable:
+    """
+    Wraps a query method of a model with its metrics.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if getattr(_state, "active", False):
+            return method(self, *args, **kwargs)
+
+        name = table(self.__ctx__)
+        DBF_OPENS.labels(table=name, source="model").inc()
+        _state.active = True
+
+        try:
+            with timed(DBF_READS, table=name, operation=operation):
+                return method(self, *args, **kwargs)
+        finally:
+            _state.active = False
+
+    return wrapper
+
+
+def instrumented(cls: type) -> type:
+    """
+    Class decorator that measures the queries (`OPERATIONS`) of a model.
+
+    Args:
+        cls (type): A `dbfmapper` model with a `__ctx__` (the path of its DBF file).
+
+    Returns:
+        type: The same class, with its query methods measured.
+    """
+    for operation in OPERATIONS:
+        method = getattr(cls, operation, None)
+
+        if method is not None:
+            setattr(cls, operation, _measure(method, operation))
+
+    return cls
@@ -242,3 +242,121 @@ class TokenNotAllowed(ServerBaseException):
         self.error_code = 1210
         self.status_code = 401
         self.http_argument = "Unauthorized 🚫"
+
+
+class InvalidDatabaseFile(ServerBaseException):
+    """
+    Exception raised when an uploaded file is not one of the tables of the system
+    or is not a valid DBF file.
+
+    Attributes:
+        message (str): The error message (default is "Invalid database file 💾").
+        error_code (int): Custom error code for invalid uploads (default is 1211).
+        status_code (int): HTTP status code for bad request (default is 400).
+        http_argument (str): HTTP status string ("Bad Request ❓").
+    """
+    def __init__(self, message="Invalid database file 💾") -> None:
+        super().__init__(message)
+        self.add_note("El archivo no es una tabla DBF válida del sistema.")
+
+        self.error_code = 1211
+        self.status_code = 400
+        self.http_argument = "Bad Request ❓"
+
+
+class UploadTooLarge(ServerBaseException):
+    """
+    Exception raised when an uploaded file exceeds the configured maximum size.
+
+    Attributes:
+        message (str): The error message (default is "The file is too large 🐘").
+        error_code (int): Custom error code for oversized uploads (default is 1212).
+        status_code (int): HTTP status code for content too large (default is 413).
+        http_argument (str): HTTP status string ("Content Too Large 📦").
+    """
+    def __init__(self, message="The file is too large 🐘") -> None:
+        super().__init__(message)
+        self.add_note("El archivo excede el tamaño máximo permitido.")
+
+        self.error_code = 1212
+        self.status_code = 413
+        self.http_argument = "Content Too Large 📦"
+
+
+class ServiceTimeout(ServerBaseException):
+    """
+    Exception raised when the data access of a request does not finish in time.
+
+    Attributes:
+        message (str): The error message (default is "The request took too long ⏳").
+        error_code (int): Custom error code for timeouts (default is 1213).
+        status_code (int): HTTP status code for service unavailable (default is 503).
+        http_argument (str): HTTP status string ("Service Unavailable 🚧").
+    """
+    def __init__(self, message="The request took too long ⏳") -> None:
+        super().__init__(message)
+        self.add_note("El servidor está ocupado, intenta de nuevo en unos momentos.")
+
+        self.error_code = 1213
+        self.status_code = 503
+        self.http_argument = "Service Unavailable 🚧"
+
+
+class ExportUnavailable(ServerBaseException):
+    """
+    Exception raised when an export format needs an optional dependency that is not
+    installed on the server.
+
+    Attributes:
+        message (str): The error message (default is "Export format not available 🛠️").
+        error_code (int): Custom error code for unavailable exports (default is 1214).
+        status_code (int): HTTP status code for not implemented (default is 501).
+        http_argument (str): HTTP status string ("Not Implemented 🛠️").
+    """
+    def __init__(self, message="Export format not available 🛠️") -> None:
+        super().__init__(message)
+        self.add_note("El formato de exportación no está disponible en el servidor.")
+
+        self.error_code = 1214
+        self.status_code = 501
+        self.http_argument = "Not Implemented 🛠️"
+
+
+class TooManyRequests(ServerBaseException):
+    """
+    Exception raised when a client exceeds its request rate.
+
+    Attributes:
+        message (str): The error message (default is "Too many requests 🚦").
+        retry_after (int): Seconds the client must wait before trying again.
+        error_code (int): Custom error code for rate limits (default is 1215).
+        status_code (int): HTTP status code for too many requests (default is 429).
+        http_argument (str): HTTP status string ("Too Many Requests 🚦").
+    """
+    def __init__(self, retry_after: int, message="Too many requests 🚦") -> None:
+        super().__init__(message)
+        self.add_note("Demasiadas solicitudes, intenta de nuevo más tarde.")
+
+        self.retry_after = retry_after
+        self.error_code = 1215
+        self.status_code = 429
+        self.http_argument = "Too Many Requests 🚦"
+
+
+class NotFoundProfile(ServerBaseException):
+    """
+    Exception raised when a profile of a request does not exist.
+
+    Attributes:
+        message (str): The error message (default is "Profile not found 🔎").
+        error_code (int): Custom error code for missing profiles (default is 1216).
+        status_code (int): HTTP status code for not found (default is 404).
+        http_argument (str): HTTP status string ("Not Found 🚫").
+    """
+    def __init__(self, message="Profile not found 🔎") -> None:
+        super().__init__(message)
+        self.add_note("El perfil solicitado no existe o ya fue eliminado.")
+
+        self.error_code = 1216
+        self.status_code = 404
+        self.http_argument = "Not Found 🚫"
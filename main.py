@@ -7,34 +7,73 @@ Features:
 - Load database from a DBF file (POST `/load-database`).
 - Handle student records with routes for loading and viewing histories (via `/students`).
 - Provide authentication routes via `/auth`.
+- Expose Prometheus metrics (GET `/metrics`).
 
 The application includes proper error handling and middleware for cross-origin requests.
 
 Components:
 - **CORS Middleware**: Allows cross-origin requests from any origin.
+- **Rate Limit Middleware**: Answers `429` to clients that exceed their rate, and
+  throttles the login attempts per IP and per CURP.
+- **Metrics Middleware**: Measures the requests by route template for `/metrics`
+  (Prometheus, see `utils.metrics_tools`).
+- **Profiling Middleware**: Profiles the requests the administration flags; the
+  profiles are served by `/profiles`.
 - **Custom Exception Handlers**: Handle `ServerBaseException`, `DatabaseError`, and `TokenNotAllowed`.
 - **Environment Variables**: Loaded using `dotenv` to manage secrets and tokens.
+- **Snapshot Warm-up**: Every worker builds the read snapshot at startup and watches the
+  dataset generation, so requests do not build it (see `utils.snapshot_tools`).
 """
 
+from contextlib import asynccontextmanager
 from typing import Annotated
 from fastapi import FastAPI, Request, File, UploadFile, Query, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.concurrency import run_in_threadpool
 from routes.student_routes import student_routes
 from routes.auth_routes import auth_routes
+from routes.group_routes import group_routes
+from routes.export_routes import export_routes
 from routes.load_routes import load_routes
 from routes.history_routes import history_routes
+from routes.profile_routes import profile_routes
 from errors.errors import ServerBaseException, ServerError, TokenNotAllowed
-from tasks.fastapi_tasks import each_student
+from tasks.fastapi_tasks import (
+    refresh_snapshot, rebuild_histories, reconcile_histories, materialize_reports
+)
 from utils.config_secrets import Config
+from utils.dataset_tools import table_name, stage_upload, promote
 from middlewares.logging_middleware import LoggingMiddleware
+from middlewares.rate_limit_middleware import RateLimitMiddleware
+from middlewares.metrics_middleware import MetricsMiddleware
+from middlewares.profiling_middleware import ProfilingMiddleware
+from decorators.authenticator import administrator
+from utils.metrics_tools import INGEST, count_error, exposition, timed
+from utils.snapshot_tools import snapshots
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Builds the read snapshot of the worker before it takes requests and starts the
+    watcher that builds the snapshot of every new dataset generation.
+    """
+    await run_in_threadpool(refresh_snapshot)
+    snapshots.watch(Config.SNAPSHOT_POLL_SECONDS)
+    yield
+
 
 app = FastAPI(
     title="COBACH Plantel 2️⃣1️⃣7️⃣ Soconusco. 🏫",
     description="API Rest para obtención de boletas académicas. 📃",
     version="1.0.0",
-    root_path="/api"
+    root_path="/api",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RateLimitMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://127.0.0.1"],
@@ -44,10 +83,11 @@ app.add_middleware(
 )
 
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 
 @app.exception_handler(ServerBaseException)
-async def server_base_exception_handler(request: Request, exc: ServerBaseException) -> JSONResponse:
+async def server_base_exception_handler(request: Request, exc: ServerBaseException) -> ORJSONResponse:
     """
     Custom exception handler for `ServerBaseException`.
 
@@ -59,9 +99,10 @@ async def server_base_exception_handler(request: Request, exc: ServerBaseExcepti
         exc (ServerBaseException): The exception raised during request processing.
 
     Returns:
-        JSONResponse: A response containing the error details.
+        ORJSONResponse: A response containing the error details.
     """
-    return JSONResponse(
+    count_error(exc)
+    return ORJSONResponse(
         status_code=exc.status_code,
         content=exc.to_dict()
     )
@@ -72,41 +113,57 @@ async def load_dbf(
         background: BackgroundTasks,
         dbf_data: Annotated[UploadFile, File(...)],
         access: Annotated[str, Query(...)]
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Endpoint to load database from a DBF file.
 
     This endpoint requires a valid access token. If the token is correct,
-    it saves the uploaded DBF file to the server's local storage. If any errors occur
-    during file handling, a `DatabaseError` is raised.
+    it streams the uploaded DBF file to a staging location in chunks (bounded by
+    `Config.MAX_UPLOAD_BYTES`), validates it and atomically promotes it to the server's local storage under a new dataset
+    generation (see `utils.dataset_tools`). If any errors occur during file
+    handling, a `DatabaseError` is raised.
 
     Args:
         dbf_data (UploadFile): The DBF file to be uploaded.
         access (str): Access token for authorization.
 
     Returns:
-        JSONResponse: A response indicating the success or failure of the database load operation.
+        ORJSONResponse: A response indicating the success or failure of the database load operation.
         :param access:
         :param dbf_data:
         :param background:
     """
 
     if access == Config.ACCESS_TOKEN:
-        read_data = await dbf_data.read()
-        file_name = dbf_data.filename.lower()
+        file_name = table_name(dbf_data.filename)
+        with timed(INGEST, table=file_name, stage="upload"):
+            staged, digest = await stage_upload(dbf_data, file_name)
 
         try:
-            with open(f"db/{file_name}", "wb") as dbf:
-                dbf.write(read_data)
+            with timed(INGEST, table=file_name, stage="promote"):
+                generation = await run_in_threadpool(promote, staged, file_name, sha256=digest)
+
+            background.add_task(refresh_snapshot)
 
             if file_name == "cargas.dbf":
-                background.add_task(each_student)
+                background.add_task(rebuild_histories)
+
+            if file_name in ("alumnos.dbf", "HISTORIALES.dbf"):
+                background.add_task(reconcile_histories)
 
-            return JSONResponse(
+            background.add_task(materialize_reports)
+
+            return ORJSONResponse(
                 status_code=202,
-                content={"status": f"Loaded database {file_name} ✅"}
+                content={
+                    "status": f"Loaded database {file_name} ✅",
+                    "generation": generation
+                }
             )
 
+        except ServerBaseException:
+            raise
+
         except Exception as e:
             raise ServerError(str(e)) from e
     
@@ -114,16 +171,16 @@ async def load_dbf(
 
 
 @app.get("/")
-async def welcome_message() -> JSONResponse:
+async def welcome_message() -> ORJSONResponse:
     """
     Welcome message for the root endpoint.
 
     This endpoint returns a message indicating the API's status and its purpose.
 
     Returns:
-        JSONResponse: A response containing the API status and description.
+        ORJSONResponse: A response containing the API status and description.
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content={
             "status": "OK 🆗",
@@ -136,7 +193,28 @@ async def welcome_message() -> JSONResponse:
         }
     )
 
+
+@app.get("/metrics", include_in_schema=False)
+@administrator
+async def metrics(access: Annotated[str, Query(...)]) -> Response:
+    """
+    Exposes the metrics of the API in the Prometheus text format.
+
+    Args:
+        access (str): Access token of the administration (set it in the `params` of the
+        scrape job).
+
+    Returns:
+        Response: The metrics of every worker (see `utils.metrics_tools`).
+    """
+    content, media_type = exposition()
+    return Response(content=content, media_type=media_type)
+
+
 student_routes.include_router(load_routes, prefix="/{enrollment}/loads")
 student_routes.include_router(history_routes, prefix="/{enrollment}/histories")
 app.include_router(student_routes, prefix="/students", tags=["Student"])
 app.include_router(auth_routes, prefix="/auth", tags=["Auth"])
+app.include_router(group_routes, prefix="/groups", tags=["Group"])
+app.include_router(export_routes, prefix="/exports", tags=["Export"])
+app.include_router(profile_routes, prefix="/profiles", tags=["Profile"])
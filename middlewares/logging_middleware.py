@@ -1,47 +1,77 @@
 """
 This module contains a custom middleware for logging incoming HTTP requests.
-It logs request details such as the URL, HTTP method, headers, and client information.
-This can be useful for monitoring, debugging, and tracking incoming requests.
+It logs one structured document per request with the method, path, query, status,
+latency, response size, headers and client information. This can be useful for
+monitoring, debugging, and tracking incoming requests.
 
-Dependencies:
-- starlette.middleware.base.BaseHTTPMiddleware
-- starlette.requests.Request
-- starlette.responses.Response
-- utils.logging_config.app_logger
+It is a pure ASGI middleware: it does not wrap the request or the response, it only
+watches the status and the body size as they are sent. The document is handed to
+`access_logger` with the raw headers and query string; they are redacted, serialized to
+JSON and written to the access log on the background thread of `utils.logging_config`,
+so the request only pays for building a dict and an enqueue.
+
+Sampling: failed requests (status 400 or more, or an exception) are always logged;
+successful ones with probability `Config.LOG_SAMPLE_RATE` (1 logs every request).
 
-The middleware logs relevant request data and then forwards the request to the next
-middleware or endpoint.
+Dependencies:
+- utils.logging_config.access_logger
+- utils.config_secrets.Config
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
-from starlette.requests import Request
-from starlette.responses import Response
-from utils.logging_config import app_logger
+from random import random
+from time import perf_counter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.config_secrets import Config
+from utils.logging_config import access_logger
 
-class LoggingMiddleware(BaseHTTPMiddleware):
+
+class LoggingMiddleware:
     """
-    Middleware that logs request details such as URL, method, headers, and client information.
+    Middleware that logs the details, status and latency of every request.
 
-    This middleware is applied to log important request information for monitoring and debugging purposes.
-    It is executed before processing the request and after the response is generated.
+    Attributes:
+        sample_rate (float): Probability of logging a successful request.
     """
 
-    async def dispatch(self, request: Request, call_next: RequestResponseEndpoint) -> Response:
+    def __init__(self, app: ASGIApp, sample_rate: float | None = None) -> None:
+        self.app = app
+        self.sample_rate = Config.LOG_SAMPLE_RATE if sample_rate is None else sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
-        Logs request details before passing the request to the next middleware or endpoint.
+        Passes the request to the next middleware or endpoint and logs it once it ends.
 
         Args:
-            request (Request): The incoming HTTP request object.
-            call_next (RequestResponseEndpoint): The next middleware or endpoint to handle the request.
-
-        Returns:
-            Response: The response generated by the endpoint or next middleware.
+            scope (Scope): The ASGI scope of the request.
+            receive (Receive): The ASGI receive channel.
+            send (Send): The ASGI send channel.
         """
-        app_logger.info(
-            f"Request: "
-            f"[url: {request.url}, "
-            f"method: {request.method}, "
-            f"headers: {request.headers}, "
-            f"client: {request.client}]"
-        )
-        return await call_next(request)
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        response = {"status": 500, "bytes": 0}
+
+        async def watch(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, watch)
+        finally:
+            if response["status"] >= 400 or random() < self.sample_rate:
+                client = scope.get("client")
+                access_logger.info("request", extra={"access": {
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "query": scope.get("query_string", b""),
+                    "status": response["status"],
+                    "latency_ms": round((perf_counter() - started) * 1000, 3),
+                    "bytes": response["bytes"],
+                    "client": f"{client[0]}:{client[1]}" if client else None,
+                    "headers": scope["headers"],
+                }})
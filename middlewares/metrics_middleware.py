@@ -0,0 +1,48 @@
+"""
+This module contains the middleware that measures the HTTP requests for Prometheus.
+
+For every request it tracks the in-flight gauge and, once the response is sent, counts
+it and observes its latency by route template: the path of the route FastAPI matched
+(e.g. `/students/{enrollment}/loads`), so the label does not grow with the enrollments.
+Requests that match no route are labeled "unmatched".
+
+It is a pure ASGI middleware; the metrics are defined in `utils.metrics_tools`.
+"""
+
+from time import perf_counter
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.metrics_tools import IN_FLIGHT, REQUESTS, REQUEST_LATENCY
+
+
+class MetricsMiddleware:
+    """
+    Middleware that records the count, latency and concurrency of the requests.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status = [500]
+
+        async def watch(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+
+        try:
+            await self.app(scope, receive, watch)
+        finally:
+            IN_FLIGHT.dec()
+            route = scope.get("route")
+            template = getattr(route, "path", None) or "unmatched"
+
+            REQUESTS.labels(scope["method"], template, str(status[0])).inc()
+            REQUEST_LATENCY.labels(scope["method"], template).observe(perf_counter() - started)
@@ -0,0 +1,83 @@
+"""
+This module contains the middleware that profiles single requests on demand.
+
+The administration asks for a profile with the access token (`Config.ACCESS_TOKEN`) in
+the `X-Profile` header or in the `profile` query parameter, e.g.:
+
+    GET /students/{enrollment}/loads?partial=2&profile=...
+
+The request is then run under a `ProfileSession` (`utils.profile_tools`), its response
+carries the ID of the profile in the `X-Profile-Id` header, and the outputs are stored
+after the response is sent; they are served by `/profiles/{profile_id}`. While another
+request is being profiled, the request is served without profiling (and without the
+header).
+
+Requests without the flag only pay for the lookup of the header and the parameter.
+"""
+
+import asyncio
+from hmac import compare_digest
+from urllib.parse import parse_qs
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from utils.config_secrets import Config
+from utils.logging_config import app_logger
+from utils.profile_tools import finish, profiling, start
+
+HEADER = b"x-profile"
+PARAMETER = b"profile="
+
+
+class ProfilingMiddleware:
+    """
+    Middleware that profiles the requests the administration flags.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    @staticmethod
+    def requested(scope: Scope) -> bool:
+        """
+        Tells whether the request carries a valid profiling flag.
+        """
+        flag = next((value for name, value in scope["headers"] if name == HEADER), None)
+
+        if flag is None and PARAMETER in scope.get("query_string", b""):
+            values = parse_qs(scope["query_string"].decode("latin-1")).get("profile")
+            flag = values[0].encode("latin-1") if values else None
+
+        return bool(
+            flag and Config.ACCESS_TOKEN
+            and compare_digest(flag, Config.ACCESS_TOKEN.encode("latin-1"))
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        session = start()
+
+        if session is None:
+            await self.app(scope, receive, send)
+            return
+
+        async def identify(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []), (b"x-profile-id", session.id.encode())
+                ]
+            await send(message)
+
+        token = profiling.set(session)
+
+        try:
+            with session.profile():
+                await self.app(scope, receive, identify)
+        finally:
+            profiling.reset(token)
+
+            try:
+                await asyncio.to_thread(finish, session)
+            except Exception as e:
+                app_logger.error(f"Error on <ProfilingMiddleware>: {str(e)}")
@@ -0,0 +1,150 @@
+"""
+This module contains the rate limiting middleware of the API.
+
+Every request takes a token from the bucket of its client IP; logins (`POST /auth/login`)
+also take one from a stricter per-IP login bucket and from the bucket of the CURP they
+try (the `username` of the body), so scripted guessing is throttled for an account even
+when it comes from many addresses. A request without tokens is answered right away with
+`429` (`TooManyRequests`) and a `Retry-After` header, before routing, so it never
+reaches the database.
+
+It is a pure ASGI middleware: the body of a login is read (at most `MAX_LOGIN_BODY`
+bytes) and replayed to the application, and other requests pass through untouched.
+
+The limits come from `utils.config_secrets.Config` and the buckets from
+`utils.limiter_tools` (in-process or Redis). If the backend fails (e.g. Redis is down),
+the request is let through and the error is logged.
+
+Dependencies:
+- utils.limiter_tools.create_buckets
+- errors.errors.TooManyRequests
+"""
+
+from math import ceil
+import orjson
+from fastapi.responses import ORJSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from errors.errors import TooManyRequests
+from utils.config_secrets import Config
+from utils.limiter_tools import create_buckets
+from utils.logging_config import app_logger
+from utils.metrics_tools import count_error
+
+LOGIN_PATH = "/auth/login"
+MAX_LOGIN_BODY = 4096
+
+
+class RateLimitMiddleware:
+    """
+    Middleware that rejects the requests of clients that exceed their rate with `429`.
+
+    Attributes:
+        buckets: The token buckets (`MemoryBuckets`, `RedisBuckets`, or None to disable
+        the limits).
+    """
+
+    def __init__(self, app: ASGIApp, buckets=None) -> None:
+        self.app = app
+        self.buckets = create_buckets() if buckets is None else buckets
+
+    @staticmethod
+    def client(scope: Scope) -> str:
+        """
+        Returns the IP of the client (as resolved by the server, e.g. with `--proxy-headers`).
+        """
+        client = scope.get("client")
+        return client[0] if client else "unknown"
+
+    @staticmethod
+    async def read_body(receive: Receive) -> tuple[bytes, list[Message]]:
+        """
+        Reads the body of a request (up to `MAX_LOGIN_BODY` bytes), keeping the messages
+        so they can be replayed.
+        """
+        body, messages = b"", []
+
+        while True:
+            message = await receive()
+            messages.append(message)
+
+            if message["type"] != "http.request":
+                break
+
+            body += message.get("body", b"")
+
+            if not message.get("more_body") or len(body) > MAX_LOGIN_BODY:
+                break
+
+        return body, messages
+
+    @staticmethod
+    def curp(body: bytes) -> str | None:
+        """
+        Returns the CURP (`username`) a login tries, or None if the body has none.
+        """
+        try:
+            username = orjson.loads(body).get("username")
+        except (orjson.JSONDecodeError, AttributeError):
+            return None
+
+        return username.strip().upper() if isinstance(username, str) else None
+
+    async def wait(self, limits: list[tuple[str, float, float]]) -> float:
+        """
+        Takes a token from every bucket, stopping at the first one that is empty.
+
+        Args:
+            limits (list[tuple[str, float, float]]): The key, rate and burst of every bucket.
+
+        Returns:
+            float: The seconds to wait (0 when the request is allowed).
+        """
+        for key, rate, burst in limits:
+            wait = await self.buckets.take(key, rate, burst)
+
+            if wait > 0:
+                return wait
+        return 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self.buckets is None:
+            await self.app(scope, receive, send)
+            return
+
+        address = self.client(scope)
+        limits = [(f"ip:{address}", Config.RATE_LIMIT_PER_SECOND, Config.RATE_LIMIT_BURST)]
+
+        if scope["method"] == "POST" and scope["path"].endswith(LOGIN_PATH):
+            body, messages = await self.read_body(receive)
+            limits.append(
+                (f"login:{address}", Config.LOGIN_IP_PER_MINUTE / 60, Config.LOGIN_IP_PER_MINUTE)
+            )
+            curp = self.curp(body)
+
+            if curp:
+                limits.append(
+                    (f"curp:{curp}", Config.LOGIN_CURP_PER_MINUTE / 60, Config.LOGIN_CURP_PER_MINUTE)
+                )
+
+            original = receive
+
+            async def receive() -> Message:
+                return messages.pop(0) if messages else await original()
+
+        try:
+            wait = await self.wait(limits)
+        except Exception as e:
+            app_logger.error(f"Error on <RateLimitMiddleware>: {str(e)}")
+            wait = 0.0
+
+        if wait > 0:
+            exc = TooManyRequests(ceil(wait))
+            count_error(exc)
+            response = ORJSONResponse(
+                status_code=exc.status_code, content=exc.to_dict(),
+                headers={"Retry-After": str(exc.retry_after)}
+            )
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
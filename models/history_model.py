@@ -18,9 +18,11 @@ and data sources to manage and analyze academic performance.
 from typing import Annotated
 from os import path
 from dbfmapper.model import Model
+from decorators.metrics import instrumented
 from models.student_model import ALUMNO
 
 
+@instrumented
 class HISTORIAL(Model):
     """
     Model representing the historical academic records of students.
@@ -18,9 +18,11 @@ students' academic performance, grades, and attendance.
 from typing import Annotated
 from os import path
 from dbfmapper.model import Model
+from decorators.metrics import instrumented
 from models.student_model import ALUMNO
 
 
+@instrumented
 class CARGA(Model):
     """
     Model representing the academic load (grades and absences) of students.
@@ -16,8 +16,10 @@ such as tracking grades or academic performance.
 
 from os import path
 from dbfmapper.model import Model
+from decorators.metrics import instrumented
 
 
+@instrumented
 class ALUMNO(Model):
     """
     Model representing student information in the academic system.
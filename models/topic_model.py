@@ -17,8 +17,10 @@ management, allowing efficient handling of subjects within the academic environm
 
 from os import path
 from dbfmapper.model import Model
+from decorators.metrics import instrumented
 
 
+@instrumented
 class ASIGNATURA(Model):
     """
     Model representing an academic subject (Asignatura) in the system.
@@ -6,7 +6,7 @@ username (18 characters) and a password (15 characters) to authenticate. The aut
 is managed by the `AuthServices` class, which verifies the credentials and returns a response
 containing either an access token or an error message.
 
-The `APIRouter` is used to register the login route, and the `JSONResponse` is used to send
+The `APIRouter` is used to register the login route, and the `ORJSONResponse` is used to send
 responses with the appropriate status code and data.
 
 Endpoints:
@@ -15,8 +15,9 @@ Endpoints:
 
 from typing import Annotated
 from fastapi import APIRouter, Body
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from services.auth_services import AuthServices
+from utils.executor_tools import run_blocking
 
 auth_routes = APIRouter()
 auth = AuthServices()
@@ -26,7 +27,7 @@ auth = AuthServices()
 async def login(
     username: Annotated[str, Body(max_length=18, min_length=18)],
     password: Annotated[str, Body(max_length=15, min_length=15)],
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Handles user login requests.
 
@@ -35,7 +36,7 @@ async def login(
         password (Annotated[str]): The password of the user. Must be exactly 15 characters.
 
     Returns:
-        JSONResponse: A response with the login result.
+        ORJSONResponse: A response with the login result.
                       - On success: Status code 200 with user information or token.
                       - On failure: Status code and error details based on `AuthServices`.
 
@@ -52,7 +53,7 @@ async def login(
             "student_data": { ... }  # Student details
         }
     """
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
-        content=auth.login(username, password)
+        content=await run_blocking("login", auth.login, username, password)
     )
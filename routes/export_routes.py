@@ -0,0 +1,89 @@
+"""
+This file defines the routes for exporting the computed grades of the whole school,
+for the state system and spreadsheets.
+
+It includes two endpoints:
+
+1. `/exports/grades` - Streams the grades of a specific partial (1 to 3).
+
+2. `/exports/grades/semiannual` - Streams the semester averages.
+
+Both accept the `export_format` of the file ("csv", "ndjson" or "parquet") and an optional
+`rank`: without it, the current academic loads (`cargas.dbf`) are exported; with it, the
+histories (`HISTORIALES.dbf`) of that rank. The files are streamed with chunked transfer
+as they are produced (see `services.export_services`).
+
+Dependencies:
+    - Administration access: the `access` query parameter must be the access token of the
+      administration (`decorators.authenticator.administrator`).
+    - Parquet exports need the optional `pyarrow` package.
+
+Example Requests:
+    - GET /exports/grades?partial=2&export_format=csv&access=...
+    - GET /exports/grades/semiannual?export_format=parquet&rank=3&access=...
+"""
+
+from typing import Annotated, Literal
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from decorators.authenticator import administrator
+from services.export_services import ExportServices
+
+export_routes = APIRouter()
+exports = ExportServices()
+
+
+def attachment(chunks, media_type: str, file_name: str) -> StreamingResponse:
+    """
+    Builds the streaming response of an export file.
+    """
+    return StreamingResponse(
+        chunks, media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
+
+
+@export_routes.get("/grades")
+@administrator
+async def export_grades(
+        access: Annotated[str, Query(...)],
+        partial: Annotated[int, Query(ge=1, le=3)],
+        export_format: Annotated[Literal["csv", "ndjson", "parquet"], Query()] = "csv",
+        rank: Annotated[int | None, Query(ge=1, le=6)] = None,
+) -> StreamingResponse:
+    """
+    Stream the grades of a partial of the whole school.
+
+    Args:
+        access (Annotated[str]): Access token of the administration.
+        partial (Annotated[int]): The partial to export (1 to 3).
+        export_format (Annotated[str]): "csv" (default), "ndjson" or "parquet".
+        rank (Annotated[int | None]): Export the histories of this rank (1 to 6) instead
+        of the current academic loads.
+
+    Returns:
+        StreamingResponse: The export file, one row per student and subject.
+    """
+    return attachment(*exports.export(export_format, partial, rank))
+
+
+@export_routes.get("/grades/semiannual")
+@administrator
+async def export_semiannual_grades(
+        access: Annotated[str, Query(...)],
+        export_format: Annotated[Literal["csv", "ndjson", "parquet"], Query()] = "csv",
+        rank: Annotated[int | None, Query(ge=1, le=6)] = None,
+) -> StreamingResponse:
+    """
+    Stream the semester averages of the whole school.
+
+    Args:
+        access (Annotated[str]): Access token of the administration.
+        export_format (Annotated[str]): "csv" (default), "ndjson" or "parquet".
+        rank (Annotated[int | None]): Export the histories of this rank (1 to 6) instead
+        of the current academic loads.
+
+    Returns:
+        StreamingResponse: The export file, one row per student and subject.
+    """
+    return attachment(*exports.export(export_format, 6, rank))
@@ -0,0 +1,225 @@
+"""
+This file defines the routes for retrieving the report cards of a whole group
+(`GRADO`, `GRUPO`) in one request, for tutors and administration.
+
+It includes these endpoints:
+
+1. `/groups/{grade}/{group}/loads` - Streams the academic load of every student of the
+   group for a specific partial (0 to 3).
+
+2. `/groups/{grade}/{group}/loads/semiannual` - Streams the semiannual academic load of
+   every student of the group.
+
+3. `/groups/{grade}/{group}/boletas` and `/groups/{grade}/boletas` - Stream a ZIP archive
+   with the PDF report card (boleta) of every student of a group or of a whole grade,
+   for a specific partial (1 to 3).
+
+4. `/groups/{grade}/{group}/boletas/semiannual` and `/groups/{grade}/boletas/semiannual` -
+   Stream the semiannual boletas of a group or of a whole grade.
+
+The loads are NDJSON (`application/x-ndjson`): one JSON document per student,
+identical to the body of the per-student load endpoints, produced by a generator so
+memory stays flat regardless of the size of the group. The boletas print the current
+academic loads, or the histories of a `rank` (see `services.boleta_services`).
+
+Dependencies:
+    - Administration access: the `access` query parameter must be the access token of the
+      administration (`decorators.authenticator.administrator`).
+
+Example Requests:
+    - GET /groups/3/B/loads?partial=2&access=...
+    - GET /groups/3/B/loads/semiannual?access=...
+    - GET /groups/3/B/boletas?partial=2&access=...
+    - GET /groups/3/boletas/semiannual?rank=2&access=...
+"""
+
+from typing import Annotated
+from fastapi import APIRouter, Path, Query
+from fastapi.responses import StreamingResponse
+from decorators.authenticator import administrator
+from services.boleta_services import BoletaServices
+from services.group_services import GroupServices
+
+group_routes = APIRouter()
+groups = GroupServices()
+boletas = BoletaServices()
+
+
+def archive(chunks, file_name: str) -> StreamingResponse:
+    """
+    Builds the streaming response of a ZIP archive of boletas.
+    """
+    return StreamingResponse(
+        chunks, media_type="application/zip",
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'}
+    )
+
+
+@group_routes.get("/{grade}/{group}/loads")
+@administrator
+async def get_group_loads(
+        grade: Annotated[int, Path(ge=1, le=6)],
+        group: Annotated[str, Path(max_length=2)],
+        access: Annotated[str, Query(...)],
+        partial: Annotated[int, Query(ge=0, le=3)] = 0
+) -> StreamingResponse:
+    """
+    Stream the academic load of every student of a group for a specific partial.
+
+    Args:
+        grade (Annotated[int]): The grade of the group (1 to 6).
+        group (Annotated[str]): The group (at most 2 characters).
+        access (Annotated[str]): Access token of the administration.
+        partial (Annotated[int]): The academic period (0 to 3, default is 0).
+
+    Returns:
+        StreamingResponse: One JSON document per student (NDJSON). Students that can not
+        be graded get a document with their `MATRICULA` and the `ERROR`.
+
+    Example:
+        Request:
+        GET /groups/3/B/loads?partial=2&access=...
+
+        Response on success:
+        {"MATRICULA": "...", "CARGA": [...], "DETALLES": {...}, ...}
+        {"MATRICULA": "...", "ERROR": {...}}
+    """
+    return StreamingResponse(
+        groups.stream_loads(grade, group, partial), media_type="application/x-ndjson"
+    )
+
+
+@group_routes.get("/{grade}/{group}/loads/semiannual")
+@administrator
+async def get_semiannual_group_loads(
+        grade: Annotated[int, Path(ge=1, le=6)],
+        group: Annotated[str, Path(max_length=2)],
+        access: Annotated[str, Query(...)],
+) -> StreamingResponse:
+    """
+    Stream the semiannual academic load of every student of a group.
+
+    Args:
+        grade (Annotated[int]): The grade of the group (1 to 6).
+        group (Annotated[str]): The group (at most 2 characters).
+        access (Annotated[str]): Access token of the administration.
+
+    Returns:
+        StreamingResponse: One JSON document per student (NDJSON).
+
+    Example:
+        Request:
+        GET /groups/3/B/loads/semiannual?access=...
+    """
+    return StreamingResponse(
+        groups.stream_loads(grade, group, 6), media_type="application/x-ndjson"
+    )
+
+
+@group_routes.get("/{grade}/boletas")
+@administrator
+async def get_grade_boletas(
+        grade: Annotated[int, Path(ge=1, le=6)],
+        access: Annotated[str, Query(...)],
+        partial: Annotated[int, Query(ge=1, le=3)],
+        rank: Annotated[int | None, Query(ge=1, le=6)] = None,
+) -> StreamingResponse:
+    """
+    Stream the boletas of every group of a grade for a specific partial.
+
+    Args:
+        grade (Annotated[int]): The grade (1 to 6).
+        access (Annotated[str]): Access token of the administration.
+        partial (Annotated[int]): The partial (1 to 3).
+        rank (Annotated[int | None]): Print the histories of this rank (1 to 6) instead
+        of the current academic loads.
+
+    Returns:
+        StreamingResponse: A ZIP archive with one PDF per student (`GRADO` + `GRUPO` /
+        `MATRICULA`.pdf) and `errores.json` with the students that can not be graded.
+    """
+    return archive(
+        boletas.grade_archive(grade, partial, rank), f"boletas_{grade}_parcial_{partial}.zip"
+    )
+
+
+@group_routes.get("/{grade}/boletas/semiannual")
+@administrator
+async def get_semiannual_grade_boletas(
+        grade: Annotated[int, Path(ge=1, le=6)],
+        access: Annotated[str, Query(...)],
+        rank: Annotated[int | None, Query(ge=1, le=6)] = None,
+) -> StreamingResponse:
+    """
+    Stream the semiannual boletas of every group of a grade.
+
+    Args:
+        grade (Annotated[int]): The grade (1 to 6).
+        access (Annotated[str]): Access token of the administration.
+        rank (Annotated[int | None]): Print the histories of this rank (1 to 6) instead
+        of the current academic loads.
+
+    Returns:
+        StreamingResponse: A ZIP archive with one PDF per student.
+    """
+    return archive(boletas.grade_archive(grade, 6, rank), f"boletas_{grade}_semestral.zip")
+
+
+@group_routes.get("/{grade}/{group}/boletas")
+@administrator
+async def get_group_boletas(
+        grade: Annotated[int, Path(ge=1, le=6)],
+        group: Annotated[str, Path(max_length=2)],
+        access: Annotated[str, Query(...)],
+        partial: Annotated[int, Query(ge=1, le=3)],
+        rank: Annotated[int | None, Query(ge=1, le=6)] = None,
+) -> StreamingResponse:
+    """
+    Stream the boletas of a group for a specific partial.
+
+    Args:
+        grade (Annotated[int]): The grade of the group (1 to 6).
+        group (Annotated[str]): The group (at most 2 characters).
+        access (Annotated[str]): Access token of the administration.
+        partial (Annotated[int]): The partial (1 to 3).
+        rank (Annotated[int | None]): Print the histories of this rank (1 to 6) instead
+        of the current academic loads.
+
+    Returns:
+        StreamingResponse: A ZIP archive with one PDF per student and `errores.json`
+        with the students that can not be graded.
+
+    Example:
+        Request:
+        GET /groups/3/B/boletas?partial=2&access=...
+    """
+    return archive(
+        boletas.group_archive(grade, group, partial, rank),
+        f"boletas_{grade}{group}_parcial_{partial}.zip"
+    )
+
+
+@group_routes.get("/{grade}/{group}/boletas/semiannual")
+@administrator
+async def get_semiannual_group_boletas(
+        grade: Annotated[int, Path(ge=1, le=6)],
+        group: Annotated[str, Path(max_length=2)],
+        access: Annotated[str, Query(...)],
+        rank: Annotated[int | None, Query(ge=1, le=6)] = None,
+) -> StreamingResponse:
+    """
+    Stream the semiannual boletas of a group.
+
+    Args:
+        grade (Annotated[int]): The grade of the group (1 to 6).
+        group (Annotated[str]): The group (at most 2 characters).
+        access (Annotated[str]): Access token of the administration.
+        rank (Annotated[int | None]): Print the histories of this rank (1 to 6) instead
+        of the current academic loads.
+
+    Returns:
+        StreamingResponse: A ZIP archive with one PDF per student.
+    """
+    return archive(
+        boletas.group_archive(grade, group, 6, rank), f"boletas_{grade}{group}_semestral.zip"
+    )
@@ -13,12 +13,16 @@ The routes use Bearer token authentication to ensure that only authorized users
 the data. The `CustomHTTPBearer` is used to handle the authentication process.
 
 The `HistoryServices` class is responsible for retrieving and formatting the academic history
-data, which is then returned as a `JSONResponse`.
+data, which is then returned as a `ORJSONResponse`.
 
 Dependencies:
     - Bearer Token Authentication: Required for both routes.
     - Valid enrollment ID, rank, and partial exam period (for `/histories/`) or rank (for
       `/histories/semiannual/`).
+    - Response caching: successful responses are cached per dataset generation
+      (`decorators.caching`).
+    - Data access: the services run in the bounded data thread pool, off the event loop
+      (`utils.executor_tools`).
 
 Example Requests:
     - GET {enrollment}/histories/?rank=3&partial=2
@@ -27,11 +31,13 @@ Example Requests:
 
 from typing import Annotated
 from fastapi import APIRouter, Path, Query, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.requests import Request
 from utils.token_tools import CustomHTTPBearer
 from services.history_services import HistoryServices
 from decorators.authenticator import authenticate
+from decorators.caching import caching
+from utils.executor_tools import run_blocking
 
 history_routes = APIRouter()
 history = HistoryServices()
@@ -40,12 +46,13 @@ bearer = CustomHTTPBearer()
 
 @history_routes.get("/", dependencies=[Depends(bearer)])
 @authenticate
+@caching
 async def get_academic_histories(
         request: Request,
         enrollment: Annotated[str, Path(max_length=15, min_length=15)],
         rank: Annotated[int, Query(ge=1, le=6)],
         partial: Annotated[int, Query(ge=1, le=3)],
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Retrieve academic history records for a student.
 
@@ -56,7 +63,7 @@ async def get_academic_histories(
         partial (Annotated[int]): The specific academic period (1 to 3).
 
     Returns:
-        JSONResponse: A response containing the student's academic history.
+        ORJSONResponse: A response containing the student's academic history.
                       - On success: Status code 200 with the academic history data.
                       - On failure: Status code and error details.
 
@@ -76,19 +83,21 @@ async def get_academic_histories(
             "message": "Custom exception"
         }
     """
-    return JSONResponse(
-        status_code=200,
-        content=history.get_histories(enrollment, partial, rank).to_repr()
+    data = await run_blocking(
+        "get_academic_histories", history.get_histories, enrollment, partial, rank
     )
 
+    return ORJSONResponse(status_code=200, content=data.to_repr())
+
 
 @history_routes.get("/semiannual", dependencies=[Depends(bearer)])
 @authenticate
+@caching
 async def get_semiannual_academic_histories(
         request: Request,
         enrollment: Annotated[str, Path(max_length=15, min_length=15)],
         rank: Annotated[int, Query(ge=1, le=6)],
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Retrieve semiannual academic history records for a student.
 
@@ -98,7 +107,7 @@ async def get_semiannual_academic_histories(
         rank (Annotated[int]): The academic rank of the student (1 to 6).
 
     Returns:
-        JSONResponse: A response containing the semiannual academic history.
+        ORJSONResponse: A response containing the semiannual academic history.
                       - On success: Status code 200 with the academic history data.
                       - On failure: Status code and error details.
 
@@ -118,7 +127,8 @@ async def get_semiannual_academic_histories(
             "message": "Custom exception"
         }
     """
-    return JSONResponse(
-        status_code=200,
-        content=history.get_histories(enrollment, 6, rank).to_repr()
+    data = await run_blocking(
+        "get_semiannual_academic_histories", history.get_histories, enrollment, 6, rank
     )
+
+    return ORJSONResponse(status_code=200, content=data.to_repr())
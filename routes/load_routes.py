@@ -8,28 +8,24 @@ It includes two main endpoints:
    for a specific partial period (0 to 3).
    The request requires the student's enrollment ID and optionally
    the partial period.
-   A background task is triggered to perform additional checks after
-   the request is processed.
 
 2. `/loads/semiannual` - Retrieves the semiannual academic load information
    for a student based on their enrollment ID.
-   Similar to the first endpoint, it triggers a background task for additional
-   processing.
 
 The routes utilize Bearer token authentication to ensure that only authorized
 users can access the data.
 Additionally, the `authenticate` decorator ensures proper user authentication
 for each request.
 
-The `LoadServices` class handles the retrieval of academic load data, and the
-`check_student` background task performs further checks asynchronously after
-the main task is completed.
+The `LoadServices` class handles the retrieval of academic load data.
 
 Dependencies:
     - Bearer Token Authentication: Required for both routes.
     - A valid enrollment ID, and optionally, the academic period for `/loads/`.
-    - The background task (`check_student`) is run asynchronously after retrieving
-      the data.
+    - Response caching: successful responses are cached per dataset generation
+      (`decorators.caching`).
+    - Data access: the services run in the bounded data thread pool, off the event loop
+      (`utils.executor_tools`).
 
 Example Requests:
     - GET {enrollment}/loads/?partial=2
@@ -37,13 +33,14 @@ Example Requests:
 """
 
 from typing import Annotated
-from fastapi import APIRouter, Path, Query, Depends, BackgroundTasks
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Path, Query, Depends
+from fastapi.responses import ORJSONResponse
 from fastapi.requests import Request
 from utils.token_tools import CustomHTTPBearer
 from decorators.authenticator import authenticate
+from decorators.caching import caching
 from services.load_services import LoadServices
-from tasks.fastapi_tasks import check_student_history
+from utils.executor_tools import run_blocking
 
 load_routes = APIRouter()
 load = LoadServices()
@@ -52,27 +49,25 @@ bearer = CustomHTTPBearer()
 
 @load_routes.get("/", dependencies=[Depends(bearer)])
 @authenticate
+@caching
 async def get_academic_load(
         request: Request,
-        background: BackgroundTasks,
         enrollment: Annotated[str, Path(max_length=15, min_length=15)],
         partial: Annotated[int, Query(ge=0, le=3)] = 0
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Retrieve academic load information for a student for a specific partial or
     period.
 
     Args:
         request (Request): The HTTP request object, automatically passed by FastAPI.
-        background (BackgroundTasks): The background tasks object, used to run tasks
-        asynchronously.
         enrollment (Annotated[str]): The student's enrollment ID. Must be exactly 15
         characters.
         partial (Annotated[int]): The academic period to fetch data for
         (0 to 3, default is 0).
 
     Returns:
-        JSONResponse: A response containing the student's academic load for the requested
+        ORJSONResponse: A response containing the student's academic load for the requested
                       partial.
                       - On success: Status code 200 with the academic load data.
                       - On failure: Status code and error details.
@@ -81,10 +76,6 @@ async def get_academic_load(
         Requires a valid bearer token in the `Authorization` header.
         The `authenticate` decorator ensures that the user is properly authenticated.
 
-    Background Task:
-        After processing the academic load, a background task (`check_student`) is triggered
-        to perform further checks or operations asynchronously.
-
     Example:
         Request:
         GET {enrollment}/loads/?partial=2
@@ -98,10 +89,11 @@ async def get_academic_load(
             "message": "Custom exception"
         }
     """
-    response = load.get_academic_load(enrollment, partial).to_repr()
-    #background.add_task(check_student_history, response)
+    response = (await run_blocking(
+        "get_academic_load", load.get_academic_load, enrollment, partial
+    )).to_repr()
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content=response
     )
@@ -109,23 +101,21 @@ async def get_academic_load(
 
 @load_routes.get("/semiannual", dependencies=[Depends(bearer)])
 @authenticate
+@caching
 async def get_semiannual_academic_load(
         request: Request,
-        background: BackgroundTasks,
         enrollment: Annotated[str, Path(max_length=15, min_length=15)],
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
         Retrieve semiannual academic load information for a student.
 
         Args:
             request (Request): The HTTP request object, automatically passed by FastAPI.
-            background (BackgroundTasks): The background tasks object, used to run tasks
-            asynchronously.
             enrollment (Annotated[str]): The student's enrollment ID. Must be exactly
             15 characters.
 
         Returns:
-            JSONResponse: A response containing the student's semiannual academic load.
+            ORJSONResponse: A response containing the student's semiannual academic load.
                           - On success: Status code 200 with the semiannual academic load data.
                           - On failure: Status code and error details.
 
@@ -133,10 +123,6 @@ async def get_semiannual_academic_load(
             Requires a valid bearer token in the `Authorization` header.
             The `authenticate` decorator ensures that the user is properly authenticated.
 
-        Background Task:
-            After processing the semiannual academic load, a background task (`check_student`) is triggered
-            to perform further checks or operations asynchronously.
-
         Example:
             Request:
             GET {enrollment}/loads/semiannual
@@ -150,10 +136,11 @@ async def get_semiannual_academic_load(
                 "message": "Custom exception"
             }
         """
-    response = load.get_academic_load(enrollment, 6).to_repr()
-    #background.add_task(check_student_history, response)
+    response = (await run_blocking(
+        "get_semiannual_academic_load", load.get_academic_load, enrollment, 6
+    )).to_repr()
 
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=200,
         content=response
     )
@@ -0,0 +1,61 @@
+"""
+This file defines the route for retrieving the profiles of single requests.
+
+A request is profiled when the administration flags it (see
+`middlewares.profiling_middleware`); its response carries the `X-Profile-Id` header.
+
+It includes one endpoint:
+
+1. `/profiles/{profile_id}` - Returns a stored profile: the text report sorted by
+   cumulative time (`output_format=txt`, default) or the `pstats` dump
+   (`output_format=pstats`), to open with `pstats`, snakeviz, etc.
+
+Dependencies:
+    - Administration access: the `access` query parameter must be the access token of the
+      administration (`decorators.authenticator.administrator`).
+
+Example Requests:
+    - GET /profiles/3f2a...?access=...
+    - GET /profiles/3f2a...?output_format=pstats&access=...
+"""
+
+from os import path
+from typing import Annotated, Literal
+from fastapi import APIRouter, Path, Query
+from fastapi.responses import FileResponse
+from decorators.authenticator import administrator
+from errors.errors import NotFoundProfile
+from utils.profile_tools import FORMATS, output_path
+
+profile_routes = APIRouter()
+
+
+@profile_routes.get("/{profile_id}")
+@administrator
+async def get_profile(
+        profile_id: Annotated[str, Path(pattern=r"^[0-9a-f]{32}$")],
+        access: Annotated[str, Query(...)],
+        output_format: Annotated[Literal["txt", "pstats"], Query()] = "txt",
+) -> FileResponse:
+    """
+    Return a stored profile.
+
+    Args:
+        profile_id (Annotated[str]): The `X-Profile-Id` of the profiled response.
+        access (Annotated[str]): Access token of the administration.
+        output_format (Annotated[str]): "txt" (default) or "pstats".
+
+    Returns:
+        FileResponse: The text report or the `pstats` dump.
+
+    Raises:
+        NotFoundProfile: If there is no profile with that ID (or it was pruned).
+    """
+    file = output_path(profile_id, output_format)
+
+    if not path.isfile(file):
+        raise NotFoundProfile()
+
+    return FileResponse(
+        file, media_type=FORMATS[output_format], filename=f"{profile_id}.{output_format}"
+    )
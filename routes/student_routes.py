@@ -13,6 +13,10 @@ is used to ensure that a valid Bearer token is included in the request headers.
 Dependencies:
     - Bearer Token Authentication: Required for this route.
     - A valid enrollment ID that is exactly 15 characters long.
+    - Response caching: successful responses are cached per dataset generation
+      (`decorators.caching`).
+    - Data access: the services run in the bounded data thread pool, off the event loop
+      (`utils.executor_tools`).
 
 Example Request:
     - GET /students/{enrollment}
@@ -24,11 +28,13 @@ Example Response:
 
 from typing import Annotated
 from fastapi import APIRouter, Path, Depends
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.requests import Request
 from services.student_services import StudentServices
 from decorators.authenticator import authenticate
+from decorators.caching import caching
 from utils.token_tools import CustomHTTPBearer
+from utils.executor_tools import run_blocking
 
 student_routes = APIRouter()
 student = StudentServices()
@@ -37,10 +43,11 @@ bearer = CustomHTTPBearer()
 
 @student_routes.get("/{enrollment}", dependencies=[Depends(bearer)])
 @authenticate
+@caching
 async def get_student(
         request: Request,
         enrollment: Annotated[str, Path(max_length=15, min_length=15)]
-) -> JSONResponse:
+) -> ORJSONResponse:
     """
     Retrieve the student data based on the provided enrollment ID.
 
@@ -49,7 +56,7 @@ async def get_student(
         enrollment (Annotated[str]): The student's enrollment ID. Must be exactly 15 characters.
 
     Returns:
-        JSONResponse: A response containing the student's data.
+        ORJSONResponse: A response containing the student's data.
                       - On success: Status code 200 with the student data in the response.
                       - On failure: Status code and error details.
 
@@ -70,4 +77,6 @@ async def get_student(
             "message": "Custom exception"
         }
     """
-    return JSONResponse(status_code=200, content=student.get_student(enrollment).to_repr())
+    data = await run_blocking("get_student", student.get_student, enrollment)
+
+    return ORJSONResponse(status_code=200, content=data.to_repr())
@@ -19,7 +19,7 @@ and returning a JWT token that can be used for further API requests.
 
 from decorators.handlers import exception_handler
 from errors.errors import PasswordsDoNotMatch
-from models.student_model import ALUMNO
+from utils.snapshot_tools import snapshots
 from utils.token_tools import create_token
 
 
@@ -47,12 +47,12 @@ class AuthServices:
             student's enrollment number.
 
         Steps:
-            1. Retrieve the student using the CURP (username).
+            1. Retrieve the student using the CURP (username) from the snapshot index.
             2. Verify if the provided password matches the student's enrollment number.
             3. If they match, create a JWT token.
             4. Return the token and the student data.
         """
-        student = ALUMNO().get(CURP=username)
+        student = snapshots.current().get_student_by_curp(username)
 
         if student.MATRICULA != password:
             raise PasswordsDoNotMatch()
@@ -0,0 +1,286 @@
+"""
+This module defines the `BoletaServices` class, which prints the report cards (boletas)
+of a whole group or grade as PDF documents, delivered in a ZIP archive.
+
+The pipeline is a generator, so the archive streams while it is being rendered:
+1. The report card of every student is computed as the per-student endpoints do:
+   - Academic loads: the snapshot and the vectorized engine of `GroupServices`, which
+     yield the body of `LoadServices.get_academic_load`.
+   - Histories: `HISTORIAL` is read once for all the students and graded with `Ratings`,
+     as `HistoryServices.get_histories`.
+2. Every report card becomes the context of the `boleta.j2` template; contexts are sent
+   by batches of `BATCH_SIZE` to a process pool (`Config.RENDER_WORKERS` processes) that
+   renders them with `utils.pdf_tools`. The pool lives as long as the API worker, so the
+   templates and fonts cached by its processes are reused by every request. A bounded
+   number of batches is in flight, and they are collected in order.
+3. Every PDF is written to the ZIP archive (`GRADO` + `GRUPO` / `MATRICULA`.pdf) and
+   yielded right away. The PDFs are already compressed, so they are stored as they are.
+
+Students that can not be graded (e.g. the partial is not complete yet) get no boleta;
+they are listed, with the error of the per-student endpoint, in `errores.json`.
+
+With `Config.RENDER_WORKERS` = 0 the documents are rendered in the calling thread.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from threading import Lock
+from typing import Iterator
+from zipfile import ZipFile, ZIP_STORED
+from decorators.ratings import get_ratings
+from errors.errors import ServerBaseException, ServerError
+from models.history_model import HISTORIAL
+from models.student_model import ALUMNO
+from services.group_services import GroupServices
+from services.rebuild_services import normalize
+from utils.config_secrets import Config
+from utils.pdf_tools import render_batch
+from utils.response_tools import StreamSink, dumps
+from utils.snapshot_tools import Snapshot, snapshots
+
+TEMPLATE = "boleta.j2"
+BATCH_SIZE = 32
+
+SCHOOL = "COBACH Plantel 217 Soconusco"
+TITLE = "BOLETA DE CALIFICACIONES"
+
+PARTIAL_COLUMNS = (
+    ("CLAVE", 50), ("ASIGNATURA", 100), ("CALIFICACIÓN", 330), ("FALTAS", 395),
+    ("PALABRA", 435), ("OBSERVACIÓN", 490),
+)
+SEMIANNUAL_COLUMNS = (
+    ("CLAVE", 50), ("ASIGNATURA", 100), ("P1", 300), ("P2", 330), ("P3", 360),
+    ("PROMEDIO", 390), ("PALABRA", 440), ("OBSERVACIÓN", 490),
+)
+
+_pool: ProcessPoolExecutor | None = None
+_pool_lock = Lock()
+
+
+def pool() -> ProcessPoolExecutor:
+    """
+    Returns the rendering pool of the process, started on first use.
+    """
+    global _pool
+
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(Config.RENDER_WORKERS, mp_context=get_context("spawn"))
+        return _pool
+
+
+def grade_text(value) -> str:
+    """
+    Formats a grade of the model layer ("8.0", "None") for the boleta.
+    """
+    if value is None or str(value).strip() in ("", "None"):
+        return "-"
+
+    try:
+        number = float(value)
+    except ValueError:
+        return str(value)
+
+    return str(int(number)) if number.is_integer() else str(number)
+
+
+class BoletaServices:
+    """
+    BoletaServices renders the report cards of groups and grades as PDF documents.
+    """
+
+    groups = GroupServices()
+
+    @get_ratings
+    def _history(
+            self, enrollment: str, partial: int, snapshot: Snapshot, records: list[dict]
+    ) -> ALUMNO:
+        """
+        Builds the academic history of a student for one rank, as
+        `HistoryServices.get_histories`.
+        """
+        student = snapshot.get_student(enrollment)
+        setattr(student, "HISTORIAL", [dict(record) for record in records])
+
+        return student
+
+    def histories(self, snapshot: Snapshot, enrollments: tuple[str], partial: int, rank: int
+                  ) -> Iterator[dict]:
+        """
+        Yields the academic history of every student for one rank, in order.
+
+        Args:
+            snapshot (Snapshot): The snapshot the students are read from.
+            enrollments (tuple[str]): The enrollments (MATRICULA) of the students.
+            partial (int): The partial (1 to 3, or 6 for semiannual).
+            rank (int): The grade rank of the histories (1 to 6).
+
+        Yields:
+            dict: The body of the per-student history endpoint, or the `MATRICULA` and
+            the `ERROR` of the students that can not be graded.
+        """
+        wanted, records = set(enrollments), {}
+
+        for record in HISTORIAL().get_all(easy_view=True):
+            if record["MATRICULA"] in wanted and normalize(record["GRADO"]) == str(rank):
+                records.setdefault(record["MATRICULA"], []).append(record)
+
+        for enrollment in enrollments:
+            try:
+                yield self._history(
+                    enrollment, partial, snapshot, records.get(enrollment, [])
+                ).to_repr()
+            except ServerBaseException as e:
+                yield {"MATRICULA": enrollment, "ERROR": e.to_dict()}
+            except (KeyError, ValueError) as e:
+                yield {"MATRICULA": enrollment, "ERROR": ServerError(str(e)).to_dict()}
+
+    @staticmethod
+    def context(document: dict, partial: int, rank: int | None = None) -> dict:
+        """
+        Builds the template context of the boleta of a graded student.
+
+        Args:
+            document (dict): The report card (body of the load or history endpoint).
+            partial (int): The partial (1 to 3, or 6 for semiannual).
+            rank (int | None): The grade rank, for histories.
+
+        Returns:
+            dict: The context of `boleta.j2`.
+        """
+        records = document.get("CARGA") if rank is None else document.get("HISTORIAL")
+        details = document.get("DETALLES") or {}
+        rows = []
+
+        for record in records or []:
+            subject = (
+                (record.get("DATOS_MATERIA") or {}).get("ASIGNATURA")
+                if rank is None else record.get("ASIGNATURA")
+            )
+
+            if partial == 6:
+                rows.append([
+                    record.get("CLAVEMAT"), str(subject or "")[:36],
+                    *(grade_text(record.get(f"PARCIAL_{number}")) for number in (1, 2, 3)),
+                    grade_text(record.get("PROMEDIO")), record.get("PALABRA"),
+                    record.get("OBSERVA"),
+                ])
+            else:
+                rows.append([
+                    record.get("CLAVEMAT"), str(subject or "")[:45],
+                    grade_text(record.get(f"PARCIAL_{partial}")),
+                    grade_text(record.get(f"FALTAS_{partial}")), record.get("PALABRA"),
+                    record.get("OBSERVA"),
+                ])
+
+        period = "Semestral" if partial == 6 else f"Parcial {partial}"
+        summary = [("Promedio final", grade_text(details.get("PROMEDIO_FINAL")))]
+
+        if "TOTAL_FALTAS" in details:
+            summary.insert(0, ("Total de faltas", details["TOTAL_FALTAS"]))
+
+        return {
+            "school": SCHOOL,
+            "title": TITLE,
+            "period": period if rank is None else f"Historial de {rank}° semestre - {period}",
+            "student": {
+                field: document.get(field) or ""
+                for field in ("MATRICULA", "NOMBRES", "APELLIDOS", "CURP", "GRADO", "GRUPO")
+            },
+            "columns": SEMIANNUAL_COLUMNS if partial == 6 else PARTIAL_COLUMNS,
+            "rows": rows,
+            "summary": summary,
+        }
+
+    @staticmethod
+    def render(batches: Iterator[list[tuple[str, dict]]]) -> Iterator[tuple[str, bytes]]:
+        """
+        Renders batches of boletas in the pool, keeping a bounded number of batches in
+        flight, and yields the PDFs in order.
+        """
+        if Config.RENDER_WORKERS <= 0:
+            for batch in batches:
+                yield from render_batch(TEMPLATE, batch)
+            return
+
+        executor, pending = pool(), deque()
+
+        for batch in batches:
+            pending.append(executor.submit(render_batch, TEMPLATE, batch))
+
+            if len(pending) >= 2 * Config.RENDER_WORKERS:
+                yield from pending.popleft().result()
+
+        while pending:
+            yield from pending.popleft().result()
+
+    def archive(self, enrollments: tuple[str], snapshot: Snapshot, partial: int,
+                rank: int | None = None) -> Iterator[bytes]:
+        """
+        Yields the ZIP archive with the boletas of some students, part by part.
+
+        Args:
+            enrollments (tuple[str]): The enrollments (MATRICULA) of the students.
+            snapshot (Snapshot): The snapshot the students are read from.
+            partial (int): The partial (1 to 3, or 6 for semiannual).
+            rank (int | None): Print the histories of this rank instead of the current
+            academic loads.
+
+        Yields:
+            bytes: The parts of the ZIP archive.
+        """
+        documents = (
+            self.groups.documents(snapshot, enrollments, partial)
+            if rank is None else self.histories(snapshot, enrollments, partial, rank)
+        )
+        errors = []
+
+        def batches() -> Iterator[list[tuple[str, dict]]]:
+            batch = []
+
+            for document in documents:
+                if "ERROR" in document:
+                    errors.append(document)
+                    continue
+
+                file_name = (
+                    f"{normalize(document.get('GRADO'))}{document.get('GRUPO') or ''}/"
+                    f"{document['MATRICULA']}.pdf"
+                )
+                batch.append((file_name, self.context(document, partial, rank)))
+
+                if len(batch) == BATCH_SIZE:
+                    yield batch
+                    batch = []
+
+            if batch:
+                yield batch
+
+        sink = StreamSink()
+
+        with ZipFile(sink, "w", ZIP_STORED) as archive:
+            for file_name, pdf in self.render(batches()):
+                archive.writestr(file_name, pdf)
+                yield sink.drain()
+
+            if errors:
+                archive.writestr("errores.json", dumps(errors))
+
+        yield sink.drain()
+
+    def group_archive(self, grade: int, group: str, partial: int, rank: int | None = None
+                      ) -> Iterator[bytes]:
+        """
+        Yields the ZIP archive with the boletas of a group (`GRADO`, `GRUPO`).
+        """
+        snapshot = snapshots.current()
+        return self.archive(snapshot.get_group(grade, group), snapshot, partial, rank)
+
+    def grade_archive(self, grade: int, partial: int, rank: int | None = None
+                      ) -> Iterator[bytes]:
+        """
+        Yields the ZIP archive with the boletas of every group of a `GRADO`.
+        """
+        snapshot = snapshots.current()
+        return self.archive(snapshot.get_grade(grade), snapshot, partial, rank)
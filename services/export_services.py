@@ -0,0 +1,269 @@
+"""
+This module defines the `ExportServices` class, which exports the computed grades of the
+whole school for the state system and spreadsheets.
+
+The export is a generator pipeline whose memory does not grow with its output:
+1. `ALUMNO`, `CARGA` (or `HISTORIAL` for a past rank) and `ASIGNATURA` are read through
+   `DBFReader`, which maps the tables instead of loading them. The only whole-table
+   structure is the raw `MATRICULA` of the records, sorted once.
+2. Students are taken by chunks of `CHUNK_SIZE`; their records are found with a binary
+   search over the sorted enrollments, and only those rows are decoded and graded at
+   once with the vectorized engine of `utils.grading_tools` (same results as `Ratings`).
+3. Every chunk is encoded and yielded right away: CSV, NDJSON or Parquet (one row group
+   per chunk, so downstream tools can read the row groups in parallel).
+
+There is one row per student and subject (`COLUMNS`), with the grade of the partial (or
+the rounded semester average), its word equivalent and status, and the final average
+of the student. `ESTADO` tells whether the student could be graded. Students without
+records get a single row with `ESTADO` = "SIN_DATOS".
+
+Parquet needs the optional `pyarrow` package; without it, `ExportUnavailable` is raised.
+"""
+
+import csv
+from io import StringIO
+from typing import Iterator
+import numpy as np
+from errors.errors import ExportUnavailable
+from models.history_model import HISTORIAL
+from models.load_model import CARGA
+from models.student_model import ALUMNO
+from models.topic_model import ASIGNATURA
+from services.rebuild_services import normalize
+from utils.dbf_tools import DBFReader
+from utils.grading_tools import (
+    GRADED, INCOMPLETE, NO_DATA, INVALID, grade_partials, grade_semiannual
+)
+from utils.response_tools import StreamSink, dumps
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+CHUNK_SIZE = 4096
+
+COLUMNS = (
+    "MATRICULA", "NOMBRES", "APELLIDOS", "GRADO", "GRUPO", "CLAVEMAT", "ASIGNATURA",
+    "CALIFICACION", "FALTAS", "PALABRA", "OBSERVA", "TOTAL_FALTAS", "PROMEDIO_FINAL", "ESTADO",
+)
+
+STATES = {GRADED: "CALIFICADO", INCOMPLETE: "INCOMPLETO", NO_DATA: "SIN_DATOS", INVALID: "INVALIDO"}
+
+FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+
+class ExportServices:
+    """
+    ExportServices streams the grades of the whole school.
+    """
+
+    @staticmethod
+    def _subjects() -> dict[str, str]:
+        """
+        Returns the subject names by `CLAVE_IN` (the last record wins).
+        """
+        with DBFReader(ASIGNATURA.__ctx__) as subjects:
+            return dict(zip(subjects.text("CLAVE_IN").tolist(), subjects.text("ASIGNATURA").tolist()))
+
+    def chunks(self, partial: int, rank: int | None = None) -> Iterator[list[dict]]:
+        """
+        Yields the export rows of the school, by chunks of `CHUNK_SIZE` students.
+
+        Args:
+            partial (int): The partial (1 to 3) or 6 for the semester.
+            rank (int | None): Export the histories (`HISTORIAL`) of this rank instead of
+            the current academic loads (`CARGA`).
+
+        Yields:
+            list[dict]: The rows of a chunk of students, with the keys of `COLUMNS`.
+        """
+        subjects = self._subjects() if rank is None else None
+        numbers = (1, 2, 3) if partial == 6 else (partial,)
+
+        with DBFReader(ALUMNO.__ctx__) as students, \
+                DBFReader(CARGA.__ctx__ if rank is None else HISTORIAL.__ctx__) as records:
+            faults = (
+                f"FALTAS_{partial}"
+                if partial != 6 and f"FALTAS_{partial}" in records.fields else None
+            )
+            enrollments = np.char.strip(students.raw("MATRICULA"))
+            owners = np.char.strip(records.raw("MATRICULA"))
+            order = np.argsort(owners, kind="stable")
+            owners = owners[order]
+
+            for start in range(0, len(enrollments), CHUNK_SIZE):
+                span = slice(start, start + CHUNK_SIZE)
+                chunk = enrollments[span]
+                lower = np.searchsorted(owners, chunk, side="left")
+                upper = np.searchsorted(owners, chunk, side="right")
+                codes = np.repeat(np.arange(len(chunk)), upper - lower)
+                rows = (
+                    np.concatenate([order[low:high] for low, high in zip(lower, upper)])
+                    if len(chunk) else np.array([], dtype=np.int64)
+                )
+
+                if rank is not None:
+                    selected = np.array(
+                        [normalize(grade) == str(rank) for grade in records.column("GRADO", rows)],
+                        dtype=bool,
+                    )
+                    codes, rows = codes[selected], rows[selected]
+
+                grades = {number: records.numbers(f"PARCIAL_{number}", rows) for number in numbers}
+                absences = None if faults is None else records.numbers(faults, rows)
+
+                if partial == 6:
+                    result = grade_semiannual(codes, len(chunk), *grades.values())
+                    values = result.averages
+                else:
+                    result = grade_partials(codes, len(chunk), grades[partial], absences, partial)
+                    values = [None if np.isnan(value) else float(value)
+                              for value in grades[partial]]
+
+                people = {
+                    name: students.column(name, span)
+                    for name in ("MATRICULA", "NOMBRES", "APELLIDOS", "GRADO", "GRUPO")
+                }
+                names = (
+                    [subjects.get(key) for key in records.text("CLAVE_IN", rows).tolist()]
+                    if rank is None else records.text("ASIGNATURA", rows).tolist()
+                )
+
+                yield self._rows(
+                    people, np.bincount(codes, minlength=len(chunk)), result, values,
+                    records.text("CLAVEMAT", rows).tolist(), names,
+                    None if partial == 6 else absences
+                )
+
+    @staticmethod
+    def _rows(people, counts, result, values, keys, names, faults) -> list[dict]:
+        """
+        Assembles the export rows of a graded chunk of students. `counts` holds the number
+        of records of every student; the record columns are aligned with the graded rows.
+        """
+        output, offset = [], 0
+
+        for code, count in enumerate(counts.tolist()):
+            student = {
+                "MATRICULA": people["MATRICULA"][code],
+                "NOMBRES": people["NOMBRES"][code],
+                "APELLIDOS": people["APELLIDOS"][code],
+                "GRADO": normalize(people["GRADO"][code]),
+                "GRUPO": people["GRUPO"][code],
+            }
+            status = int(result.status[code])
+            summary = {
+                "TOTAL_FALTAS": (
+                    int(result.total_faults[code])
+                    if status == GRADED and result.total_faults is not None else None
+                ),
+                "PROMEDIO_FINAL": result.final_average[code],
+                "ESTADO": STATES[status],
+            }
+
+            if count == 0:
+                output.append({
+                    **student, "CLAVEMAT": None, "ASIGNATURA": None, "CALIFICACION": None,
+                    "FALTAS": None, "PALABRA": None, "OBSERVA": None, **summary,
+                })
+
+            for position in range(offset, offset + count):
+                fault = None if faults is None else faults[position]
+
+                output.append({
+                    **student,
+                    "CLAVEMAT": keys[position],
+                    "ASIGNATURA": names[position],
+                    "CALIFICACION": values[position],
+                    "FALTAS": None if fault is None or np.isnan(fault) else int(fault),
+                    "PALABRA": result.words[position],
+                    "OBSERVA": result.observations[position],
+                    **summary,
+                })
+
+            offset += count
+
+        return output
+
+    @staticmethod
+    def to_csv(chunks: Iterator[list[dict]]) -> Iterator[bytes]:
+        """
+        Encodes the export as CSV (UTF-8 with BOM, so spreadsheets detect the encoding).
+        """
+        buffer = StringIO()
+        writer = csv.DictWriter(buffer, fieldnames=COLUMNS)
+        writer.writeheader()
+        yield ("\ufeff" + buffer.getvalue()).encode()
+
+        for chunk in chunks:
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode()
+
+    @staticmethod
+    def to_ndjson(chunks: Iterator[list[dict]]) -> Iterator[bytes]:
+        """
+        Encodes the export as NDJSON, one row per line.
+        """
+        for chunk in chunks:
+            yield b"".join(dumps(row) + b"\n" for row in chunk)
+
+    @staticmethod
+    def to_parquet(chunks: Iterator[list[dict]]) -> Iterator[bytes]:
+        """
+        Encodes the export as Parquet, one row group per chunk, streaming every row
+        group as soon as it is written.
+        """
+        schema = pa.schema([
+            ("MATRICULA", pa.string()), ("NOMBRES", pa.string()), ("APELLIDOS", pa.string()),
+            ("GRADO", pa.string()), ("GRUPO", pa.string()), ("CLAVEMAT", pa.string()),
+            ("ASIGNATURA", pa.string()), ("CALIFICACION", pa.float64()), ("FALTAS", pa.int64()),
+            ("PALABRA", pa.string()), ("OBSERVA", pa.string()), ("TOTAL_FALTAS", pa.int64()),
+            ("PROMEDIO_FINAL", pa.float64()), ("ESTADO", pa.string()),
+        ])
+        sink = StreamSink()
+
+        with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+            for chunk in chunks:
+                if chunk:
+                    writer.write_table(pa.Table.from_pylist(chunk, schema=schema))
+                    yield sink.drain()
+
+        yield sink.drain()
+
+    def export(self, export_format: str, partial: int, rank: int | None = None
+               ) -> tuple[Iterator[bytes], str, str]:
+        """
+        Prepares the export of the school's grades.
+
+        Args:
+            export_format (str): "csv", "ndjson" or "parquet".
+            partial (int): The partial (1 to 3) or 6 for the semester.
+            rank (int | None): Export the histories of this rank instead of the current loads.
+
+        Returns:
+            tuple[Iterator[bytes], str, str]: The encoded chunks, the media type and the
+            file name of the export.
+
+        Raises:
+            ExportUnavailable: If the format needs `pyarrow` and it is not installed.
+        """
+        if export_format == "parquet" and pq is None:
+            raise ExportUnavailable()
+
+        media_type, extension = FORMATS[export_format]
+        encode = getattr(self, f"to_{export_format}")
+        period = "semestral" if partial == 6 else f"parcial_{partial}"
+        source = "cargas" if rank is None else f"historial_{rank}"
+
+        return (
+            encode(self.chunks(partial, rank)), media_type,
+            f"calificaciones_{source}_{period}.{extension}"
+        )
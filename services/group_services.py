@@ -0,0 +1,130 @@
+"""
+This module defines the `GroupServices` class, which builds the report cards of every
+student of a group (`GRADO`, `GRUPO`) in one request, for tutors and administration.
+
+Key Features:
+- The students of the group and their academic loads are resolved from the in-memory
+  snapshot (`utils.snapshot_tools`): no DBF is read per student.
+- Students are graded by chunks of `CHUNK_SIZE` with the vectorized engine of
+  `utils.grading_tools`, which yields the same results as `Ratings`.
+- The report cards are produced by a generator, one NDJSON line per student, so memory
+  stays flat regardless of the size of the group.
+
+Every line is the body the per-student load endpoint would return for that student and
+partial. Students that can not be graded (e.g. the partial is not complete yet) get a
+line with their `MATRICULA` and the error that endpoint would return.
+"""
+
+from typing import Iterator
+import numpy as np
+from errors.errors import ServerBaseException
+from utils.grading_tools import BatchGrades, grade_partials, grade_semiannual, to_numbers
+from utils.response_tools import dumps
+from utils.snapshot_tools import Snapshot, snapshots
+
+CHUNK_SIZE = 256
+
+
+class GroupServices:
+    """
+    GroupServices builds the report cards of whole groups.
+    """
+
+    @staticmethod
+    def _grade(loads: list[list[dict]], partial: int) -> BatchGrades | None:
+        """
+        Grades the academic loads of a chunk of students at once.
+
+        Args:
+            loads (list[list[dict]]): The academic load of every student.
+            partial (int): The partial (1 to 3, 6 for semiannual, 0 for none).
+
+        Returns:
+            BatchGrades | None: The grades, or None for partial 0.
+        """
+        if partial == 0:
+            return None
+
+        codes = np.repeat(np.arange(len(loads)), [len(load) for load in loads])
+        records = [record for load in loads for record in load]
+
+        def column(name: str, default: str = "None") -> np.ndarray:
+            return to_numbers([record.get(name, default) for record in records])
+
+        if partial == 6:
+            return grade_semiannual(
+                codes, len(loads), column("PARCIAL_1"), column("PARCIAL_2"), column("PARCIAL_3")
+            )
+
+        return grade_partials(
+            codes, len(loads), column(f"PARCIAL_{partial}"),
+            column(f"FALTAS_{partial}", "0"), partial
+        )
+
+    @staticmethod
+    def _report(snapshot: Snapshot, enrollment: str, load: list[dict],
+                grades: BatchGrades | None, code: int, offset: int) -> dict:
+        """
+        Assembles the report card of one student, as `LoadServices.get_academic_load`.
+        """
+        student = snapshot.get_student(enrollment)
+        setattr(student, "CARGA", load)
+
+        if grades is None:
+            return student.to_repr()
+
+        details = grades.details(code)
+
+        for row, record in enumerate(load, offset):
+            if grades.averages is not None:
+                record["PROMEDIO"] = grades.averages[row]
+            record["PALABRA"], record["OBSERVA"] = grades.words[row], grades.observations[row]
+
+        setattr(student, "DETALLES", details)
+        return student.to_repr()
+
+    def documents(self, snapshot: Snapshot, enrollments: tuple[str], partial: int
+                  ) -> Iterator[dict]:
+        """
+        Yields the report card of every student, in order.
+
+        Args:
+            snapshot (Snapshot): The snapshot the students are read from.
+            enrollments (tuple[str]): The enrollments (MATRICULA) of the students.
+            partial (int): The partial (1 to 3, 6 for semiannual, 0 for none).
+
+        Yields:
+            dict: The body of the per-student load endpoint, or the `MATRICULA` and the
+            `ERROR` of the students that can not be graded.
+        """
+        for start in range(0, len(enrollments), CHUNK_SIZE):
+            chunk = enrollments[start:start + CHUNK_SIZE]
+            loads = [snapshot.get_academic_load(enrollment) for enrollment in chunk]
+            snapshot.catalog.merge(*loads)
+            grades = self._grade(loads, partial)
+            offset = 0
+
+            for code, (enrollment, load) in enumerate(zip(chunk, loads)):
+                try:
+                    yield self._report(snapshot, enrollment, load, grades, code, offset)
+                except ServerBaseException as e:
+                    yield {"MATRICULA": enrollment, "ERROR": e.to_dict()}
+
+                offset += len(load)
+
+    def stream_loads(self, grade: int, group: str, partial: int) -> Iterator[bytes]:
+        """
+        Yields the report cards of every student of a group, one NDJSON line each.
+
+        Args:
+            grade (int): The grade (`GRADO`) of the group.
+            group (str): The group (`GRUPO`).
+            partial (int): The partial (1 to 3, 6 for semiannual, 0 for none).
+
+        Yields:
+            bytes: One JSON document per student, followed by a newline.
+        """
+        snapshot = snapshots.current()
+
+        for document in self.documents(snapshot, snapshot.get_group(grade, group), partial):
+            yield dumps(document) + b"\n"
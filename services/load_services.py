@@ -20,11 +20,10 @@ This service is typically used to fetch a student's academic load, calculate rat
 and enhance the data by including subject details for reporting or analysis purposes.
 """
 
-from models.load_model import CARGA
-from models.topic_model import ASIGNATURA
 from models.student_model import ALUMNO
 from decorators.handlers import exception_handler
 from decorators.ratings import get_ratings
+from utils.snapshot_tools import Snapshot, snapshots
 
 
 class LoadServices:
@@ -33,13 +32,14 @@ class LoadServices:
     courses (subjects) and assigning ratings to those subjects.
     """
 
-    def _merge_topics(self, ref: ALUMNO) -> None:
+    def _merge_topics(self, ref: ALUMNO, snapshot: Snapshot) -> None:
         """
         Merges the course (subject) data into the student's academic load.
 
         Args:
             ref (ALUMNO): The student object whose courses (CARGA) will be
             enriched with subject details.
+            snapshot (Snapshot): The snapshot the subjects are resolved from.
 
         Returns:
             None: This method modifies the student's CARGA attribute in place
@@ -47,13 +47,10 @@ class LoadServices:
 
         Steps:
             1. Iterates over each course in the student's CARGA (academic load).
-            2. For each course, it fetches additional data about the subject (ASIGNATURA) using the
-               course's CLAVE_IN and adds this information to the respective course in CARGA.
+            2. For each course, it resolves the subject (ASIGNATURA) from the snapshot's
+               catalog using the course's CLAVE_IN and adds it to the respective course in CARGA.
         """
-        for charge in getattr(ref, "CARGA"):
-            charge["DATOS_MATERIA"] = ASIGNATURA().get_all(
-                CLAVE_IN=charge["CLAVE_IN"], easy_view=True
-            )[-1]
+        snapshot.catalog.merge(getattr(ref, "CARGA"))
 
     @exception_handler
     @get_ratings
@@ -74,8 +71,12 @@ class LoadServices:
             2. Fetches the student's academic load (CARGA) and applies ratings to each course.
             3. Merges the subject data (ASIGNATURA) into the student's academic load.
             4. Returns the student object with the updated academic load.
+
+        Every lookup is served by the in-memory snapshot (`utils.snapshot_tools`).
         """
-        student = ALUMNO().get(MATRICULA=enrollment, relates=True, exclude=["HISTORIAL"])
-        self._merge_topics(student)
+        snapshot = snapshots.current()
+        student = snapshot.get_student(enrollment)
+        setattr(student, "CARGA", snapshot.get_academic_load(enrollment))
+        self._merge_topics(student, snapshot)
 
         return student
@@ -0,0 +1,361 @@
+"""
+This module defines the `RebuildServices` class, the bulk engine that rebuilds the academic
+histories (`HISTORIALES.dbf`) of the whole school from the current academic loads.
+
+It replaces the former per-student loop (`each_student`), which called
+`LoadServices.get_academic_load` three times per student and re-queried `HISTORIAL`
+for every call. The engine instead:
+1. Reads `alumnos.dbf`, `cargas.dbf`, `asignaturas.dbf` and `HISTORIALES.dbf` once each
+   through `DBFReader`, grouping the loads and the histories by `MATRICULA` in one pass.
+2. Joins students, loads and subjects in memory and evaluates the three partials together.
+3. Emits the complete set of history inserts and updates for the school (the plan).
+4. Applies the plan in one all-or-nothing batch (`utils.writer_tools.BulkWriter`).
+
+The plan can be computed by shards of students (contiguous `MATRICULA` ranges) in a
+process pool or in Celery workers (`Config.REBUILD_BACKEND` and `Config.REBUILD_WORKERS`).
+Shard results are merged in range order, so the plan does not depend on the order in
+which shards finish, and a failing shard is logged and skipped without affecting others.
+Every shard selects its rows on the raw `MATRICULA` bytes of each table
+(`DBFReader.between`) and only decodes and groups those, so the work is divided among
+the workers instead of repeated by each of them.
+
+Rules (the ones the former per-student `check_student_history` task implemented for each
+completed partial):
+- A student is considered once at least one partial is complete for every subject
+  of their academic load.
+- If the student has no history for their grade, one record per subject is inserted.
+- Otherwise, every partial missing in the history and present in the load is filled in.
+  Records are matched by `CLAVEMAT` (the former code matched them by position and
+  assigned the misspelled `PARTIAL_n` attributes, so updates were never saved).
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from time import perf_counter
+from models.student_model import ALUMNO
+from models.load_model import CARGA
+from models.topic_model import ASIGNATURA
+from models.history_model import HISTORIAL
+from utils.config_secrets import Config
+from utils.dbf_tools import DBFReader
+from utils.logging_config import app_logger
+from utils.writer_tools import BulkWriter, table_signature
+
+PARTIALS = ("PARCIAL_1", "PARCIAL_2", "PARCIAL_3")
+
+
+def is_blank(value) -> bool:
+    """
+    Tells whether a grade is missing: blank numbers (None) or the "None" sentinel
+    the model layer uses for them.
+    """
+    return value is None or (isinstance(value, str) and value.strip() in ("", "None"))
+
+
+def normalize(value) -> str:
+    """
+    Returns a comparable key for values that may be stored as numbers in one table
+    and as characters in another (e.g. `GRADO`).
+    """
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+class RebuildServices:
+    """
+    RebuildServices computes and applies the history inserts and updates of the
+    whole school in a single pass over the tables.
+    """
+
+    @staticmethod
+    def _read_students(lower: str | None = None, upper: str | None = None) -> list[dict]:
+        """
+        Returns the students (MATRICULA, GRADO, GRUPO) of a shard in file order.
+        """
+        with DBFReader(ALUMNO.__ctx__) as students:
+            students.between("MATRICULA", lower, upper)
+            return list(students.rows(["MATRICULA", "GRADO", "GRUPO"]))
+
+    @staticmethod
+    def _read_loads(lower: str | None = None, upper: str | None = None) -> dict[str, list[dict]]:
+        """
+        Returns the academic load records of a shard grouped by `MATRICULA`, in file order.
+        """
+        fields = ["CLAVE_IN", "CLAVEMAT", *PARTIALS]
+
+        with DBFReader(CARGA.__ctx__) as loads:
+            loads.between("MATRICULA", lower, upper)
+            columns = {field: loads.column(field) for field in fields}
+
+            return {
+                enrollment: [
+                    {field: columns[field][index] for field in fields}
+                    for index in indexes.tolist()
+                ]
+                for enrollment, indexes in loads.group_by("MATRICULA").items()
+            }
+
+    @staticmethod
+    def _read_subjects() -> dict[str, str]:
+        """
+        Returns the subject names by `CLAVE_IN` (the last record wins).
+        """
+        with DBFReader(ASIGNATURA.__ctx__) as subjects:
+            return dict(zip(subjects.column("CLAVE_IN"), subjects.column("ASIGNATURA")))
+
+    @staticmethod
+    def _read_histories(
+            lower: str | None = None, upper: str | None = None
+    ) -> dict[tuple[str, str], list[dict]]:
+        """
+        Returns the history records of a shard grouped by (`MATRICULA`, `GRADO`), each one
+        with its physical record number under `_RECORD`.
+        """
+        fields = ["GRADO", "CLAVEMAT", *PARTIALS]
+        groups = {}
+
+        with DBFReader(HISTORIAL.__ctx__) as histories:
+            histories.between("MATRICULA", lower, upper)
+            columns = {field: histories.column(field) for field in fields}
+            positions = histories.positions.tolist()
+
+            for enrollment, indexes in histories.group_by("MATRICULA").items():
+                for index in indexes.tolist():
+                    record = {field: columns[field][index] for field in fields}
+                    record["_RECORD"] = positions[index]
+                    groups.setdefault(
+                        (enrollment, normalize(record["GRADO"])), []
+                    ).append(record)
+
+        return groups
+
+    @staticmethod
+    def plan_student(
+            student: dict, loads: list[dict], subjects: dict[str, str], histories: list[dict]
+    ) -> tuple[list[dict], list[dict]]:
+        """
+        Computes the history inserts and updates of one student.
+
+        Args:
+            student (dict): The student (MATRICULA, GRADO, GRUPO).
+            loads (list[dict]): The student's academic load records.
+            subjects (dict[str, str]): Subject names by `CLAVE_IN`.
+            histories (list[dict]): The student's history records for their grade.
+
+        Returns:
+            tuple[list[dict], list[dict]]: The inserts and the updates.
+        """
+        completed = any(
+            all(not is_blank(load[partial]) for load in loads) for partial in PARTIALS
+        )
+
+        if not loads or not completed:
+            return [], []
+
+        if not histories:
+            return [
+                {
+                    "MATRICULA": student["MATRICULA"],
+                    "GRUPO": student["GRUPO"],
+                    "GRADO": student["GRADO"],
+                    "CLAVEMAT": load["CLAVEMAT"],
+                    "ASIGNATURA": subjects.get(load["CLAVE_IN"]),
+                    **{partial: load[partial] for partial in PARTIALS},
+                }
+                for load in loads
+            ], []
+
+        by_subject = {load["CLAVEMAT"]: load for load in loads}
+        updates = []
+
+        for history in histories:
+            load = by_subject.get(history["CLAVEMAT"])
+
+            if load is None:
+                continue
+
+            changes = {
+                partial: load[partial]
+                for partial in PARTIALS
+                if not is_blank(load[partial]) and is_blank(history[partial])
+            }
+
+            if changes:
+                updates.append({
+                    "_RECORD": history["_RECORD"],
+                    "MATRICULA": student["MATRICULA"],
+                    "GRADO": history["GRADO"],
+                    "CLAVEMAT": history["CLAVEMAT"],
+                    "CHANGES": changes,
+                })
+
+        return [], updates
+
+    def plan(self, lower: str | None = None, upper: str | None = None) -> dict:
+        """
+        Computes the history inserts and updates of the students whose enrollment is in
+        [lower, upper) (the whole school by default).
+
+        Args:
+            lower (str | None): First enrollment of the shard (inclusive).
+            upper (str | None): Last enrollment of the shard (exclusive).
+
+        Returns:
+            dict: The plan, with the "inserts" and "updates" lists.
+        """
+        loads = self._read_loads(lower, upper)
+        subjects = self._read_subjects()
+        histories = self._read_histories(lower, upper)
+        inserts, updates = [], []
+
+        for student in self._read_students(lower, upper):
+            enrollment = student["MATRICULA"]
+            student_inserts, student_updates = self.plan_student(
+                student,
+                loads.get(enrollment, []),
+                subjects,
+                histories.get((enrollment, normalize(student["GRADO"])), []),
+            )
+            inserts.extend(student_inserts)
+            updates.extend(student_updates)
+
+        return {"inserts": inserts, "updates": updates}
+
+    @staticmethod
+    def shards(count: int) -> list[tuple[str | None, str | None]]:
+        """
+        Splits the students into `count` contiguous `MATRICULA` ranges of similar size.
+
+        Args:
+            count (int): The number of shards wanted.
+
+        Returns:
+            list[tuple[str | None, str | None]]: The [lower, upper) bounds of every shard.
+        """
+        with DBFReader(ALUMNO.__ctx__) as students:
+            enrollments = sorted(set(students.text("MATRICULA").tolist()))
+
+        count = max(1, min(count, len(enrollments)))
+        size = -(-len(enrollments) // count) if enrollments else 1
+        bounds = [enrollments[index] for index in range(size, len(enrollments), size)]
+
+        return list(zip([None, *bounds], [*bounds, None]))
+
+    def plan_sharded(self, workers: int, backend: str) -> tuple[dict, list[dict]]:
+        """
+        Computes the plan of the whole school by shards, in parallel.
+
+        Args:
+            workers (int): The number of shards (and parallel workers).
+            backend (str): "process" for a local process pool or "celery" for the
+            Celery workers of `utils.celery_config.app`.
+
+        Returns:
+            tuple[dict, list[dict]]: The merged plan and the shards that failed.
+        """
+        shards = self.shards(workers)
+
+        if backend == "celery":
+            from celery import group
+            from tasks.celery_tasks import plan_history_shard
+
+            job = group(plan_history_shard.s(lower, upper) for lower, upper in shards)
+            results = job.apply_async().get(propagate=False, disable_sync_subtasks=False)
+
+        else:
+            with ProcessPoolExecutor(len(shards), mp_context=get_context("spawn")) as pool:
+                futures = [pool.submit(plan_shard, lower, upper) for lower, upper in shards]
+                results = []
+
+                for future in futures:
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        results.append(e)
+
+        plan, failed = {"inserts": [], "updates": []}, []
+
+        for (lower, upper), result in zip(shards, results):
+            if isinstance(result, BaseException):
+                app_logger.error(
+                    f"Error on <RebuildServices.plan_sharded> [{lower}, {upper}): {str(result)}"
+                )
+                failed.append({"lower": lower, "upper": upper, "error": str(result)})
+                continue
+
+            plan["inserts"].extend(result["inserts"])
+            plan["updates"].extend(result["updates"])
+
+        return plan, failed
+
+    @staticmethod
+    def apply(plan: dict, expected: tuple | None = None) -> dict:
+        """
+        Writes a plan to `HISTORIALES.dbf` in a single all-or-nothing batch.
+
+        Args:
+            plan (dict): The plan returned by `plan`.
+            expected (tuple | None): The `table_signature` of `HISTORIALES.dbf` taken
+            before planning; the batch is rejected if the table changed since then.
+
+        Returns:
+            dict: The number of inserts and updates applied.
+        """
+        writer = BulkWriter(HISTORIAL.__ctx__, expected)
+
+        for update in plan["updates"]:
+            writer.update(update["_RECORD"], update["CHANGES"])
+
+        for insert in plan["inserts"]:
+            writer.insert(insert)
+
+        return writer.commit()
+
+    def rebuild(self, workers: int | None = None, backend: str | None = None) -> dict:
+        """
+        Rebuilds the histories of the whole school.
+
+        Args:
+            workers (int | None): Number of shards (`Config.REBUILD_WORKERS` by default).
+            backend (str | None): "inline", "process" or "celery"
+            (`Config.REBUILD_BACKEND` by default).
+
+        Returns:
+            dict: The number of inserts and updates, the failed shards and the time
+            spent planning and applying them, in seconds.
+        """
+        workers = workers or Config.REBUILD_WORKERS
+        backend = backend or Config.REBUILD_BACKEND
+
+        started = perf_counter()
+        expected = table_signature(HISTORIAL.__ctx__)
+
+        if backend == "inline" or workers <= 1:
+            plan, failed = self.plan(), []
+        else:
+            plan, failed = self.plan_sharded(workers, backend)
+
+        planned = perf_counter()
+        self.apply(plan, expected)
+        finished = perf_counter()
+
+        summary = {
+            "backend": backend,
+            "workers": workers,
+            "inserts": len(plan["inserts"]),
+            "updates": len(plan["updates"]),
+            "failed_shards": failed,
+            "plan_seconds": round(planned - started, 3),
+            "apply_seconds": round(finished - planned, 3),
+        }
+        app_logger.info(f"History rebuild on <RebuildServices.rebuild>: {summary}")
+
+        return summary
+
+
+def plan_shard(lower: str | None, upper: str | None) -> dict:
+    """
+    Computes the plan of one shard. Entry point of the process pool and Celery workers.
+    """
+    return RebuildServices().plan(lower, upper)
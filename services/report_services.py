@@ -0,0 +1,171 @@
+"""
+This module defines the `ReportServices` class, the ingest stage that materializes the
+report cards (boletas) of the whole school after every upload.
+
+For every student it computes, with the same services and `Ratings` logic the endpoints
+use, the response bodies of:
+- `get_student`.
+- `get_academic_load` for partials 0 to 3 and `get_semiannual_academic_load`.
+- `get_academic_histories` for every rank (1 to 6) and partial (1 to 3) and
+  `get_semiannual_academic_histories` for every rank.
+
+The documents are written to the memory-mapped store of the dataset generation they were
+computed from (`utils.report_tools`), so the read endpoints serve them without running
+any grading logic. Requests the grading logic rejects (e.g. a partial that is not
+complete yet) are not materialized: they miss and are answered by the live path, which
+raises the same error as before.
+"""
+
+from time import perf_counter
+from typing import Iterator
+from fastapi.responses import ORJSONResponse
+from decorators.ratings import get_ratings
+from errors.errors import ServerBaseException
+from models.history_model import HISTORIAL
+from models.student_model import ALUMNO
+from services.rebuild_services import normalize
+from utils.dataset_tools import current_generation
+from utils.logging_config import app_logger
+from utils.report_tools import report_key, write_reports
+from utils.snapshot_tools import Snapshot, snapshots
+
+LOAD_PARTIALS = (0, 1, 2, 3)
+HISTORY_PARTIALS = (1, 2, 3)
+RANKS = (1, 2, 3, 4, 5, 6)
+
+
+class ReportServices:
+    """
+    ReportServices precomputes every report card of the school for the current
+    dataset generation.
+    """
+
+    @staticmethod
+    def render(student: ALUMNO) -> bytes:
+        """
+        Serializes a student exactly as the endpoints do (`orjson`).
+        """
+        return ORJSONResponse(content=student.to_repr()).body
+
+    @get_ratings
+    def _load(self, enrollment: str, partial: int, snapshot: Snapshot) -> ALUMNO:
+        """
+        Builds the academic load of a student, as `LoadServices.get_academic_load`.
+        """
+        student = snapshot.get_student(enrollment)
+        setattr(student, "CARGA", snapshot.get_academic_load(enrollment))
+        snapshot.catalog.merge(getattr(student, "CARGA"))
+
+        return student
+
+    @get_ratings
+    def _history(
+            self, enrollment: str, partial: int, snapshot: Snapshot, records: list[dict]
+    ) -> ALUMNO:
+        """
+        Builds the academic history of a student for one rank, as
+        `HistoryServices.get_histories`.
+        """
+        student = snapshot.get_student(enrollment)
+        setattr(student, "HISTORIAL", [dict(record) for record in records])
+
+        return student
+
+    def documents(
+            self, snapshot: Snapshot, histories: dict[tuple, list[dict]]
+    ) -> Iterator[tuple[bytes, bytes]]:
+        """
+        Computes every materializable response body of the school, one student at a time
+        in enrollment order, so they can be streamed to the store.
+
+        Requests the grading logic rejects (`ServerBaseException`, e.g. `InvalidTimePeriod`)
+        are skipped; any other error is logged and the request is skipped too.
+
+        Args:
+            snapshot (Snapshot): The snapshot of the generation being materialized.
+            histories (dict[tuple, list[dict]]): History records by (MATRICULA, GRADO).
+
+        Yields:
+            tuple[bytes, bytes]: The `report_key` and the response body of a request.
+        """
+        def render(route: str, enrollment: str, partial, rank, build) -> tuple | None:
+            key = report_key(route, enrollment, partial, rank)
+
+            if key is None:
+                return None
+
+            try:
+                return key, self.render(build())
+            except ServerBaseException:
+                return None
+            except Exception as e:
+                app_logger.error(f"Error on <ReportServices.documents> {key.decode()}: {str(e)}")
+                return None
+
+        position = snapshot.students.position("MATRICULA") if snapshot.students.rows else 0
+
+        for enrollment in sorted(row[position] for row in snapshot.students.rows):
+            requests = [
+                ("get_student", None, None, lambda: snapshot.get_student(enrollment)),
+                *(
+                    ("get_academic_load", partial, None,
+                     lambda partial=partial: self._load(enrollment, partial, snapshot))
+                    for partial in LOAD_PARTIALS
+                ),
+                ("get_semiannual_academic_load", None, None,
+                 lambda: self._load(enrollment, 6, snapshot)),
+            ]
+
+            for rank in RANKS:
+                records = histories.get((enrollment, str(rank)), [])
+                requests.extend(
+                    ("get_academic_histories", partial, rank,
+                     lambda partial=partial, records=records:
+                     self._history(enrollment, partial, snapshot, records))
+                    for partial in HISTORY_PARTIALS
+                )
+                requests.append((
+                    "get_semiannual_academic_histories", None, rank,
+                    lambda records=records: self._history(enrollment, 6, snapshot, records)
+                ))
+
+            for route, partial, rank, build in requests:
+                document = render(route, enrollment, partial, rank, build)
+
+                if document is not None:
+                    yield document
+
+    def materialize(self) -> dict | None:
+        """
+        Materializes the report cards of the current dataset generation.
+
+        Returns:
+            dict | None: The generation, the number of documents and the seconds spent,
+            or None if the generation changed while they were computed (the next
+            ingest will materialize the new one).
+        """
+        started = perf_counter()
+        snapshot = snapshots.current()
+        histories = {}
+
+        for record in HISTORIAL().get_all(easy_view=True):
+            histories.setdefault(
+                (record["MATRICULA"], normalize(record["GRADO"])), []
+            ).append(record)
+
+        count = write_reports(
+            snapshot.generation, self.documents(snapshot, histories),
+            lambda: current_generation() == snapshot.generation
+        )
+
+        if count is None:
+            return None
+
+        summary = {
+            "generation": snapshot.generation,
+            "documents": count,
+            "seconds": round(perf_counter() - started, 3),
+        }
+        app_logger.info(f"Report cards on <ReportServices.materialize>: {summary}")
+
+        return summary
@@ -23,6 +23,7 @@ attributes.
 
 from decorators.handlers import exception_handler
 from models.student_model import ALUMNO
+from utils.snapshot_tools import snapshots
 
 
 class StudentServices:
@@ -47,5 +48,9 @@ class StudentServices:
             @exception_handler: Ensures any errors are properly handled and logged.
             @caching: Caches the result of this method to improve performance by
             avoiding repeated database queries for the same student data.
+
+        Note:
+            The student is resolved from the in-memory snapshot (`utils.snapshot_tools`)
+            through its `MATRICULA` index instead of scanning `alumnos.dbf`.
         """
-        return ALUMNO().get(MATRICULA=enrollment)
+        return snapshots.current().get_student(enrollment)
@@ -5,59 +5,135 @@ It compares student records in both tables and deletes the histories for student
 found in the 'Alumnos.dbf' table.
 The task ensures that no outdated history records remain in the 'HISTORIALES.dbf' table.
 
+The comparison is a set-based anti-join: the `MATRICULA` set of 'Alumnos.dbf' is built once,
+every orphaned history record is marked in one vectorized pass, and the deletions are applied
+and compacted once, in a single all-or-nothing batch (`utils.writer_tools.BulkWriter`).
+
+The reconciliation is change-driven: it records the signature of both tables it last
+reconciled (`db/reconcile.json`) and returns immediately while they are unchanged. It is queued right after uploads of 'Alumnos.dbf' or 'HISTORIALES.dbf', so the
+periodic beat is only a cheap safety net. When records were deleted, the report cards of
+the new generation are materialized again (`services.report_services`).
+
 Dependencies:
 - utils.celery_config.app: Celery application instance
-- dbf.Table, READ_WRITE, READ_ONLY, delete: Functions from the `dbf` library to read and write DBF files
+- utils.dbf_tools.DBFReader: Memory-mapped reader used to scan both tables
+- utils.writer_tools.BulkWriter: Transactional writer used to delete the orphaned histories
 - utils.logging_config.app_logger: Logger for logging task progress and errors
+
+It also exposes `plan_history_shard`, which computes the history rebuild plan of one
+`MATRICULA` range when the rebuild runs on the Celery workers.
 """
 
+from os import path
+from time import perf_counter
+import numpy as np
 from utils.celery_config import app
-from dbf import Table, READ_WRITE, delete, READ_ONLY
+from utils.dbf_tools import DBFReader
+from utils.writer_tools import BulkWriter, table_signature
+from utils.dataset_tools import DB_DIR, read_json, write_json
 from utils.logging_config import app_logger
+from models.student_model import ALUMNO
+from models.history_model import HISTORIAL
+from services.rebuild_services import plan_shard
+from services.report_services import ReportServices
+
+RECONCILE_FILE = path.join(DB_DIR, "reconcile.json")
+
+
+def reconcile_signature() -> dict:
+    """
+    Returns the (inode, mtime, size) signature of 'Alumnos.dbf' and 'HISTORIALES.dbf'.
+    Uploads of the other tables also change the dataset generation, but cannot create
+    orphaned histories, so they are not part of the signature.
+    """
+    return {
+        "students": list(table_signature(ALUMNO.__ctx__)),
+        "histories": list(table_signature(HISTORIAL.__ctx__)),
+    }
 
 
 @app.task
-def check_student_status() -> None:
+def check_student_status(force: bool = False) -> dict | None:
     """
     Celery task that checks student status by comparing records in the 'HISTORIALES.dbf' and 'Alumnos.dbf' tables.
 
     This task performs the following actions:
-    - Compares student records from the 'HISTORIALES.dbf' table with those in 'Alumnos.dbf'.
-    - Deletes records from the 'HISTORIALES.dbf' table if no matching record is found in the 'Alumnos.dbf' table.
-    - Logs the number of deleted history records.
+    - Returns immediately if both tables are unchanged since the last reconciliation.
+    - Builds the set of enrollments of the 'Alumnos.dbf' table once.
+    - Marks, in one pass, every record of 'HISTORIALES.dbf' whose enrollment is not in that set.
+    - Deletes the marked records and compacts the table once, at the end.
+    - Logs and returns the counts and timings of the reconciliation.
+
+    This is a background task, queued after uploads and periodically as a safety net, to keep
+    student history data up to date.
 
-    This is a background task and should be executed periodically to keep student history data up to date.
+    Args:
+        force (bool): Reconcile even if the tables did not change.
 
     Returns:
-        None
+        dict | None: The number of histories scanned and deleted, the orphaned students and the
+        seconds spent scanning and compacting ({"skipped": True} when nothing changed), or None
+        if the task failed.
     """
-    histories = Table("db/HISTORIALES.dbf")
-    histories.open(mode=READ_WRITE)
+    try:
+        signature = reconcile_signature()
 
-    students = Table("db/alumnos.dbf")
-    students.open(mode=READ_ONLY)
+        if not force and read_json(RECONCILE_FILE, {}) == signature:
+            return {"skipped": True}
 
-    counter = 0
+        started = perf_counter()
+        expected = table_signature(HISTORIAL.__ctx__)
 
-    try:
-        for history in histories:
-            enrollment = history.MATRICULA
-            student = students.query(f"SELECT * WHERE matricula=='{enrollment}'")
+        with DBFReader(ALUMNO.__ctx__) as students:
+            enrollments = students.text("MATRICULA")
 
-            if len(student) == 0:
-                records = histories.query(f"SELECT * WHERE matricula=='{enrollment}'")
+        with DBFReader(HISTORIAL.__ctx__) as histories:
+            history_enrollments = histories.text("MATRICULA")
+            orphaned = ~np.isin(history_enrollments, enrollments)
+            records = histories.positions[orphaned].tolist()
+            orphaned_students = len(np.unique(history_enrollments[orphaned]))
+            scanned = len(histories)
 
-                for record in records:
-                    delete(record)
-                    counter += 1
+        scanned_at = perf_counter()
+        writer = BulkWriter(HISTORIAL.__ctx__, expected)
 
-                histories.pack()
+        for record in records:
+            writer.delete(record)
 
-        app_logger.info(f"Were deleted on <check_student_status>: {counter} histories")
+        writer.commit()
+        write_json(RECONCILE_FILE, reconcile_signature())
+        finished = perf_counter()
+
+        summary = {
+            "students": len(enrollments),
+            "histories": scanned,
+            "deleted": len(records),
+            "orphaned_students": orphaned_students,
+            "scan_seconds": round(scanned_at - started, 3),
+            "compact_seconds": round(finished - scanned_at, 3),
+        }
+        app_logger.info(f"Were deleted on <check_student_status>: {summary}")
+
+        if records:
+            ReportServices().materialize()
+
+        return summary
 
     except Exception as e:
         app_logger.error(f"Error on <check_student_status>: {str(e)}")
 
-    finally:
-        histories.close()
-        students.close()
+
+@app.task
+def plan_history_shard(lower: str | None, upper: str | None) -> dict:
+    """
+    Celery task that computes the history inserts and updates of the students whose
+    enrollment is in [lower, upper).
+
+    Args:
+        lower (str | None): First enrollment of the shard (inclusive).
+        upper (str | None): Last enrollment of the shard (exclusive).
+
+    Returns:
+        dict: The plan of the shard (see `RebuildServices.plan`).
+    """
+    return plan_shard(lower, upper)
@@ -1,102 +1,91 @@
 """
-This file contains the logic for managing and updating student historical records.
+This file contains the background tasks that keep the derived data of the system up to
+date after an upload of the DBF tables.
 
-The file implements the `check_student` function, which is responsible for checking
-if a student has existing historical records in the system.
-If no records are found, the function creates new records for each subject the student is enrolled in.
-If historical records already exist, the function updates the records with missing partial exam grades.
+The `refresh_snapshot` function builds the read snapshot of the new dataset generation
+(`utils.snapshot_tools`) right after an upload is promoted and at startup, so requests
+do not build it under their deadline.
+The `rebuild_histories` function runs after every upload of `cargas.dbf` and rebuilds the
+histories of the whole school with the bulk engine of `services.rebuild_services`.
+The `reconcile_histories` function queues the Celery reconciliation after uploads of
+`alumnos.dbf` or `HISTORIALES.dbf`, and `materialize_reports` precomputes the report
+cards of the new dataset generation (`services.report_services`).
 
-The workflow is as follows:
-1. The `check_student` function queries whether hidata exists for a student based on their matriculation number and grade.
-2. If no historical records are found, the function creates new records for each enrolled subject.
-3. If historical records already exist, the function updates the fields for any partial exams that are missing grades.
+Every task logs its errors instead of raising them, since it runs after the response
+of the upload was sent.
 
 Dependencies:
-- `HistoryServices`: Service handling logic related to student historical records.
-- `HISTORIAL`: Data model representing the historical records of students.
-
-This file ensures that student historical records are complete and up-to-date for further processing or academic evaluation.
+- `RebuildServices`: Bulk rebuild of the academic histories.
+- `ReportServices`: Materialization of the report cards.
+- `snapshots`: Read snapshot of the student, load and subject tables.
+- `check_student_status`: Celery task reconciling the histories with the students.
 """
 
-from dbf import Table, READ_ONLY
-from errors.errors import InvalidTimePeriod
-from models.load_model import CARGA
-from services.history_services import HistoryServices
-from models.history_model import HISTORIAL
-from services.load_services import LoadServices
+from services.rebuild_services import RebuildServices
+from services.report_services import ReportServices
+from utils.logging_config import app_logger
+from utils.metrics_tools import INGEST, timed
+from utils.snapshot_tools import snapshots
+from tasks.celery_tasks import check_student_status
 
-histories = HistoryServices()
-load_services = LoadServices()
+rebuild = RebuildServices()
+report_cards = ReportServices()
 
 
-def each_student():
-    students = Table("db/alumnos.dbf")
-    students.open(mode=READ_ONLY)
+def refresh_snapshot() -> None:
+    """
+    Builds the read snapshot of the current dataset generation ahead of the requests.
 
-    for student in students:
-        for item in [1, 2, 3]:
-            try:
-                user = load_services.get_academic_load(student.MATRICULA, item)
-                check_student_history(user.to_repr())
-            except InvalidTimePeriod:
-                ...
+    Returns:
+        None: Errors are logged; the snapshot is then built by the next request.
+    """
+    try:
+        with timed(INGEST, table="*", stage="snapshot"):
+            snapshots.current()
+    except Exception as e:
+        app_logger.error(f"Error on <refresh_snapshot>: {str(e)}")
 
 
-def check_student_history(student: dict) -> None:
+def rebuild_histories() -> None:
     """
-    Checks if the student's historical data exists and updates or creates
-    new history records accordingly.
-
-    This function verifies if the student already has a history record in the
-    system based on their matriculation number and grade.
-    If no history is found, it creates new records for
-    each subject the student is enrolled in.
-    If history already exists, it updates the records where necessary,
-    particularly for missing partial exam scores.
-
-    Args:
-        student (dict): A dictionary containing student information,
-                        including matriculation number, grade, group,
-                        and their subject load with corresponding
-                        partial exam grades.
+    Rebuilds the academic histories of the whole school after an upload of
+    `cargas.dbf`, using the single-pass bulk engine (`RebuildServices`).
 
     Returns:
-        None: This function does not return any value. It modifies the history
-        records in the database directly.
+        None: The summary of the rebuild is logged by the engine.
     """
-    data = HISTORIAL().get_all(MATRICULA=student["MATRICULA"], GRADO=student["GRADO"])
-    loads = student["CARGA"]
-
-    if len(data) == 0:
-        for load in loads:
-            new_history = HISTORIAL()
-            new_history.MATRICULA = student["MATRICULA"]
-            new_history.GRUPO = student["GRUPO"]
-            new_history.GRADO = student["GRADO"]
-            new_history.CLAVEMAT = load["CLAVEMAT"]
-            new_history.ASIGNATURA = load["DATOS_MATERIA"]["ASIGNATURA"]
-            new_history.PARCIAL_1 = load["PARCIAL_1"]
-            new_history.PARCIAL_2 = load["PARCIAL_2"]
-            new_history.PARCIAL_3 = load["PARCIAL_3"]
-            new_history.save()
-
-    else:
-        for index, history in enumerate(data):
-            student_partial_1 = loads[index]["PARCIAL_1"]
-            student_partial_2 = loads[index]["PARCIAL_2"]
-            student_partial_3 = loads[index]["PARCIAL_3"]
-
-            history_partial_1 = history.PARCIAL_1
-            history_partial_2 = history.PARCIAL_2
-            history_partial_3 = history.PARCIAL_3
-
-            if student_partial_1 != "None" and history_partial_1 == "None":
-                history.PARTIAL_1 = student_partial_1
-
-            if student_partial_2 != "None" and history_partial_2 == "None":
-                history.PARTIAL_2 = student_partial_2
-
-            if student_partial_3 != "None" and history_partial_3 == "None":
-                history.PARTIAL_3 = student_partial_3
-
-            history.save()
+    try:
+        with timed(INGEST, table="cargas.dbf", stage="rebuild"):
+            rebuild.rebuild()
+    except Exception as e:
+        app_logger.error(f"Error on <rebuild_histories>: {str(e)}")
+
+
+def reconcile_histories() -> None:
+    """
+    Queues the reconciliation of 'HISTORIALES.dbf' against 'Alumnos.dbf' on the Celery
+    workers, after an upload changed one of them.
+
+    Returns:
+        None: Errors reaching the broker are logged; the periodic beat will catch up.
+    """
+    try:
+        check_student_status.delay()
+    except Exception as e:
+        app_logger.error(f"Error on <reconcile_histories>: {str(e)}")
+
+
+def materialize_reports() -> None:
+    """
+    Precomputes the report cards of the current dataset generation after an upload
+    (and after the history rebuild it may trigger).
+
+    Returns:
+        None: The summary is logged by `ReportServices.materialize`.
+    """
+    try:
+        with timed(INGEST, table="*", stage="materialize"):
+            report_cards.materialize()
+    except Exception as e:
+        app_logger.error(f"Error on <materialize_reports>: {str(e)}")
+
@@ -0,0 +1,94 @@
+import pytest
+import dbf
+import tasks.celery_tasks as celery_tasks
+from benchmarks.dataset import generate
+from benchmarks.run import BENCHMARKS, Context, measure, workspace
+from models.history_model import HISTORIAL
+from utils.dbf_tools import DBFReader
+
+
+@pytest.fixture(scope="module")
+def dataset(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("school")
+    summary = generate(str(directory), 120, subjects=4, seed=7)
+
+    return directory, summary
+
+
+def test_generated_tables_match_dbf_library(dataset):
+    directory, summary = dataset
+    table = dbf.Table(str(directory / "cargas.dbf"))
+    table.open(dbf.READ_ONLY)
+    expected = [
+        (record.MATRICULA.strip(), record.CLAVEMAT.strip(), record.PARCIAL_1, record.PARCIAL_3)
+        for record in table
+    ]
+    table.close()
+
+    with DBFReader(str(directory / "cargas.dbf")) as loads:
+        rows = [
+            (row["MATRICULA"], row["CLAVEMAT"], row["PARCIAL_1"], row["PARCIAL_3"])
+            for row in loads.rows()
+        ]
+
+    assert rows == expected
+    assert len(rows) == summary["records"]["cargas.dbf"] == 120 * 4
+
+
+def test_generated_students_are_unique_and_orphans_have_histories(dataset):
+    directory, summary = dataset
+
+    with DBFReader(str(directory / "alumnos.dbf")) as students:
+        enrollments = set(students.text("MATRICULA").tolist())
+        assert len(enrollments) == len(set(students.text("CURP").tolist())) == 120
+        assert students.column("NOMBRES")[0] != ""
+
+    with DBFReader(str(directory / "HISTORIALES.dbf")) as histories:
+        orphans = set(histories.text("MATRICULA").tolist()) - enrollments
+
+    assert len(orphans) == summary["orphans"] == 1
+
+
+def test_generation_is_repeatable(dataset, tmp_path):
+    directory, _ = dataset
+    generate(str(tmp_path), 120, subjects=4, seed=7)
+
+    for name in ("alumnos.dbf", "cargas.dbf", "HISTORIALES.dbf"):
+        assert (tmp_path / name).read_bytes()[32:] == (directory / name).read_bytes()[32:]
+
+
+def test_writing_benchmarks_run_on_a_copy_of_the_dataset(dataset, tmp_path):
+    directory, summary = dataset
+    original = (directory / "HISTORIALES.dbf").read_bytes()
+
+    with workspace(str(tmp_path / "scratch")):
+        assert HISTORIAL.__ctx__ == str(tmp_path / "scratch" / "HISTORIALES.dbf")
+
+        context = Context(str(directory), str(tmp_path / "scratch"), 5, 0)
+        result = measure(BENCHMARKS["rebuild"], context, repeat=2, warmup=0)
+
+    assert len(result["runs"]) == 2
+    assert result["result"]["inserts"] + result["result"]["updates"] > 0
+    assert (directory / "HISTORIALES.dbf").read_bytes() == original
+    assert HISTORIAL.__ctx__ != str(tmp_path / "scratch" / "HISTORIALES.dbf")
+
+
+def test_reconciliation_benchmark_fails_when_the_task_fails(dataset, tmp_path, monkeypatch):
+    directory, summary = dataset
+
+    class Reports:
+        def materialize(self):
+            pass
+
+    monkeypatch.setattr(celery_tasks, "ReportServices", Reports)
+
+    with workspace(str(tmp_path / "scratch")):
+        context = Context(str(directory), str(tmp_path / "scratch"), 5, 0)
+        result = measure(BENCHMARKS["check_student_status"], context, repeat=1, warmup=0)
+
+        monkeypatch.setattr(celery_tasks, "check_student_status", lambda force: None)
+
+        with pytest.raises(RuntimeError):
+            measure(BENCHMARKS["check_student_status"], context, repeat=1, warmup=0)
+
+    assert result["result"]["orphaned_students"] == summary["orphans"]
@@ -0,0 +1,90 @@
+import pytest
+import json
+import zlib
+from io import BytesIO
+from zipfile import ZipFile
+import services.boleta_services as boleta_services
+from services.boleta_services import BoletaServices
+from utils.pdf_tools import build_pdf, render
+from utils.snapshot_tools import Snapshot
+
+students = [
+    {"MATRICULA": "22A0710217M0001", "NOMBRES": "ANA", "APELLIDOS": "PÉREZ (LÓPEZ)",
+     "CURP": "CURPA", "GRADO": "1", "GRUPO": "A"},
+    {"MATRICULA": "22A0710217M0002", "NOMBRES": "LUIS", "APELLIDOS": "RUIZ",
+     "CURP": "CURPB", "GRADO": "1", "GRUPO": "A"},
+    {"MATRICULA": "22A0710217M0003", "NOMBRES": "EVA", "APELLIDOS": "SOTO",
+     "CURP": "CURPC", "GRADO": "1", "GRUPO": "B"},
+]
+loads = [
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "101", "CLAVEMAT": "M1", "PARCIAL_1": "8.0",
+     "FALTAS_1": "2", "PALABRA": "", "OBSERVA": ""},
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "102", "CLAVEMAT": "Q1", "PARCIAL_1": "5.0",
+     "FALTAS_1": "0", "PALABRA": "", "OBSERVA": ""},
+    {"MATRICULA": "22A0710217M0002", "CLAVE_IN": "101", "CLAVEMAT": "M1", "PARCIAL_1": "None",
+     "FALTAS_1": "None", "PALABRA": "", "OBSERVA": ""},
+    {"MATRICULA": "22A0710217M0003", "CLAVE_IN": "101", "CLAVEMAT": "M1", "PARCIAL_1": "9.0",
+     "FALTAS_1": "1", "PALABRA": "", "OBSERVA": ""},
+]
+subjects = [{"ASIGNATURA": "MATEMATICAS I", "CLAVE_IN": "101"}, {"ASIGNATURA": "QUIMICA I", "CLAVE_IN": "102"}]
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    snapshot = Snapshot(1, students, loads, subjects)
+    monkeypatch.setattr(boleta_services.snapshots, "current", lambda: snapshot)
+    monkeypatch.setattr(boleta_services.Config, "RENDER_WORKERS", 0)
+
+    return snapshot
+
+
+def text_of(pdf: bytes) -> str:
+    start = pdf.index(b"stream\n") + len(b"stream\n")
+    return zlib.decompress(pdf[start:pdf.index(b"\nendstream", start)]).decode("cp1252")
+
+
+def test_pdf_has_a_valid_cross_reference_table():
+    pdf = build_pdf([b"BT /F1 10 Tf 50 700 Td (Hola) Tj ET", b""])
+    xref = int(pdf.rsplit(b"startxref\n", 1)[1].split(b"\n")[0])
+    entries = pdf[xref:].split(b"\n")[3:3 + 6]
+
+    assert pdf.startswith(b"%PDF-1.4") and pdf.endswith(b"%%EOF\n")
+    assert b"/Count 2" in pdf
+    for number, entry in enumerate(entries, 1):
+        assert pdf[int(entry[:10]):].startswith(f"{number} 0 obj".encode())
+
+
+def test_boleta_is_split_in_pages():
+    context = BoletaServices.context(
+        {"MATRICULA": "1", "CARGA": [{"CLAVEMAT": "M1", "PARCIAL_1": "8.0"}] * 30,
+         "DETALLES": {"TOTAL_FALTAS": 0, "PROMEDIO_FINAL": 8.0}}, 1
+    )
+
+    assert b"/Count 2" in render("boleta.j2", context)
+
+
+def test_group_archive_has_a_boleta_per_graded_student(snapshot):
+    archive = ZipFile(BytesIO(b"".join(BoletaServices().group_archive(1, "A", 1))))
+
+    assert archive.namelist() == ["1A/22A0710217M0001.pdf", "errores.json"]
+    content = text_of(archive.read("1A/22A0710217M0001.pdf"))
+    assert "(PÉREZ \\(LÓPEZ\\) ANA)" in content.replace("Alumno: ", "")
+    assert "(QUIMICA I)" in content and "(REPROBADO)" in content
+    assert "(Promedio final: 6.5)" in content and "(Total de faltas: 2)" in content
+    errors = json.loads(archive.read("errores.json"))
+    assert errors[0]["MATRICULA"] == "22A0710217M0002"
+    assert errors[0]["ERROR"]["codes"]["error_code"] == 1202
+
+
+def test_grade_archive_renders_in_the_process_pool(snapshot, monkeypatch):
+    monkeypatch.setattr(boleta_services.Config, "RENDER_WORKERS", 2)
+    monkeypatch.setattr(boleta_services, "BATCH_SIZE", 1)
+
+    archive = ZipFile(BytesIO(b"".join(BoletaServices().grade_archive(1, 1))))
+
+    assert archive.namelist() == [
+        "1A/22A0710217M0001.pdf", "1B/22A0710217M0003.pdf", "errores.json"
+    ]
+    assert "(Promedio final: 9)" in text_of(archive.read("1B/22A0710217M0003.pdf"))
+    boleta_services.pool().shutdown()
+    boleta_services._pool = None
@@ -0,0 +1,88 @@
+import pytest
+import asyncio
+from utils.cache_tools import ResponseCache
+import decorators.caching as caching_module
+from fastapi.responses import ORJSONResponse
+from decorators.caching import caching, entity_tag, matches, wildcard
+
+
+def test_new_generation_drops_every_entry():
+    cache = ResponseCache(1024)
+    cache.get(("get_student", "A"), 1)
+    cache.put(("get_student", "A"), 1, b"{}", 2)
+
+    assert cache.get(("get_student", "A"), 1) == b"{}"
+    assert cache.get(("get_student", "A"), 2) is None
+    assert len(cache) == 0
+
+
+def test_frequent_entries_are_not_evicted_by_one_off_requests():
+    cache = ResponseCache(10)
+
+    for _ in range(5):
+        cache.get(("popular",), 1)
+    cache.put(("popular",), 1, b"x" * 6, 6)
+
+    cache.get(("rare",), 1)
+    assert not cache.put(("rare",), 1, b"y" * 6, 6)
+
+    for _ in range(10):
+        cache.get(("trending",), 1)
+    assert cache.put(("trending",), 1, b"z" * 6, 6)
+
+    assert cache.get(("popular",), 1) is None
+    assert cache.size == 6
+
+
+def test_rejected_re_put_keeps_the_previous_value():
+    cache = ResponseCache(10)
+
+    for _ in range(3):
+        cache.get(("hot",), 1)
+    cache.put(("hot",), 1, b"x" * 4, 4)
+
+    for _ in range(10):
+        cache.get(("hotter",), 1)
+    cache.put(("hotter",), 1, b"y" * 6, 6)
+
+    assert not cache.put(("hot",), 1, b"z" * 8, 8)
+    assert cache.get(("hot",), 1) == b"x" * 4
+    assert cache.size == 10 and len(cache) == 2
+
+    assert cache.put(("hot",), 1, b"w" * 3, 3)
+    assert cache.get(("hot",), 1) == b"w" * 3
+    assert cache.size == 9
+
+
+def test_etag_changes_with_generation_and_matches_if_none_match():
+    key = ("get_academic_load", "22A0710217M0001", 2, None)
+    tag = entity_tag(key, 7)
+
+    assert tag == entity_tag(key, 7)
+    assert tag != entity_tag(key, 8)
+    assert matches(f'"other", W/{tag}', tag)
+    assert not matches("*", tag)
+    assert not matches(None, tag)
+    assert wildcard('"other", *') and not wildcard(None)
+
+
+def test_wildcard_only_matches_an_existing_body(monkeypatch):
+    class Request:
+        headers = {"if-none-match": "*"}
+
+    calls = []
+
+    @caching
+    async def get_student(request, enrollment):
+        calls.append(enrollment)
+        return ORJSONResponse(status_code=200, content={"MATRICULA": enrollment})
+
+    monkeypatch.setattr(caching_module, "responses", ResponseCache(1 << 20))
+    monkeypatch.setattr(caching_module, "current_generation", lambda: 3)
+    monkeypatch.setattr(caching_module.reports, "get", lambda *key, generation: None)
+
+    first = asyncio.run(get_student(request=Request(), enrollment="22A0710217M0001"))
+    second = asyncio.run(get_student(request=Request(), enrollment="22A0710217M0001"))
+
+    assert first.status_code == 200 and calls == ["22A0710217M0001"]
+    assert second.status_code == 304 and second.headers["ETag"] == first.headers["ETag"]
@@ -0,0 +1,19 @@
+import pytest
+from utils.catalog_tools import SubjectCatalog
+
+
+def test_merge_keeps_last_subject_per_clave_in():
+    catalog = SubjectCatalog([
+        {"ASIGNATURA": "MATEMATICAS I", "CLAVE": "M1", "CLAVE_IN": "101", "PERIODO": "1"},
+        {"ASIGNATURA": "QUIMICA I", "CLAVE": "Q1", "CLAVE_IN": "102", "PERIODO": "1"},
+        {"ASIGNATURA": "MATEMATICAS 1", "CLAVE": "M1", "CLAVE_IN": "101", "PERIODO": "2"},
+    ])
+    first = [{"CLAVE_IN": "101"}, {"CLAVE_IN": "102"}]
+    second = [{"CLAVE_IN": "101"}, {"CLAVE_IN": "999"}]
+
+    catalog.merge(first, second)
+
+    assert first[0]["DATOS_MATERIA"]["ASIGNATURA"] == "MATEMATICAS 1"
+    assert first[1]["DATOS_MATERIA"]["CLAVE"] == "Q1"
+    assert second[0]["DATOS_MATERIA"] == first[0]["DATOS_MATERIA"]
+    assert second[1]["DATOS_MATERIA"] is None
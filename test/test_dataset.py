@@ -0,0 +1,112 @@
+import pytest
+import asyncio
+import io
+from hashlib import sha256
+import dbf
+from fastapi import UploadFile
+import utils.dataset_tools as dataset_tools
+from errors.errors import InvalidDatabaseFile, UploadTooLarge
+from utils.config_secrets import Config
+from utils.dataset_tools import (
+    current_generation, current_state, promote, stage_upload, staging_file, table_path
+)
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    directory = tmp_path / "db"
+    directory.mkdir()
+
+    for attribute, target in (
+            ("DB_DIR", directory),
+            ("STAGING_DIR", directory / ".staging"),
+            ("GENERATION_FILE", directory / "generation.json"),
+            ("LOCK_FILE", directory / ".generation.lock"),
+    ):
+        monkeypatch.setattr(dataset_tools, attribute, str(target))
+
+    monkeypatch.setattr(
+        dataset_tools, "_cache", {"key": None, "state": {"generation": 0, "tables": {}}}
+    )
+
+    return directory
+
+
+def stage(name, grades):
+    staged = staging_file(name)
+    table = dbf.Table(staged, "MATRICULA C(15); GRADO N(1,0)", codepage="cp1252")
+    table.open(mode=dbf.READ_WRITE)
+
+    for number, grade in enumerate(grades):
+        table.append((f"22A0710217M{number:04d}", grade))
+
+    table.close()
+    return staged
+
+
+def test_promote_replaces_the_live_table_and_bumps_the_generation(database):
+    assert current_generation() == 0
+
+    first = promote(stage("alumnos.dbf", [1]), "alumnos.dbf", sha256="a")
+    staged = stage("alumnos.dbf", [1, 2, 3])
+    content = open(staged, "rb").read()
+    second = promote(staged, "alumnos.dbf", sha256="b")
+
+    assert (first, second) == (1, 2)
+    assert open(table_path("alumnos.dbf"), "rb").read() == content
+    assert list((database / ".staging").iterdir()) == []
+    assert current_generation() == 2
+    assert current_state()["tables"]["alumnos.dbf"] == {"generation": 2, "records": 3, "sha256": "b"}
+
+
+def test_invalid_table_keeps_the_live_table_and_generation(database):
+    promote(stage("cargas.dbf", [1, 2]), "cargas.dbf")
+    live = open(table_path("cargas.dbf"), "rb").read()
+    staged = stage("cargas.dbf", [1, 2, 3])
+
+    with open(staged, "r+b") as file:
+        file.truncate(len(live) - 5)
+
+    with pytest.raises(InvalidDatabaseFile):
+        promote(staged, "cargas.dbf")
+
+    assert open(table_path("cargas.dbf"), "rb").read() == live
+    assert current_generation() == 1
+    assert list((database / ".staging").iterdir()) == []
+
+
+def upload(content, size=None):
+    return UploadFile(io.BytesIO(content), size=size, filename="alumnos.dbf")
+
+
+def test_staged_upload_matches_its_hash(database, monkeypatch):
+    monkeypatch.setattr(dataset_tools, "CHUNK_SIZE", 64)
+    source = stage("alumnos.dbf", [1, 2, 3] * 20)
+    content = open(source, "rb").read()
+
+    staged, digest = asyncio.run(stage_upload(upload(content), "alumnos.dbf"))
+
+    assert open(staged, "rb").read() == content
+    assert digest == sha256(content).hexdigest()
+
+
+def test_oversized_upload_is_rejected_and_discarded(database, monkeypatch):
+    monkeypatch.setattr(dataset_tools, "CHUNK_SIZE", 64)
+    monkeypatch.setattr(Config, "MAX_UPLOAD_BYTES", 256)
+    content = open(stage("alumnos.dbf", [1] * 50), "rb").read()
+    staged = list((database / ".staging").iterdir())
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(stage_upload(upload(content), "alumnos.dbf"))
+
+    with pytest.raises(UploadTooLarge):
+        asyncio.run(stage_upload(upload(content, size=len(content)), "alumnos.dbf"))
+
+    assert sorted((database / ".staging").iterdir()) == sorted(staged)
+
+
+def test_non_dbf_upload_is_rejected_and_discarded(database):
+    with pytest.raises(InvalidDatabaseFile):
+        asyncio.run(stage_upload(upload(b"MATRICULA,GRADO\n" * 10), "alumnos.dbf"))
+
+    assert list((database / ".staging").iterdir()) == []
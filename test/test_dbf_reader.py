@@ -0,0 +1,56 @@
+import pytest
+import dbf
+from utils.dbf_tools import DBFReader
+
+
+@pytest.fixture
+def loads_table(tmp_path):
+    path = str(tmp_path / "cargas.dbf")
+    table = dbf.Table(
+        path,
+        "MATRICULA C(15); CLAVE_IN C(10); PARCIAL_1 N(4,1); FALTAS_1 N(2,0)",
+        codepage="cp1252"
+    )
+    table.open(mode=dbf.READ_WRITE)
+    table.append(("22A0710217M0001", "MAT1", 8.0, 2))
+    table.append(("22A0710217M0002", "MAT2", None, None))
+    table.append(("22A0710217M0003", "MAT3", 10.0, 0))
+    dbf.delete(table[2])
+    table.close()
+
+    return path
+
+
+def test_rows_match_dbf_library(loads_table):
+    with DBFReader(loads_table) as reader:
+        rows = list(reader.rows())
+
+    assert rows == [
+        {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "MAT1", "PARCIAL_1": 8.0, "FALTAS_1": 2},
+        {"MATRICULA": "22A0710217M0002", "CLAVE_IN": "MAT2", "PARCIAL_1": None, "FALTAS_1": None},
+    ]
+
+
+def test_deleted_records_can_be_included(loads_table):
+    with DBFReader(loads_table, include_deleted=True) as reader:
+        assert len(reader) == 3
+        assert reader.text("MATRICULA")[-1] == "22A0710217M0003"
+
+
+def test_between_selects_a_range_before_decoding(loads_table):
+    with DBFReader(loads_table, include_deleted=True) as reader:
+        reader.between("MATRICULA", "22A0710217M0002", None)
+
+        assert reader.text("MATRICULA").tolist() == ["22A0710217M0002", "22A0710217M0003"]
+        assert reader.positions.tolist() == [1, 2]
+
+    with DBFReader(loads_table) as reader:
+        assert reader.between("MATRICULA", None, "22A0710217M0002").column("CLAVE_IN") == ["MAT1"]
+
+
+def test_rows_decode_only_the_given_records(loads_table):
+    with DBFReader(loads_table, include_deleted=True) as reader:
+        assert reader.text("CLAVE_IN", [2, 0]).tolist() == ["MAT3", "MAT1"]
+        assert reader.column("FALTAS_1", slice(0, 2)) == [2, None]
+        assert reader.numbers("PARCIAL_1", slice(2, 3)).tolist() == [10.0]
+        assert ("text", "CLAVE_IN") not in reader._decoded
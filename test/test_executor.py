@@ -0,0 +1,71 @@
+import pytest
+import asyncio
+import threading
+import time
+from errors.errors import ServiceTimeout
+from utils.config_secrets import Config
+from utils.executor_tools import run_blocking
+
+
+def test_blocking_work_runs_off_the_event_loop():
+    async def main():
+        ticks = []
+
+        async def ticker():
+            for _ in range(3):
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        result, _ = await asyncio.gather(run_blocking("test", time.sleep, 0.1), ticker())
+        return result, ticks
+
+    result, ticks = asyncio.run(main())
+
+    assert result is None
+    assert ticks[-1] - ticks[0] < 0.1
+
+
+def test_routes_are_bounded_and_time_out(monkeypatch):
+    monkeypatch.setattr(Config, "ROUTE_CONCURRENCY", 1)
+
+    async def main():
+        return await asyncio.gather(
+            run_blocking("bounded", time.sleep, 0.2, timeout=0.3),
+            run_blocking("bounded", time.sleep, 0.2, timeout=0.3),
+            return_exceptions=True
+        )
+
+    first, second = asyncio.run(main())
+
+    assert first is None
+    assert isinstance(second, ServiceTimeout)
+
+
+def test_timed_out_work_keeps_the_slot_of_the_route(monkeypatch):
+    monkeypatch.setattr(Config, "ROUTE_CONCURRENCY", 2)
+    running, peak, lock = [0], [0], threading.Lock()
+
+    def work():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.15)
+        with lock:
+            running[0] -= 1
+
+    async def main():
+        first = await asyncio.gather(
+            *(run_blocking("slow", work, timeout=0.05) for _ in range(5)),
+            return_exceptions=True
+        )
+        second = await asyncio.gather(
+            *(run_blocking("slow", work, timeout=2) for _ in range(5)),
+            return_exceptions=True
+        )
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    assert all(isinstance(result, ServiceTimeout) for result in first)
+    assert second == [None] * 5
+    assert peak[0] <= 2
@@ -0,0 +1,77 @@
+import pytest
+import io
+import json
+import dbf
+import services.export_services as export_services
+from services.export_services import ExportServices
+from models.student_model import ALUMNO
+from models.load_model import CARGA
+from models.topic_model import ASIGNATURA
+
+
+@pytest.fixture
+def school(tmp_path, monkeypatch):
+    def table(name, spec, rows):
+        path = str(tmp_path / name)
+        created = dbf.Table(path, spec, codepage="cp1252")
+        created.open(mode=dbf.READ_WRITE)
+
+        for row in rows:
+            created.append(row)
+
+        created.close()
+        return path
+
+    monkeypatch.setattr(ALUMNO, "__ctx__", table(
+        "alumnos.dbf", "MATRICULA C(15); NOMBRES C(30); APELLIDOS C(30); GRADO N(1,0); GRUPO C(2)",
+        [("22A0710217M0001", "ANA", "LOPEZ", 1, "A"), ("22A0710217M0002", "BRUNO", "DIAZ", 1, "A")]
+    ))
+    monkeypatch.setattr(CARGA, "__ctx__", table(
+        "cargas.dbf", "MATRICULA C(15); CLAVE_IN C(10); CLAVEMAT C(10); PARCIAL_1 N(4,1); FALTAS_1 N(2,0)",
+        [("22A0710217M0001", "101", "M1", 8.0, 2), ("22A0710217M0001", "102", "Q1", 5.0, 1)]
+    ))
+    monkeypatch.setattr(ASIGNATURA, "__ctx__", table(
+        "asignaturas.dbf", "ASIGNATURA C(30); CLAVE_IN C(10)",
+        [("MATEMATICAS I", "101"), ("QUIMICA I", "102")]
+    ))
+
+
+def test_ndjson_export_grades_every_student(school):
+    chunks, media_type, _ = ExportServices().export("ndjson", 1)
+    rows = [json.loads(line) for line in b"".join(chunks).splitlines()]
+
+    assert media_type == "application/x-ndjson"
+    assert [(row["ASIGNATURA"], row["PALABRA"], row["OBSERVA"]) for row in rows[:2]] == [
+        ("MATEMATICAS I", "OCHO", "APROBADO"), ("QUIMICA I", "CINCO", "REPROBADO")
+    ]
+    assert rows[0]["TOTAL_FALTAS"] == 3 and rows[0]["PROMEDIO_FINAL"] == 6.5
+    assert rows[2]["MATRICULA"] == "22A0710217M0002" and rows[2]["ESTADO"] == "SIN_DATOS"
+
+
+def test_parquet_export_writes_a_row_group_per_chunk(school, monkeypatch):
+    parquet = pytest.importorskip("pyarrow.parquet")
+    monkeypatch.setattr(export_services, "CHUNK_SIZE", 1)
+
+    chunks, _, file_name = ExportServices().export("parquet", 1)
+    file = parquet.ParquetFile(io.BytesIO(b"".join(chunks)))
+
+    assert file_name == "calificaciones_cargas_parcial_1.parquet"
+    assert file.num_row_groups == 2
+    assert file.read().column("CALIFICACION").to_pylist() == [8.0, 5.0, None]
+
+
+def test_export_finds_the_records_of_every_chunk(school, monkeypatch):
+    monkeypatch.setattr(export_services, "CHUNK_SIZE", 1)
+    path = CARGA.__ctx__
+    table = dbf.Table(path)
+    table.open(mode=dbf.READ_WRITE)
+    table.append(("22A0710217M0002", "102", "Q1", 9.0, 0))
+    table.append(("22A0710217M0001", "101", "M2", 7.0, 0))
+    table.close()
+
+    chunks = list(ExportServices().chunks(1))
+
+    assert [[(row["MATRICULA"][-1], row["CLAVEMAT"]) for row in chunk] for chunk in chunks] == [
+        [("1", "M1"), ("1", "Q1"), ("1", "M2")], [("2", "Q1")]
+    ]
+    assert chunks[1][0]["NOMBRES"] == "BRUNO" and chunks[1][0]["CALIFICACION"] == 9.0
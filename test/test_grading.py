@@ -0,0 +1,76 @@
+import pytest
+import copy
+import random
+import numpy as np
+from errors.errors import InvalidTimePeriod, ServerError
+from utils.rating_tools import Ratings
+from utils.grading_tools import grade_partials, grade_semiannual, to_numbers
+
+
+class Student:
+    pass
+
+
+def grade():
+    value = random.random()
+    return "None" if value < 0.05 else f"{random.randint(0, 10)}.0"
+
+
+@pytest.fixture
+def school():
+    random.seed(217)
+    return [
+        [
+            {"PARCIAL_1": grade(), "PARCIAL_2": grade(), "PARCIAL_3": grade(),
+             "FALTAS_1": str(random.randint(0, 5))}
+            for _ in range(random.choice([0, 1, 4, 8]))
+        ]
+        for _ in range(500)
+    ]
+
+
+def expected(reports, partial):
+    reports = copy.deepcopy(reports)
+
+    try:
+        details = (Ratings(reports, partial) + Student()).DETALLES
+    except InvalidTimePeriod as e:
+        return str(e), None
+    except (KeyError, ValueError):
+        return "failed", None
+
+    return details, [(report["PALABRA"], report["OBSERVA"]) for report in reports]
+
+
+@pytest.mark.parametrize("partial", [1, 2, 6])
+def test_batch_grades_match_ratings(school, partial):
+    codes = np.array([code for code, reports in enumerate(school) for _ in reports])
+    records = [report for reports in school for report in reports]
+
+    def column(name):
+        return to_numbers([report[name] for report in records])
+
+    if partial == 6:
+        grades = grade_semiannual(
+            codes, len(school), column("PARCIAL_1"), column("PARCIAL_2"), column("PARCIAL_3")
+        )
+    else:
+        grades = grade_partials(
+            codes, len(school), column(f"PARCIAL_{partial}"),
+            column("FALTAS_1") if partial == 1 else None, partial
+        )
+
+    offset = 0
+
+    for code, reports in enumerate(school):
+        rows = range(offset, offset + len(reports))
+        offset += len(reports)
+
+        try:
+            got = grades.details(code), [(grades.words[row], grades.observations[row]) for row in rows]
+        except InvalidTimePeriod as e:
+            got = str(e), None
+        except ServerError:
+            got = "failed", None
+
+        assert got == expected(reports, partial)
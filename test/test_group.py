@@ -0,0 +1,53 @@
+import pytest
+import json
+import services.group_services as group_services
+from services.group_services import GroupServices
+from utils.rating_tools import Ratings
+from utils.snapshot_tools import Snapshot
+
+students = [
+    {"MATRICULA": "22A0710217M0001", "CURP": "CURPA", "GRADO": "1", "GRUPO": "A"},
+    {"MATRICULA": "22A0710217M0002", "CURP": "CURPA", "GRADO": "1", "GRUPO": "A"},
+    {"MATRICULA": "22A0710217M0003", "CURP": "CURPB", "GRADO": "1", "GRUPO": "B"},
+]
+loads = [
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "101", "PARCIAL_1": "8.0", "FALTAS_1": "2",
+     "PALABRA": "", "OBSERVA": ""},
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "102", "PARCIAL_1": "5.0", "FALTAS_1": "0",
+     "PALABRA": "", "OBSERVA": ""},
+    {"MATRICULA": "22A0710217M0002", "CLAVE_IN": "101", "PARCIAL_1": "None", "FALTAS_1": "None",
+     "PALABRA": "", "OBSERVA": ""},
+]
+subjects = [{"ASIGNATURA": "MATEMATICAS I", "CLAVE_IN": "101"}, {"ASIGNATURA": "QUIMICA I", "CLAVE_IN": "102"}]
+
+
+@pytest.fixture
+def snapshot(monkeypatch):
+    snapshot = Snapshot(1, students, loads, subjects)
+    monkeypatch.setattr(group_services.snapshots, "current", lambda: snapshot)
+
+    return snapshot
+
+
+def test_group_stream_matches_the_per_student_report(snapshot):
+    lines = [json.loads(line) for line in GroupServices().stream_loads(1, "A", 1)]
+
+    student = snapshot.get_student("22A0710217M0001")
+    setattr(student, "CARGA", snapshot.get_academic_load("22A0710217M0001"))
+    snapshot.catalog.merge(student.CARGA)
+    expected = (Ratings(student.CARGA, 1) + student).to_repr()
+
+    assert [line["MATRICULA"] for line in lines] == ["22A0710217M0001", "22A0710217M0002"]
+    assert lines[0] == json.loads(json.dumps(expected))
+    assert lines[1]["ERROR"]["codes"]["error_code"] == 1202
+
+
+def test_groups_match_numeric_grades():
+    numeric = [dict(student, GRADO=3.0) for student in students]
+    snapshot = Snapshot(1, numeric, loads, subjects)
+
+    assert snapshot.get_group(3, "A") == ("22A0710217M0001", "22A0710217M0002")
+    assert snapshot.get_group("3", "A") == snapshot.get_group(3.0, "A")
+    assert snapshot.get_grade(3) == (
+        "22A0710217M0001", "22A0710217M0002", "22A0710217M0003"
+    )
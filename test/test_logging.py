@@ -0,0 +1,59 @@
+import pytest
+import json
+import logging
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from middlewares.logging_middleware import LoggingMiddleware
+from utils.logging_config import AccessFormatter, access_logger
+
+
+class Collector(logging.Handler):
+    def __init__(self) -> None:
+        super().__init__()
+        self.lines = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.lines.append(json.loads(AccessFormatter().format(record)))
+
+
+@pytest.fixture
+def collector():
+    collector = Collector()
+    access_logger.addHandler(collector)
+    yield collector
+    access_logger.removeHandler(collector)
+
+
+def application(sample_rate: float) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(LoggingMiddleware, sample_rate=sample_rate)
+
+    @app.get("/students/{enrollment}")
+    async def student(enrollment: str):
+        return {"MATRICULA": enrollment}
+
+    return TestClient(app)
+
+
+def test_requests_are_logged_as_redacted_json(collector):
+    application(1).get(
+        "/students/A?access=admin-token&partial=1",
+        headers={"Authorization": "Bearer secret", "X-Request": "1"}
+    )
+    line = collector.lines[0]
+
+    assert line["method"] == "GET" and line["path"] == "/students/A"
+    assert line["status"] == 200 and line["bytes"] == len(b'{"MATRICULA":"A"}')
+    assert line["latency_ms"] >= 0
+    assert line["query"] == "access=[REDACTED]&partial=1"
+    assert line["headers"]["authorization"] == "[REDACTED]"
+    assert line["headers"]["x-request"] == "1"
+    assert "secret" not in json.dumps(line) and "admin-token" not in json.dumps(line)
+
+
+def test_successful_requests_are_sampled_but_errors_always_logged(collector):
+    client = application(0)
+    client.get("/students/A")
+    client.get("/missing")
+
+    assert [line["status"] for line in collector.lines] == [404]
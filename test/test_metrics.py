@@ -0,0 +1,64 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from decorators.metrics import instrumented
+from errors.errors import NotFoundStudent
+from middlewares.metrics_middleware import MetricsMiddleware
+from utils.metrics_tools import count_error
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_requests_are_measured_by_route_template():
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get("/students/{enrollment}/loads")
+    async def loads(enrollment: str):
+        return {"MATRICULA": enrollment}
+
+    labels = {"method": "GET", "route": "/students/{enrollment}/loads"}
+    before = sample("http_request_duration_seconds_count", **labels)
+    client = TestClient(app)
+
+    for enrollment in ("A", "B", "C"):
+        client.get(f"/students/{enrollment}/loads")
+    client.get("/missing")
+
+    assert sample("http_request_duration_seconds_count", **labels) == before + 3
+    assert sample("http_requests_total", **labels, status="200") >= 3
+    assert sample("http_requests_total", method="GET", route="unmatched", status="404") >= 1
+    assert sample("http_requests_in_flight") == 0
+
+
+def test_model_queries_count_one_open_each():
+    class Model:
+        def get_all(self, **filters):
+            return [filters]
+
+        def get(self, **filters):
+            return self.get_all(**filters)[0]
+
+    @instrumented
+    class TABLA(Model):
+        __ctx__ = "/db/tabla.dbf"
+
+    labels = {"table": "tabla.dbf", "source": "model"}
+    before = sample("dbf_opens_total", **labels)
+    TABLA().get(MATRICULA="A")
+    TABLA().get_all()
+
+    assert sample("dbf_opens_total", **labels) == before + 2
+    assert sample("dbf_read_duration_seconds_count", table="tabla.dbf", operation="get") == 1
+
+
+def test_errors_are_counted_by_error_code():
+    labels = {"error_code": str(NotFoundStudent().error_code),
+              "exception": "NotFoundStudent"}
+    before = sample("api_errors_total", **labels)
+    count_error(NotFoundStudent())
+
+    assert sample("api_errors_total", **labels) == before + 1
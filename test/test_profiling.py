@@ -0,0 +1,54 @@
+import pytest
+import pstats
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+import utils.profile_tools as profile_tools
+from middlewares.profiling_middleware import ProfilingMiddleware
+from utils.executor_tools import run_blocking
+
+
+def slow_grades(enrollment: str) -> dict:
+    return {"MATRICULA": enrollment, "TOTAL": sum(range(1000))}
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_tools, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(profile_tools.Config, "ACCESS_TOKEN", "admin")
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware)
+
+    @app.get("/students/{enrollment}")
+    async def student(enrollment: str):
+        return await run_blocking("student", slow_grades, enrollment)
+
+    return TestClient(app)
+
+
+def test_flagged_requests_store_the_profile_of_the_worker_thread(client):
+    response = client.get("/students/A", headers={"X-Profile": "admin"})
+    profile_id = response.headers["X-Profile-Id"]
+
+    assert response.json()["MATRICULA"] == "A"
+    stats = pstats.Stats(profile_tools.output_path(profile_id, "pstats"))
+    assert any(function == "slow_grades" for _, _, function in stats.stats)
+    with open(profile_tools.output_path(profile_id, "txt"), encoding="utf-8") as report:
+        assert "slow_grades" in report.read()
+
+
+def test_requests_without_a_valid_flag_are_not_profiled(client, tmp_path):
+    assert "X-Profile-Id" not in client.get("/students/A").headers
+    assert "X-Profile-Id" not in client.get("/students/A?profile=wrong").headers
+    assert "X-Profile-Id" in client.get("/students/A?profile=admin").headers
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_only_the_last_profiles_are_kept(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_tools.Config, "PROFILE_KEEP", 2)
+
+    ids = [
+        client.get("/students/A", headers={"X-Profile": "admin"}).headers["X-Profile-Id"]
+        for _ in range(3)
+    ]
+
+    assert sorted(path.stem for path in tmp_path.iterdir()) == sorted(ids[1:] * 2)
@@ -0,0 +1,73 @@
+import pytest
+import asyncio
+from fastapi import FastAPI, Body
+from fastapi.testclient import TestClient
+import middlewares.rate_limit_middleware as rate_limit
+from middlewares.rate_limit_middleware import RateLimitMiddleware
+from utils.limiter_tools import MemoryBuckets, RedisBuckets
+
+calls = []
+
+
+def application(buckets) -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware, buckets=buckets)
+
+    @app.get("/students/{enrollment}")
+    async def student(enrollment: str):
+        calls.append(enrollment)
+        return {"MATRICULA": enrollment}
+
+    @app.post("/auth/login")
+    async def login(username: str = Body(), password: str = Body()):
+        calls.append(username)
+        return {"username": username}
+
+    return TestClient(app)
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(rate_limit.Config, "RATE_LIMIT_PER_SECOND", 0.01)
+    monkeypatch.setattr(rate_limit.Config, "RATE_LIMIT_BURST", 3)
+    monkeypatch.setattr(rate_limit.Config, "LOGIN_IP_PER_MINUTE", 30)
+    monkeypatch.setattr(rate_limit.Config, "LOGIN_CURP_PER_MINUTE", 2)
+
+
+def test_clients_over_their_rate_get_429_before_the_route(limits):
+    client = application(MemoryBuckets())
+    statuses = [client.get("/students/A").status_code for _ in range(4)]
+
+    assert statuses == [200, 200, 200, 429]
+    assert len(calls) == 3
+
+    response = client.get("/students/A")
+    assert response.json()["codes"]["error_code"] == 1215
+    assert 90 <= int(response.headers["Retry-After"]) <= 100
+
+
+def test_logins_are_throttled_per_curp_and_the_body_reaches_the_route(limits):
+    client = application(MemoryBuckets())
+
+    def login(username):
+        return client.post("/auth/login", json={"username": username, "password": "x"})
+
+    assert login("cafa070122hcsblna2").json() == {"username": "cafa070122hcsblna2"}
+    assert login("CAFA070122HCSBLNA2").status_code == 200
+    assert login("CAFA070122HCSBLNA2").status_code == 429
+    assert calls == ["cafa070122hcsblna2", "CAFA070122HCSBLNA2"]
+
+
+def test_redis_buckets_share_the_token_bucket_rule(limits):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    buckets = RedisBuckets(fakeredis.FakeAsyncRedis())
+
+    async def take():
+        return [await buckets.take("ip:1", 1, 2) for _ in range(3)]
+
+    waits = asyncio.run(take())
+
+    assert waits[:2] == [0.0, 0.0]
+    assert 0.9 < waits[2] <= 1.0
@@ -0,0 +1,66 @@
+import pytest
+from benchmarks.dataset import generate
+from models.history_model import HISTORIAL
+from models.load_model import CARGA
+from models.student_model import ALUMNO
+from models.topic_model import ASIGNATURA
+from services.rebuild_services import RebuildServices
+
+student = {"MATRICULA": "22A0710217M0001", "GRADO": 2, "GRUPO": "A"}
+subjects = {"101": "MATEMATICAS II", "102": "QUIMICA II"}
+
+
+def test_plan_inserts_histories_once_a_partial_is_complete():
+    loads = [
+        {"CLAVE_IN": "101", "CLAVEMAT": "M2", "PARCIAL_1": 8.0, "PARCIAL_2": None, "PARCIAL_3": None},
+        {"CLAVE_IN": "102", "CLAVEMAT": "Q2", "PARCIAL_1": 9.0, "PARCIAL_2": None, "PARCIAL_3": None},
+    ]
+
+    inserts, updates = RebuildServices.plan_student(student, loads, subjects, [])
+
+    assert updates == []
+    assert [item["ASIGNATURA"] for item in inserts] == ["MATEMATICAS II", "QUIMICA II"]
+    assert inserts[0]["PARCIAL_1"] == 8.0
+
+
+def test_plan_fills_missing_partials_by_subject():
+    loads = [
+        {"CLAVE_IN": "102", "CLAVEMAT": "Q2", "PARCIAL_1": 9.0, "PARCIAL_2": 7.0, "PARCIAL_3": None},
+        {"CLAVE_IN": "101", "CLAVEMAT": "M2", "PARCIAL_1": 8.0, "PARCIAL_2": 6.0, "PARCIAL_3": None},
+    ]
+    histories = [
+        {"_RECORD": 10, "GRADO": 2, "CLAVEMAT": "M2", "PARCIAL_1": 8.0, "PARCIAL_2": None, "PARCIAL_3": None},
+        {"_RECORD": 11, "GRADO": 2, "CLAVEMAT": "Q2", "PARCIAL_1": 9.0, "PARCIAL_2": 7.0, "PARCIAL_3": None},
+    ]
+
+    inserts, updates = RebuildServices.plan_student(student, loads, subjects, histories)
+
+    assert inserts == []
+    assert [(item["_RECORD"], item["CHANGES"]) for item in updates] == [(10, {"PARCIAL_2": 6.0})]
+
+
+def test_plan_skips_students_without_a_complete_partial():
+    loads = [
+        {"CLAVE_IN": "101", "CLAVEMAT": "M2", "PARCIAL_1": 8.0, "PARCIAL_2": None, "PARCIAL_3": None},
+        {"CLAVE_IN": "102", "CLAVEMAT": "Q2", "PARCIAL_1": "None", "PARCIAL_2": None, "PARCIAL_3": None},
+    ]
+
+    assert RebuildServices.plan_student(student, loads, subjects, []) == ([], [])
+
+
+def test_shards_add_up_to_the_whole_plan(tmp_path, monkeypatch):
+    generate(str(tmp_path), 90, subjects=3, seed=3)
+    for model, name in ((ALUMNO, "alumnos"), (CARGA, "cargas"), (ASIGNATURA, "asignaturas"),
+                        (HISTORIAL, "HISTORIALES")):
+        monkeypatch.setattr(model, "__ctx__", str(tmp_path / f"{name}.dbf"))
+
+    services = RebuildServices()
+    whole = services.plan()
+    shards = [services.plan(lower, upper) for lower, upper in services.shards(4)]
+
+    def key(item):
+        return item["MATRICULA"], item["CLAVEMAT"]
+
+    assert whole["inserts"] and whole["updates"]
+    for kind in ("inserts", "updates"):
+        assert sorted(map(key, (item for shard in shards for item in shard[kind]))) == sorted(map(key, whole[kind]))
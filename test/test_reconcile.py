@@ -0,0 +1,114 @@
+import pytest
+import shutil
+import dbf
+import tasks.celery_tasks as celery_tasks
+from benchmarks.dataset import generate
+from benchmarks.run import workspace
+from utils.dataset_tools import promote, staging_file
+from utils.dbf_tools import DBFReader
+from utils.writer_tools import BulkWriter
+
+ORPHANS = ("99A0710217M0001", "99A0710217M0002")
+
+
+@pytest.fixture
+def school(tmp_path, monkeypatch):
+    directory = tmp_path / "school"
+    generate(str(directory), 60, subjects=3, orphan_rate=0.05, seed=3)
+    table = dbf.Table(str(directory / "HISTORIALES.dbf"))
+    table.open(mode=dbf.READ_WRITE)
+
+    for enrollment in ORPHANS:
+        for key in ("M1", "Q1"):
+            table.append({"MATRICULA": enrollment, "GRADO": 2, "GRUPO": "A", "CLAVEMAT": key})
+
+    table.close()
+
+    materialized = []
+    commits = []
+    writers = []
+
+    class Writer(BulkWriter):
+        def __init__(self, *args, **kwargs):
+            writers.append(self)
+            super().__init__(*args, **kwargs)
+
+        def commit(self):
+            commits.append(self)
+            return super().commit()
+
+    class Reports:
+        def materialize(self):
+            materialized.append(True)
+
+    monkeypatch.setattr(celery_tasks, "BulkWriter", Writer)
+    monkeypatch.setattr(celery_tasks, "ReportServices", Reports)
+
+    with workspace(str(directory)):
+        yield directory, writers, commits, materialized
+
+
+def rows(file_path):
+    with DBFReader(file_path) as reader:
+        return list(reader.rows())
+
+
+def test_orphaned_histories_are_deleted_in_one_commit(school):
+    directory, _, commits, materialized = school
+    students = {row["MATRICULA"] for row in rows(str(directory / "alumnos.dbf"))}
+    histories = rows(str(directory / "HISTORIALES.dbf"))
+    valid = [row for row in histories if row["MATRICULA"] in students]
+    orphaned = {row["MATRICULA"] for row in histories} - students
+
+    summary = celery_tasks.check_student_status()
+
+    assert set(ORPHANS) <= orphaned and len(orphaned) == 3 + len(ORPHANS)
+    assert summary["students"] == len(students) == 60
+    assert summary["histories"] == len(histories)
+    assert summary["deleted"] == len(histories) - len(valid)
+    assert summary["orphaned_students"] == len(orphaned)
+    assert len(commits) == 1 and materialized == [True]
+    assert rows(str(directory / "HISTORIALES.dbf")) == valid
+
+
+def test_nothing_is_deleted_without_orphans(school):
+    directory, _, commits, materialized = school
+    celery_tasks.check_student_status()
+    histories = rows(str(directory / "HISTORIALES.dbf"))
+
+    summary = celery_tasks.check_student_status(force=True)
+
+    assert summary["deleted"] == summary["orphaned_students"] == 0
+    assert rows(str(directory / "HISTORIALES.dbf")) == histories
+    assert materialized == [True]
+
+
+def test_unchanged_tables_are_skipped_without_a_writer(school):
+    _, writers, _, _ = school
+    celery_tasks.check_student_status()
+
+    assert celery_tasks.check_student_status() == {"skipped": True}
+    assert len(writers) == 1
+
+
+@pytest.mark.parametrize("name", ["alumnos.dbf", "HISTORIALES.dbf"])
+def test_promoting_a_reconciled_table_runs_again(school, name):
+    directory, writers, _, _ = school
+    celery_tasks.check_student_status()
+    staged = staging_file(name)
+    shutil.copyfile(str(directory / name), staged)
+    promote(staged, name)
+
+    summary = celery_tasks.check_student_status()
+
+    assert summary["deleted"] == 0 and summary["students"] == 60
+    assert len(writers) == 2
+    assert celery_tasks.check_student_status() == {"skipped": True}
+
+
+def test_force_ignores_the_stored_signature(school):
+    _, writers, _, _ = school
+    celery_tasks.check_student_status()
+
+    assert celery_tasks.check_student_status(force=True)["deleted"] == 0
+    assert len(writers) == 2
@@ -0,0 +1,108 @@
+import pytest
+import services.report_services as report_services
+import utils.dataset_tools as dataset
+import utils.report_tools as report_tools
+from services.report_services import ReportServices
+from utils.report_tools import ReportStore, report_key, write_reports
+from utils.snapshot_tools import Snapshot
+
+students = [
+    {"MATRICULA": "22A0710217M0002", "NOMBRES": "LUIS", "CURP": "CURPB", "GRADO": "1", "GRUPO": "A"},
+    {"MATRICULA": "22A0710217M0001", "NOMBRES": "ANA", "CURP": "CURPA", "GRADO": "1", "GRUPO": "A"},
+]
+loads = [
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "101", "CLAVEMAT": "M1", "PARCIAL_1": "8.0",
+     "PARCIAL_2": "None", "PARCIAL_3": "None", "FALTAS_1": "0", "PALABRA": "", "OBSERVA": ""},
+]
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, "STAGING_DIR", str(tmp_path / ".staging"))
+    monkeypatch.setattr(report_tools, "REPORTS_DIR", str(tmp_path / "reports"))
+
+    return ReportStore()
+
+
+def test_store_serves_the_documents_of_its_generation(store):
+    key = report_key("get_academic_load", "22A0710217M0001", 2, None)
+    write_reports(3, {key: b'{"DETALLES":1}', report_key("get_student", "22A0710217M0001", None, None): b"{}"})
+
+    assert store.get("get_academic_load", "22A0710217M0001", 2, None, generation=3) == b'{"DETALLES":1}'
+    assert store.get("get_academic_load", "22A0710217M0001", 3, None, generation=3) is None
+    assert store.get("get_academic_load", "22A0710217M0001", 2, None, generation=4) is None
+
+
+def test_writing_a_generation_removes_older_stores(store, tmp_path):
+    write_reports(1, {})
+    write_reports(2, {})
+
+    assert sorted(path.name for path in (tmp_path / "reports").iterdir()) == ["2.rpt"]
+
+
+def test_writing_an_older_generation_keeps_newer_stores(store, tmp_path):
+    write_reports(3, {})
+    write_reports(2, {})
+
+    assert sorted(path.name for path in (tmp_path / "reports").iterdir()) == ["2.rpt", "3.rpt"]
+
+
+def test_missing_store_is_retried_only_when_its_file_changes(store, monkeypatch):
+    opened = []
+    report_file = report_tools.ReportFile
+
+    def open_store(generation):
+        opened.append(generation)
+        return report_file(generation)
+
+    monkeypatch.setattr(report_tools, "ReportFile", open_store)
+    key = report_key("get_student", "22A0710217M0001", None, None)
+
+    assert store.get("get_student", "22A0710217M0001", None, None, generation=4) is None
+    assert store.get("get_student", "22A0710217M0001", None, None, generation=4) is None
+    assert opened == [4]
+
+    write_reports(4, {key: b"{}"})
+
+    assert store.get("get_student", "22A0710217M0001", None, None, generation=4) == b"{}"
+    assert store.get("get_student", "22A0710217M0001", None, None, generation=4) == b"{}"
+    assert opened == [4, 4]
+
+
+def test_store_is_written_from_a_stream(store):
+    first = report_key("get_student", "22A0710217M0002", None, None)
+    second = report_key("get_student", "22A0710217M0001", None, None)
+
+    assert write_reports(5, iter([(first, b"{2}"), (second, b"{1}")])) == 2
+    assert store.get("get_student", "22A0710217M0001", None, None, generation=5) == b"{1}"
+    assert store.get("get_student", "22A0710217M0002", None, None, generation=5) == b"{2}"
+
+
+def test_stale_store_is_discarded(store, tmp_path):
+    write_reports(1, {})
+    key = report_key("get_student", "22A0710217M0001", None, None)
+
+    assert write_reports(2, {key: b"{}"}, still_current=lambda: False) is None
+    assert sorted(path.name for path in (tmp_path / "reports").iterdir()) == ["1.rpt"]
+
+
+def test_documents_are_streamed_by_enrollment_and_skip_rejected_requests():
+    snapshot = Snapshot(1, students, loads, [{"ASIGNATURA": "MATEMATICAS I", "CLAVE_IN": "101"}])
+    keys = [key for key, _ in ReportServices().documents(snapshot, {})]
+
+    assert keys[0] == report_key("get_student", "22A0710217M0001", None, None)
+    assert report_key("get_academic_load", "22A0710217M0001", 1, None) in keys
+    assert report_key("get_academic_load", "22A0710217M0001", 2, None) not in keys
+    assert keys.index(report_key("get_student", "22A0710217M0002", None, None)) > keys.index(
+        report_key("get_academic_load", "22A0710217M0001", 1, None)
+    )
+
+
+def test_documents_log_unexpected_errors(monkeypatch):
+    snapshot = Snapshot(1, students, loads, [])
+    errors = []
+    monkeypatch.setattr(report_services.app_logger, "error", errors.append)
+    monkeypatch.setattr(ReportServices, "render", staticmethod(lambda student: {}["missing"]))
+
+    assert list(ReportServices().documents(snapshot, {})) == []
+    assert errors and all("<ReportServices.documents>" in error for error in errors)
@@ -0,0 +1,33 @@
+import pytest
+import gzip
+from utils.response_tools import ENCODERS, EncodedBody, dumps, negotiate
+
+
+def test_negotiate_honours_q_values():
+    assert negotiate("gzip;q=0.5, identity;q=0.8") == "identity"
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0") == "identity"
+    assert negotiate(None) == "identity"
+
+
+def test_encoded_body_is_compressed_once_and_only_when_large():
+    large = EncodedBody(dumps({"CARGA": [{"ASIGNATURA": "MATEMATICAS I"}] * 100}))
+    small = EncodedBody(dumps({"MATRICULA": "22A0710217M0001"}))
+
+    assert large.coding("gzip") == "gzip"
+    assert gzip.decompress(large.variants["gzip"]) == large.variants["identity"]
+    assert small.coding("gzip") == "identity"
+    assert small.size == len(small.variants["identity"])
+
+
+def test_encoded_body_only_compresses_the_negotiated_coding(monkeypatch):
+    calls = []
+    monkeypatch.setitem(ENCODERS, "gzip", lambda body: calls.append("gzip") or gzip.compress(body))
+    monkeypatch.setitem(ENCODERS, "br", lambda body: calls.append("br") or body)
+    body = EncodedBody(dumps({"CARGA": [{"ASIGNATURA": "MATEMATICAS I"}] * 100}))
+
+    assert calls == []
+    assert body.coding("gzip") == body.coding("gzip") == "gzip"
+    assert calls == ["gzip"]
+    assert body.coding("br") == "identity"
+    assert calls == ["gzip", "br"]
@@ -0,0 +1,102 @@
+import pytest
+import time
+import utils.snapshot_tools as snapshot_tools
+from errors.errors import NotFoundStudent
+from utils.snapshot_tools import Snapshot, SnapshotManager
+
+students = [
+    {"MATRICULA": "22A0710217M0001", "CURP": "CURPA", "GRADO": 3.0, "GRUPO": "A "},
+    {"MATRICULA": "22A0710217M0002", "CURP": "CURPB", "GRADO": 3.0, "GRUPO": "B"},
+    {"MATRICULA": "22A0710217M0003", "CURP": "CURPC", "GRADO": 3.0, "GRUPO": "A"},
+]
+loads = [
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "101", "PARCIAL_1": "8.0"},
+    {"MATRICULA": "22A0710217M0002", "CLAVE_IN": "101", "PARCIAL_1": "9.0"},
+    {"MATRICULA": "22A0710217M0001", "CLAVE_IN": "102", "PARCIAL_1": "5.0"},
+]
+subjects = [{"ASIGNATURA": "MATEMATICAS I", "CLAVE_IN": "101"}]
+
+
+@pytest.fixture
+def snapshot():
+    return Snapshot(1, students, loads, subjects)
+
+
+def table(rows):
+    class Model:
+        builds = 0
+
+        def get_all(self, easy_view=False):
+            Model.builds += 1
+            return rows
+
+    return Model
+
+
+def test_students_are_found_by_enrollment_and_curp(snapshot):
+    assert snapshot.get_student("22A0710217M0002").CURP == "CURPB"
+    assert snapshot.get_student_by_curp("CURPC").MATRICULA == "22A0710217M0003"
+
+    with pytest.raises(NotFoundStudent):
+        snapshot.get_student("22A0710217M9999")
+
+    with pytest.raises(NotFoundStudent):
+        snapshot.get_student_by_curp("CURPZ")
+
+
+def test_groups_normalize_the_grade_and_group(snapshot):
+    assert snapshot.get_group(3, "A") == ("22A0710217M0001", "22A0710217M0003")
+    assert snapshot.get_group("3", " A") == snapshot.get_group(3.0, "A")
+    assert snapshot.get_group(2, "A") == ()
+    assert snapshot.get_grade(3) == ("22A0710217M0001", "22A0710217M0003", "22A0710217M0002")
+
+
+def test_records_are_fresh_copies(snapshot):
+    load = snapshot.get_academic_load("22A0710217M0001")
+
+    assert [row["CLAVE_IN"] for row in load] == ["101", "102"]
+
+    load[0]["PARCIAL_1"] = "10.0"
+    student = snapshot.get_student("22A0710217M0001")
+    student.CARGA = load
+
+    assert snapshot.get_academic_load("22A0710217M0001")[0]["PARCIAL_1"] == "8.0"
+    assert not hasattr(snapshot.get_student("22A0710217M0001"), "CARGA")
+    assert snapshot.get_academic_load("22A0710217M0003") == []
+
+
+def test_snapshot_is_rebuilt_when_the_generation_changes(monkeypatch):
+    generation = [1]
+    manager = SnapshotManager()
+    manager.models = (table(students), table(loads), table(subjects))
+    monkeypatch.setattr(snapshot_tools, "current_generation", lambda: generation[0])
+
+    first = manager.current()
+
+    assert manager.current() is first and first.generation == 1
+    assert manager.models[0].builds == 1
+
+    generation[0] = 2
+    second = manager.current()
+
+    assert second is not first and second.generation == 2
+    assert manager.models[0].builds == 2
+
+
+def test_watcher_builds_the_new_generation_ahead_of_requests(monkeypatch):
+    generation = [1]
+    manager = SnapshotManager()
+    manager.models = (table(students), table(loads), table(subjects))
+    monkeypatch.setattr(snapshot_tools, "current_generation", lambda: generation[0])
+
+    manager.watch(0.01)
+    generation[0] = 2
+    deadline = time.monotonic() + 5
+
+    while manager._key != 2 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert manager._key == 2
+    builds = manager.models[0].builds
+    assert manager.current().generation == 2
+    assert manager.models[0].builds == builds
@@ -0,0 +1,54 @@
+import pytest
+from datetime import datetime, timedelta
+from time import time
+from jose import jwt
+from errors.errors import ExpiredTokenError, InvalidTokenError
+import utils.token_tools as token_tools
+from utils.token_tools import TokenCache, create_token, verify_token
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(token_tools.Config, "SECRET_KEY", "secret")
+    monkeypatch.setattr(token_tools.Config, "ALGORITHM", "HS256")
+    cache = TokenCache(2)
+    monkeypatch.setattr(token_tools, "tokens", cache)
+
+    return cache
+
+
+def test_repeat_verifications_skip_the_signature_check(cache, monkeypatch):
+    token = create_token({"enrollment": "22A0710217M0001"})
+    assert verify_token(token)["enrollment"] == "22A0710217M0001"
+
+    monkeypatch.setattr(token_tools.jwt, "decode", lambda *args, **kwargs: pytest.fail())
+    claims = verify_token(token)
+    claims["enrollment"] = "changed"
+
+    assert verify_token(token)["enrollment"] == "22A0710217M0001"
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_cached_tokens_expire_at_their_exp(cache, monkeypatch):
+    token = create_token({"enrollment": "22A0710217M0001"})
+    verify_token(token)
+    monkeypatch.setattr(token_tools, "time", lambda: time() + 8 * 86400)
+
+    with pytest.raises(ExpiredTokenError):
+        verify_token(token)
+    assert len(cache) == 0
+
+
+def test_invalid_tokens_are_not_cached_and_the_cache_is_bounded(cache):
+    forged = jwt.encode(
+        {"enrollment": "x", "exp": datetime.utcnow() + timedelta(days=1)}, "other", "HS256"
+    )
+
+    for _ in range(2):
+        with pytest.raises(InvalidTokenError):
+            verify_token(forged)
+    assert len(cache) == 0
+
+    for enrollment in ("A", "B", "C"):
+        verify_token(create_token({"enrollment": enrollment}))
+    assert len(cache) == 2
@@ -0,0 +1,52 @@
+import pytest
+import dbf
+import utils.dataset_tools as dataset
+from errors.errors import ServerError
+from utils.dbf_tools import DBFReader
+from utils.writer_tools import BulkWriter, table_signature
+
+
+@pytest.fixture
+def histories(tmp_path, monkeypatch):
+    monkeypatch.setattr(dataset, "DB_DIR", str(tmp_path))
+    monkeypatch.setattr(dataset, "STAGING_DIR", str(tmp_path / ".staging"))
+    monkeypatch.setattr(dataset, "GENERATION_FILE", str(tmp_path / "generation.json"))
+    monkeypatch.setattr(dataset, "LOCK_FILE", str(tmp_path / ".generation.lock"))
+
+    path = str(tmp_path / "HISTORIALES.dbf")
+    table = dbf.Table(path, "MATRICULA C(15); CLAVEMAT C(10); PARCIAL_1 N(4,1); PARCIAL_2 N(4,1)")
+    table.open(mode=dbf.READ_WRITE)
+    table.append(("22A0710217M0001", "M1", 8.0, None))
+    table.append(("22A0710217M0002", "M1", 7.0, None))
+    table.close()
+
+    return path
+
+
+def test_commit_applies_the_whole_batch(histories):
+    writer = BulkWriter(histories, table_signature(histories))
+    writer.update(0, {"PARCIAL_2": "9.0"})
+    writer.delete(1)
+    writer.insert({"MATRICULA": "22A0710217M0003", "CLAVEMAT": "Q1", "PARCIAL_1": 6.0, "PARCIAL_2": "None"})
+
+    assert writer.commit() == {"inserts": 1, "updates": 1, "deletes": 1}
+    assert dataset.current_generation() == 1
+
+    with DBFReader(histories) as reader:
+        assert list(reader.rows(["MATRICULA", "PARCIAL_2"])) == [
+            {"MATRICULA": "22A0710217M0001", "PARCIAL_2": 9.0},
+            {"MATRICULA": "22A0710217M0003", "PARCIAL_2": None},
+        ]
+
+
+def test_failed_batch_leaves_the_table_untouched(histories):
+    before = open(histories, "rb").read()
+    writer = BulkWriter(histories)
+    writer.insert({"MATRICULA": "22A0710217M0003", "CLAVEMAT": "Q1", "PARCIAL_1": 6.0})
+    writer.update(99, {"PARCIAL_2": 9.0})
+
+    with pytest.raises(ServerError):
+        writer.commit()
+
+    assert open(histories, "rb").read() == before
+    assert dataset.current_generation() == 0
@@ -0,0 +1,162 @@
+"""
+This module provides `ResponseCache`, an in-process cache of fully serialized response
+bodies bounded by a byte budget.
+
+Responses of the read endpoints only change when a DBF is uploaded, so every entry is
+keyed by the dataset generation (see `utils.dataset_tools`) and the whole cache is
+dropped as soon as a new generation is promoted.
+
+Eviction is frequency-aware (a simplified TinyLFU):
+- A count-min sketch estimates how often every key was requested, cached or not.
+  Its counters are halved periodically, so old popularity fades away.
+- Entries are kept in LRU order. When a new body does not fit in the budget, it is only
+  admitted if it is requested more often than the entries it would evict; otherwise it
+  is served without being cached. One-off requests can not flush the bodies that
+  students view again and again during result-release week.
+"""
+
+from collections import OrderedDict
+from threading import Lock
+
+SKETCH_DEPTH = 4
+
+
+class FrequencySketch:
+    """
+    Count-min sketch of request frequencies with periodic aging.
+
+    Attributes:
+        width (int): Counters per row.
+        sample (int): Number of increments after which every counter is halved.
+    """
+
+    def __init__(self, width: int = 16384) -> None:
+        self.width = width
+        self.sample = width * 10
+        self._rows = [[0] * width for _ in range(SKETCH_DEPTH)]
+        self._additions = 0
+
+    def _indexes(self, key) -> list[int]:
+        return [hash((seed, key)) % self.width for seed in range(SKETCH_DEPTH)]
+
+    def increment(self, key) -> None:
+        """
+        Records one request of `key`.
+        """
+        for row, index in zip(self._rows, self._indexes(key)):
+            row[index] += 1
+
+        self._additions += 1
+
+        if self._additions >= self.sample:
+            self._rows = [[counter >> 1 for counter in row] for row in self._rows]
+            self._additions //= 2
+
+    def estimate(self, key) -> int:
+        """
+        Returns the estimated number of requests of `key`.
+        """
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+
+class ResponseCache:
+    """
+    Byte-bounded, generation-scoped cache of serialized responses.
+
+    Attributes:
+        max_bytes (int): Budget for the cached bodies.
+        size (int): Bytes currently cached.
+        generation (int | None): Dataset generation of the cached entries.
+        hits (int): Requests served from the cache.
+        misses (int): Requests that had to be computed.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.generation = None
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sketch = FrequencySketch()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _sync(self, generation: int) -> None:
+        """
+        Drops every entry when the dataset generation changed.
+        """
+        if self.generation != generation:
+            self._entries.clear()
+            self.size = 0
+            self.generation = generation
+
+    def get(self, key: tuple, generation: int):
+        """
+        Returns the cached value of `key` for a generation, or None on a miss.
+        Every lookup counts towards the frequency of the key.
+        """
+        with self._lock:
+            self._sync(generation)
+            self._sketch.increment(key)
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, generation: int, value, size: int) -> bool:
+        """
+        Caches a value computed for a generation, evicting the least recently used
+        entries if the candidate is requested more often than them. A rejected value
+        leaves the previous value of `key`, if any, in the cache.
+
+        Args:
+            key (tuple): The key of the value.
+            generation (int): The dataset generation the value was computed from.
+            value: The value to cache (typically the serialized body).
+            size (int): Bytes the value takes.
+
+        Returns:
+            bool: True if the value was admitted.
+        """
+        with self._lock:
+            if generation != self.generation or size > self.max_bytes:
+                return False
+
+            current = self._entries.get(key)
+            used = self.size - (0 if current is None else current[1])
+            frequency = self._sketch.estimate(key)
+            victims, freed = [], 0
+
+            for victim, (_, victim_size) in self._entries.items():
+                if used - freed + size <= self.max_bytes:
+                    break
+                if victim == key:
+                    continue
+                if self._sketch.estimate(victim) >= frequency:
+                    return False
+                victims.append(victim)
+                freed += victim_size
+
+            for victim in victims:
+                del self._entries[victim]
+
+            self._entries.pop(key, None)
+            self.size = used - freed + size
+            self._entries[key] = (value, size)
+            return True
+
+    def clear(self) -> None:
+        """
+        Drops every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
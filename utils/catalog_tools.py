@@ -0,0 +1,58 @@
+"""
+This module defines the `SubjectCatalog`, the `CLAVE_IN` → subject (ASIGNATURA) mapping
+used to enrich academic loads with the data of each subject.
+
+The catalog is resolved once per dataset generation (it lives in the read snapshot,
+see `utils.snapshot_tools`) and keeps the semantics of the former per-row
+`ASIGNATURA().get_all(CLAVE_IN=..., easy_view=True)[-1]` lookup: when several
+records share a `CLAVE_IN`, the last one wins.
+
+Usage:
+    catalog = snapshots.current().catalog
+    catalog.merge(student.CARGA)              # one academic load
+    catalog.merge(*(s.CARGA for s in group))  # many loads in one pass
+"""
+
+
+class SubjectCatalog:
+    """
+    Read-only `CLAVE_IN` → subject mapping.
+
+    Attributes:
+        fields (tuple[str]): Ordered field names of the subject records.
+    """
+
+    def __init__(self, subjects: list[dict]) -> None:
+        """
+        Indexes the subject records by `CLAVE_IN`; later records replace earlier ones.
+
+        Args:
+            subjects (list[dict]): The records of `asignaturas.dbf`, in file order.
+        """
+        self.fields = tuple(subjects[0]) if subjects else ()
+        self._by_clave_in = {
+            subject["CLAVE_IN"]: tuple(subject.values()) for subject in subjects
+        }
+
+    def __len__(self) -> int:
+        return len(self._by_clave_in)
+
+    def get(self, clave_in: str) -> dict | None:
+        """
+        Returns a fresh copy of the subject registered with `clave_in`, or None
+        if there is none.
+        """
+        row = self._by_clave_in.get(clave_in)
+        return None if row is None else dict(zip(self.fields, row))
+
+    def merge(self, *loads: list[dict]) -> None:
+        """
+        Adds the subject data (`DATOS_MATERIA`) to every course of one or many
+        academic loads, in place, with a single hash lookup per course.
+
+        Args:
+            *loads (list[dict]): Academic loads (lists of CARGA records).
+        """
+        for load in loads:
+            for charge in load:
+                charge["DATOS_MATERIA"] = self.get(charge["CLAVE_IN"])
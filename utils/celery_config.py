@@ -2,6 +2,9 @@
 This module configures the Celery application to run background tasks. It sets up the Celery instance
 with the appropriate broker, backend, and task schedule. Additionally, it configures the timezone for the tasks.
 
+The reconciliation (`check_student_status`) is queued after every upload and skips cheaply when
+nothing changed, so the beat schedule only runs it every 15 minutes as a safety net.
+
 Dependencies:
 - celery.schedules.crontab: For scheduling periodic tasks using cron expressions.
 - celery.Celery: The Celery framework for handling asynchronous tasks.
@@ -25,7 +28,7 @@ app = Celery(
 app.conf.beat_schedule = {
     "engine": {
         "task": "tasks.celery_tasks.check_student_status",
-        "schedule": crontab(minute="*", hour="*")
+        "schedule": crontab(minute="*/15")
     }
 }
 
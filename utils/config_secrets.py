@@ -13,7 +13,7 @@ Dependencies:
 - `dotenv` library for loading environment variables.
 - `os` module for accessing environment variables.
 """
-from os import getenv
+from os import getenv, cpu_count
 from dotenv import load_dotenv
 
 
@@ -28,6 +28,24 @@ class Config:
         ALGORITHM (str): Algorithm used for token generation (e.g., "HS256", "HS512").
         TOKEN_EXPIRE_DAYS (int): Number of days until the token expires.
         URL_REDIS (str): URL of redis.
+        MAX_UPLOAD_BYTES (int): Maximum size accepted for an uploaded DBF file.
+        REBUILD_WORKERS (int): Number of shards the history rebuild is split into.
+        REBUILD_BACKEND (str): Where the shards run: "inline", "process" or "celery".
+        RESPONSE_CACHE_BYTES (int): Byte budget of the in-process response cache.
+        DATA_WORKERS (int): Threads of the pool that runs the blocking DBF work of requests.
+        ROUTE_CONCURRENCY (int): Requests of one route that may use the pool at once.
+        DATA_TIMEOUT (float): Seconds a request may wait for its DBF work.
+        RENDER_WORKERS (int): Processes that render the PDF boletas (0 renders inline).
+        TOKEN_CACHE_SIZE (int): Verified tokens kept in memory (0 disables the cache).
+        RATE_LIMIT_BACKEND (str): Token buckets of the rate limiter: "memory", "redis" or "none".
+        RATE_LIMIT_PER_SECOND (float): Requests per second allowed to a client IP.
+        RATE_LIMIT_BURST (int): Requests a client IP may make at once.
+        LOGIN_IP_PER_MINUTE (int): Login attempts per minute allowed to a client IP.
+        LOGIN_CURP_PER_MINUTE (int): Login attempts per minute allowed for a CURP.
+        LOG_SAMPLE_RATE (float): Share of the successful requests written to the access log.
+        PROFILE_KEEP (int): Profiles of flagged requests kept on disk.
+        SNAPSHOT_POLL_SECONDS (float): Seconds between the checks of the dataset generation
+            by the snapshot watcher of every worker (0 disables it).
     """
     load_dotenv()
 
@@ -36,3 +54,20 @@ class Config:
     ALGORITHM = getenv("ALGORITHM")
     TOKEN_EXPIRE_DAYS = int(getenv("TOKEN_EXPIRE_DAYS"))
     URL_REDIS = getenv("URL_REDIS")
+    MAX_UPLOAD_BYTES = int(getenv("MAX_UPLOAD_BYTES", str(64 * 1024 * 1024)))
+    REBUILD_WORKERS = int(getenv("REBUILD_WORKERS", str(cpu_count() or 1)))
+    REBUILD_BACKEND = getenv("REBUILD_BACKEND", "process")
+    RESPONSE_CACHE_BYTES = int(getenv("RESPONSE_CACHE_BYTES", str(64 * 1024 * 1024)))
+    DATA_WORKERS = int(getenv("DATA_WORKERS", "16"))
+    ROUTE_CONCURRENCY = int(getenv("ROUTE_CONCURRENCY", "8"))
+    DATA_TIMEOUT = float(getenv("DATA_TIMEOUT", "10"))
+    RENDER_WORKERS = int(getenv("RENDER_WORKERS", str(cpu_count() or 1)))
+    TOKEN_CACHE_SIZE = int(getenv("TOKEN_CACHE_SIZE", "10000"))
+    RATE_LIMIT_BACKEND = getenv("RATE_LIMIT_BACKEND", "memory")
+    RATE_LIMIT_PER_SECOND = float(getenv("RATE_LIMIT_PER_SECOND", "10"))
+    RATE_LIMIT_BURST = int(getenv("RATE_LIMIT_BURST", "40"))
+    LOGIN_IP_PER_MINUTE = int(getenv("LOGIN_IP_PER_MINUTE", "30"))
+    LOGIN_CURP_PER_MINUTE = int(getenv("LOGIN_CURP_PER_MINUTE", "5"))
+    LOG_SAMPLE_RATE = float(getenv("LOG_SAMPLE_RATE", "1"))
+    PROFILE_KEEP = int(getenv("PROFILE_KEEP", "50"))
+    SNAPSHOT_POLL_SECONDS = float(getenv("SNAPSHOT_POLL_SECONDS", "1"))
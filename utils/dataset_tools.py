@@ -0,0 +1,360 @@
+"""
+This module manages the dataset of DBF tables stored in `db/` and its generation number.
+
+Uploads are never written over the live tables. They are written to a staging
+directory, validated, fsynced and then promoted with an atomic rename. Every
+promotion increments a monotonically increasing dataset generation, stored in
+`db/generation.json`, so every worker can tell that the data changed without a
+restart, and caches and indexes can be keyed by it.
+
+Key Features:
+- `table_name`: Maps an uploaded file name to the table it replaces.
+- `stage_upload`: Streams an upload to the staging directory in chunks, off the event
+  loop, with a size limit, incremental SHA-256 hashing and early header checks.
+- `validate_table`: Checks that a staged file is a well-formed DBF table.
+- `promote`: Atomically replaces a live table and bumps the generation.
+- `current_generation`: Cheap read of the current generation (one `stat()` per call).
+
+Readers that already opened a table keep reading the previous file after a
+promotion (the rename does not touch open files), so in-flight requests finish on
+the old generation.
+"""
+
+import json
+from hashlib import sha256
+from os import (
+    path, makedirs, replace, fsync, stat, remove, O_RDONLY,
+    open as os_open, close as os_close
+)
+from tempfile import mkstemp
+from fcntl import flock, LOCK_EX, LOCK_UN
+from threading import Lock
+from starlette.concurrency import run_in_threadpool
+from fastapi import UploadFile
+from errors.errors import InvalidDatabaseFile, UploadTooLarge
+from utils.config_secrets import Config
+from utils.dbf_tools import DBFReader, HEADER_SIZE
+
+DB_DIR = path.abspath(path.join(path.dirname(__file__), "../db"))
+STAGING_DIR = path.join(DB_DIR, ".staging")
+GENERATION_FILE = path.join(DB_DIR, "generation.json")
+LOCK_FILE = path.join(DB_DIR, ".generation.lock")
+CHUNK_SIZE = 1024 * 1024
+
+# Version bytes of dBase III/IV/5, FoxBASE, FoxPro and Visual FoxPro tables.
+DBF_VERSIONS = {0x02, 0x03, 0x04, 0x05, 0x30, 0x31, 0x32, 0x43, 0x63, 0x83, 0x8B, 0xCB, 0xF5, 0xFB}
+
+TABLES = {
+    "alumnos.dbf": "alumnos.dbf",
+    "cargas.dbf": "cargas.dbf",
+    "asignaturas.dbf": "asignaturas.dbf",
+    "historiales.dbf": "HISTORIALES.dbf",
+}
+
+_cache_lock = Lock()
+_cache = {"key": None, "state": {"generation": 0, "tables": {}}}
+
+
+def table_name(file_name: str) -> str:
+    """
+    Returns the name of the live table an uploaded file replaces.
+
+    Args:
+        file_name (str): The name of the uploaded file (case-insensitive).
+
+    Returns:
+        str: The file name of the table inside `db/`.
+
+    Raises:
+        InvalidDatabaseFile: If the file is not one of the tables of the system.
+    """
+    name = path.basename(file_name or "").lower()
+
+    if name not in TABLES:
+        raise InvalidDatabaseFile(f"Unknown table {file_name} 💾")
+    return TABLES[name]
+
+
+def table_path(name: str) -> str:
+    """
+    Returns the absolute path of a live table.
+    """
+    return path.join(DB_DIR, name)
+
+
+def fsync_dir(directory: str) -> None:
+    """
+    Flushes a directory entry so a rename inside it survives a crash.
+    """
+    descriptor = os_open(directory, O_RDONLY)
+
+    try:
+        fsync(descriptor)
+    finally:
+        os_close(descriptor)
+
+
+def staging_file(name: str) -> str:
+    """
+    Creates an empty, uniquely named file in the staging directory.
+
+    Args:
+        name (str): The table the staged file is meant to replace.
+
+    Returns:
+        str: The path of the staged file.
+    """
+    makedirs(STAGING_DIR, exist_ok=True)
+    descriptor, staged = mkstemp(prefix=f"{name}.", suffix=".tmp", dir=STAGING_DIR)
+    os_close(descriptor)
+
+    return staged
+
+
+def check_header(chunk: bytes) -> None:
+    """
+    Rejects a file early, from its first bytes, when it cannot be a DBF table.
+
+    Args:
+        chunk (bytes): The first chunk of the upload.
+
+    Raises:
+        InvalidDatabaseFile: If the header is not the one of a DBF table.
+    """
+    if len(chunk) < HEADER_SIZE + 1 or chunk[0] not in DBF_VERSIONS:
+        raise InvalidDatabaseFile("The file is not a DBF table 💾")
+
+    month, day = chunk[2], chunk[3]
+    header_length = int.from_bytes(chunk[8:10], "little")
+    record_length = int.from_bytes(chunk[10:12], "little")
+
+    if month > 12 or day > 31 or header_length <= HEADER_SIZE or record_length < 2:
+        raise InvalidDatabaseFile("The file is not a DBF table 💾")
+
+
+def _write_chunk(file, digest, chunk: bytes) -> None:
+    """
+    Appends a chunk to the staged file and feeds it to the running hash.
+    """
+    file.write(chunk)
+    digest.update(chunk)
+
+
+def _commit_file(file) -> None:
+    """
+    Flushes, fsyncs and closes the staged file.
+    """
+    file.flush()
+    fsync(file.fileno())
+    file.close()
+
+
+def _discard_file(file, staged: str) -> None:
+    """
+    Closes and removes a partially written staged file.
+    """
+    file.close()
+
+    if path.exists(staged):
+        remove(staged)
+
+
+async def stage_upload(upload: UploadFile, name: str) -> tuple[str, str]:
+    """
+    Streams an upload to the staging directory.
+
+    The upload is read in chunks of `CHUNK_SIZE` bytes and every blocking
+    operation (open, write, hash, fsync) runs in the thread pool, so the memory
+    used stays flat and the event loop is never blocked.
+
+    Args:
+        upload (UploadFile): The uploaded file.
+        name (str): The table the upload is meant to replace.
+
+    Returns:
+        tuple[str, str]: The path of the staged file and its SHA-256 hex digest.
+
+    Raises:
+        UploadTooLarge: If the upload exceeds `Config.MAX_UPLOAD_BYTES`.
+        InvalidDatabaseFile: If the header is not the one of a DBF table.
+    """
+    if upload.size is not None and upload.size > Config.MAX_UPLOAD_BYTES:
+        raise UploadTooLarge()
+
+    staged = await run_in_threadpool(staging_file, name)
+    file = await run_in_threadpool(open, staged, "wb")
+    digest, size = sha256(), 0
+
+    try:
+        while chunk := await upload.read(CHUNK_SIZE):
+            if size == 0:
+                check_header(chunk)
+
+            size += len(chunk)
+
+            if size > Config.MAX_UPLOAD_BYTES:
+                raise UploadTooLarge()
+
+            await run_in_threadpool(_write_chunk, file, digest, chunk)
+
+        if size == 0:
+            raise InvalidDatabaseFile("The file is empty 💾")
+
+        await run_in_threadpool(_commit_file, file)
+        return staged, digest.hexdigest()
+
+    except BaseException:
+        await run_in_threadpool(_discard_file, file, staged)
+        raise
+
+
+def validate_table(staged: str) -> int:
+    """
+    Checks that a staged file is a well-formed DBF table.
+
+    Args:
+        staged (str): The path of the staged file.
+
+    Returns:
+        int: The number of records of the table.
+
+    Raises:
+        InvalidDatabaseFile: If the header is malformed or the records are truncated.
+    """
+    try:
+        with DBFReader(staged, include_deleted=True) as reader:
+            if len(reader) < reader.declared:
+                raise InvalidDatabaseFile("The table is truncated 💾")
+            return len(reader)
+
+    except (ValueError, OSError) as e:
+        raise InvalidDatabaseFile(str(e)) from e
+
+
+def read_json(target: str, default: dict) -> dict:
+    """
+    Reads a JSON document of the dataset directory, returning `default` when it
+    does not exist yet.
+    """
+    try:
+        with open(target, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return default
+
+
+def write_json(target: str, data: dict) -> None:
+    """
+    Atomically replaces a JSON document of the dataset directory.
+    """
+    directory = path.dirname(target)
+    descriptor, temporary = mkstemp(prefix=f"{path.basename(target)}.", suffix=".tmp", dir=directory)
+
+    with open(descriptor, "w", encoding="utf-8") as file:
+        json.dump(data, file)
+        file.flush()
+        fsync(file.fileno())
+
+    replace(temporary, target)
+    fsync_dir(directory)
+
+
+def _read_state() -> dict:
+    """
+    Reads the generation file, returning generation 0 when there is none yet.
+    """
+    return read_json(GENERATION_FILE, {"generation": 0, "tables": {}})
+
+
+def bump_generation(name: str, **details) -> int:
+    """
+    Increments the dataset generation after a table changed.
+
+    The caller must hold the dataset lock (see `DatasetLock`).
+
+    Args:
+        name (str): The table that changed.
+        **details: Extra metadata stored for that table (e.g. its hash).
+
+    Returns:
+        int: The new generation.
+    """
+    state = _read_state()
+    state["generation"] += 1
+    state["tables"][name] = {"generation": state["generation"], **details}
+    write_json(GENERATION_FILE, state)
+
+    return state["generation"]
+
+
+class DatasetLock:
+    """
+    Context manager holding the inter-process lock that serializes every change to
+    the live tables and to the generation file.
+    """
+
+    def __enter__(self) -> "DatasetLock":
+        makedirs(DB_DIR, exist_ok=True)
+        self._file = open(LOCK_FILE, "a+b")
+        flock(self._file.fileno(), LOCK_EX)
+        return self
+
+    def __exit__(self, *args) -> None:
+        flock(self._file.fileno(), LOCK_UN)
+        self._file.close()
+
+
+def promote(staged: str, name: str, **details) -> int:
+    """
+    Validates a staged table and atomically promotes it to the live dataset.
+
+    Args:
+        staged (str): The path of the staged file.
+        name (str): The table it replaces (see `table_name`).
+        **details: Extra metadata recorded for the table in the generation file.
+
+    Returns:
+        int: The generation that contains the new table.
+
+    Raises:
+        InvalidDatabaseFile: If the staged file is not a valid DBF table.
+    """
+    try:
+        records = validate_table(staged)
+
+        with DatasetLock():
+            replace(staged, table_path(name))
+            fsync_dir(DB_DIR)
+
+            return bump_generation(name, records=records, **details)
+
+    finally:
+        if path.exists(staged):
+            remove(staged)
+
+
+def current_state() -> dict:
+    """
+    Returns the contents of the generation file. The file is only re-read when
+    its `stat()` signature changes.
+    """
+    try:
+        info = stat(GENERATION_FILE)
+        key = (info.st_ino, info.st_mtime_ns, info.st_size)
+    except FileNotFoundError:
+        key = None
+
+    if _cache["key"] != key:
+        with _cache_lock:
+            if _cache["key"] != key:
+                _cache["state"] = _read_state()
+                _cache["key"] = key
+
+    return _cache["state"]
+
+
+def current_generation() -> int:
+    """
+    Returns the current dataset generation (0 until the first promotion).
+    """
+    return current_state()["generation"]
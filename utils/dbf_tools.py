@@ -0,0 +1,345 @@
+"""
+This module provides `DBFReader`, a read-only, memory-mapped reader for the DBF tables
+of the system (`alumnos.dbf`, `cargas.dbf`, `asignaturas.dbf` and `HISTORIALES.dbf`).
+
+DBF records are fixed-width, so the file is memory-mapped and viewed as a NumPy
+structured array: every column is a zero-copy view over the file, and decoding is
+done for a whole column at once, only when that column is first requested.
+
+Key Features:
+- Zero-copy access to the raw bytes of any column (`raw`).
+- Lazy, vectorized decoding of character (`text`) and numeric (`numbers`) columns.
+- Python values compatible with the `dbf` library (`column`, `rows`): stripped
+  strings, ints/floats, None for blank numbers, booleans and dates.
+- Vectorized grouping of the rows by a column (`group_by`).
+- Selection of a range of a character column on the raw bytes (`between`), before
+  anything is decoded.
+- Deleted records are skipped unless `include_deleted=True`.
+- Every map is counted in `dbf_opens_total` and timed in `dbf_read_duration_seconds`
+  (`utils.metrics_tools`).
+
+Usage:
+    with DBFReader(ALUMNO.__ctx__) as students:
+        enrollments = students.text("MATRICULA")
+"""
+
+import mmap
+from datetime import date
+from struct import unpack_from
+from time import perf_counter
+import numpy as np
+from dbf.tables import code_pages
+from utils.metrics_tools import DBF_OPENS, DBF_READS, table
+
+HEADER_SIZE = 32
+FIELD_SIZE = 32
+FIELD_TERMINATOR = 0x0D
+DELETED_FLAG = b"*"
+
+
+class DBFField:
+    """
+    Descriptor of a DBF column.
+
+    Attributes:
+        name (str): Name of the field (upper case).
+        type (str): DBF type code (C, N, F, L, D, ...).
+        length (int): Width of the field in bytes.
+        decimals (int): Number of decimal places of numeric fields.
+        offset (int): Offset of the field inside the record.
+    """
+
+    def __init__(self, name: str, type_: str, length: int, decimals: int, offset: int) -> None:
+        self.name = name
+        self.type = type_
+        self.length = length
+        self.decimals = decimals
+        self.offset = offset
+
+
+def read_header(buffer) -> tuple[int, int, int, str, list[DBFField]]:
+    """
+    Parses the header of a DBF file.
+
+    Args:
+        buffer: Any object supporting the buffer protocol with the file contents.
+
+    Returns:
+        tuple: (number of records, header length, record length, codec, fields).
+
+    Raises:
+        ValueError: If the header is malformed.
+    """
+    if len(buffer) < HEADER_SIZE + 1:
+        raise ValueError("The file is too small to be a DBF table")
+
+    records, header_length, record_length = unpack_from("<IHH", buffer, 4)
+    codec = code_pages.get(buffer[29], (None,))[0] or "ascii"
+
+    fields, offset, position = [], 1, HEADER_SIZE
+
+    while position < header_length and buffer[position] != FIELD_TERMINATOR:
+        if position + FIELD_SIZE > len(buffer):
+            raise ValueError("The field descriptors are truncated")
+
+        name = bytes(buffer[position:position + 11]).split(b"\x00")[0].decode("ascii").upper()
+        type_ = chr(buffer[position + 11])
+        length, decimals = buffer[position + 16], buffer[position + 17]
+
+        fields.append(DBFField(name, type_, length, decimals, offset))
+        offset += length
+        position += FIELD_SIZE
+
+    if not fields or offset != record_length:
+        raise ValueError("The field descriptors do not match the record length")
+
+    return records, header_length, record_length, codec, fields
+
+
+class DBFReader:
+    """
+    Read-only, memory-mapped view of a DBF table.
+
+    Attributes:
+        path (str): Path of the DBF file.
+        declared (int): Number of records declared by the header.
+        fields (dict[str, DBFField]): Field descriptors by name.
+        codec (str): Codec used to decode character fields.
+        records (np.ndarray): Structured array over the mapped records.
+        positions (np.ndarray): Physical record number of every row in `records`.
+    """
+
+    def __init__(self, path: str, include_deleted: bool = False) -> None:
+        """
+        Maps the file and builds the structured view over its records.
+
+        Args:
+            path (str): Path of the DBF file.
+            include_deleted (bool): Whether records flagged as deleted are kept.
+        """
+        self.path = path
+        started = perf_counter()
+        DBF_OPENS.labels(table=table(path), source="reader").inc()
+
+        with open(path, "rb") as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        records, header_length, record_length, self.codec, fields = read_header(self._mmap)
+        self.declared = records
+        self.fields = {field.name: field for field in fields}
+
+        available = max(len(self._mmap) - header_length, 0) // record_length
+        dtype = np.dtype({
+            "names": ["_DELETED"] + [field.name for field in fields],
+            "formats": ["S1"] + [f"S{field.length}" for field in fields],
+            "offsets": [0] + [field.offset for field in fields],
+            "itemsize": record_length,
+        })
+        self.records = np.frombuffer(
+            self._mmap, dtype=dtype, count=min(records, available), offset=header_length
+        )
+
+        self.positions = np.arange(len(self.records))
+
+        if not include_deleted:
+            live = self.records["_DELETED"] != DELETED_FLAG
+
+            if not live.all():
+                self.records = self.records[live]
+                self.positions = self.positions[live]
+
+        self._decoded = {}
+        DBF_READS.labels(table=table(path), operation="map").observe(perf_counter() - started)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __enter__(self) -> "DBFReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Drops the views over the file and unmaps it. Arrays handed out by `raw`
+        keep the mapping alive until they are released.
+        """
+        self.records = self.positions = None
+        self._decoded.clear()
+
+        try:
+            self._mmap.close()
+        except BufferError:
+            ...
+
+    def between(self, name: str, lower: str | None, upper: str | None) -> "DBFReader":
+        """
+        Narrows the reader to the rows whose character column is in [lower, upper) (a
+        missing bound is open). The bounds are compared with the raw, space-padded bytes
+        of the column, so nothing is decoded; only the selected rows are decoded later.
+
+        Args:
+            name (str): The character column (e.g. `MATRICULA`).
+            lower (str | None): First value of the range (inclusive).
+            upper (str | None): Last value of the range (exclusive).
+
+        Returns:
+            DBFReader: The reader itself.
+        """
+        if lower is None and upper is None:
+            return self
+
+        length = self.fields[name.upper()].length
+        raw = self.raw(name)
+        selected = np.ones(len(raw), dtype=bool)
+
+        if lower is not None:
+            selected &= raw >= lower.encode(self.codec).ljust(length)
+        if upper is not None:
+            selected &= raw < upper.encode(self.codec).ljust(length)
+
+        self.records = self.records[selected]
+        self.positions = self.positions[selected]
+        self._decoded.clear()
+
+        return self
+
+    def raw(self, name: str) -> np.ndarray:
+        """
+        Returns the undecoded bytes of a column as a zero-copy view.
+        """
+        return self.records[name.upper()]
+
+    def text(self, name: str, rows=None) -> np.ndarray:
+        """
+        Returns a character column decoded and stripped, as an array of `str`.
+        The column is decoded once and cached; with `rows` (indices or a slice), only
+        those rows are decoded, and they are not cached.
+        """
+        if rows is not None:
+            return self._text(self.raw(name)[rows])
+
+        key = ("text", name.upper())
+
+        if key not in self._decoded:
+            self._decoded[key] = self._text(self.raw(name))
+
+        return self._decoded[key]
+
+    def _text(self, raw: np.ndarray) -> np.ndarray:
+        return np.char.decode(np.char.strip(raw), self.codec, "replace")
+
+    def numbers(self, name: str, rows=None) -> np.ndarray:
+        """
+        Returns a numeric column as `float64`, with NaN for blank values.
+        The column is decoded once and cached; with `rows` (indices or a slice), only
+        those rows are decoded, and they are not cached.
+        """
+        if rows is not None:
+            return _numbers(self.raw(name)[rows])
+
+        key = ("numbers", name.upper())
+
+        if key not in self._decoded:
+            self._decoded[key] = _numbers(self.raw(name))
+
+        return self._decoded[key]
+
+    def column(self, name: str, rows=None) -> list:
+        """
+        Returns a column as a list of Python values, following the conventions of the
+        `dbf` library: stripped `str` for characters, `int`/`float` (None when blank)
+        for numbers, `bool` for logicals and `date` (None when blank) for dates. With
+        `rows` (indices or a slice), only those rows are decoded.
+        """
+        field = self.fields[name.upper()]
+
+        if field.type in "NF":
+            values = self.numbers(name, rows)
+            blank = np.isnan(values)
+
+            if field.decimals == 0 and field.type == "N":
+                return [None if empty else int(value) for value, empty in zip(values, blank)]
+            return [None if empty else float(value) for value, empty in zip(values, blank)]
+
+        if field.type == "L":
+            raw = self.raw(name) if rows is None else self.raw(name)[rows]
+            return np.isin(np.char.upper(raw), (b"T", b"Y")).tolist()
+
+        if field.type == "D":
+            return [_to_date(value) for value in self.text(name, rows)]
+
+        return self.text(name, rows).tolist()
+
+    def group_by(self, name: str) -> dict[str, np.ndarray]:
+        """
+        Groups the rows by the value of a character column in one vectorized pass.
+
+        Args:
+            name (str): The column to group by.
+
+        Returns:
+            dict[str, np.ndarray]: Row indices (in file order) for every distinct value.
+        """
+        keys = self.text(name)
+        order = np.argsort(keys, kind="stable")
+        unique, starts = np.unique(keys[order], return_index=True)
+        ends = np.append(starts[1:], len(order))
+
+        return {
+            key: order[start:end]
+            for key, start, end in zip(unique.tolist(), starts.tolist(), ends.tolist())
+        }
+
+    def rows(self, fields: list[str] | None = None):
+        """
+        Yields the records as dictionaries, decoding only the requested fields.
+
+        Args:
+            fields (list[str] | None): Fields to include (all of them by default).
+
+        Yields:
+            dict: One record per iteration.
+        """
+        names = [name.upper() for name in (fields or self.fields)]
+        columns = [self.column(name) for name in names]
+
+        for values in zip(*columns):
+            yield dict(zip(names, values))
+
+
+def _numbers(raw: np.ndarray) -> np.ndarray:
+    """
+    Decodes the raw bytes of a numeric column as `float64`, with NaN for blank values.
+    """
+    stripped = np.char.strip(raw)
+    blank = (stripped == b"") | (np.char.strip(stripped, b"*") == b"")
+
+    try:
+        values = np.where(blank, b"nan", stripped).astype(np.float64)
+    except ValueError:
+        values = np.array([_to_float(item) for item in stripped], dtype=np.float64)
+        values[blank] = np.nan
+
+    return values
+
+
+def _to_float(value: bytes) -> float:
+    """
+    Parses a single numeric value, returning NaN when it is not a number.
+    """
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+def _to_date(value: str) -> date | None:
+    """
+    Parses a `YYYYMMDD` date, returning None when it is blank or invalid.
+    """
+    try:
+        return date(int(value[:4]), int(value[4:6]), int(value[6:8]))
+    except ValueError:
+        return None
@@ -0,0 +1,103 @@
+"""
+This module provides the execution layer for the blocking data access of the API.
+
+The route handlers are `async def`, but the services read DBF files through `dbfmapper`,
+`dbf` and `DBFReader`, which block. Called directly, one slow disk read stalls every
+request of the uvicorn worker. `run_blocking` moves that work off the event loop:
+- It runs in a bounded thread pool (`Config.DATA_WORKERS` threads) shared by the routes.
+- Each route may only use `Config.ROUTE_CONCURRENCY` threads at once, so a burst on one
+  endpoint (e.g. the academic loads on result-release day) can not starve the others.
+- Waiting for a slot plus running the work is bounded by `Config.DATA_TIMEOUT` seconds;
+  past that, the request fails fast with `ServiceTimeout` (503). A thread can not be
+  interrupted, so work that timed out keeps its slot until it actually finishes: the
+  limit of the route bounds the threads that run, not only the requests that wait.
+- The context variables of the request (e.g. the logging context) are propagated to the
+  worker thread.
+- If the request is being profiled (`utils.profile_tools`), the work is profiled in the
+  worker thread too.
+
+Usage:
+    student = await run_blocking("get_student", student_services.get_student, enrollment)
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from functools import partial
+from typing import Any, Callable
+from errors.errors import ServiceTimeout
+from utils.config_secrets import Config
+from utils.profile_tools import profiling
+
+executor = ThreadPoolExecutor(max_workers=Config.DATA_WORKERS, thread_name_prefix="data")
+
+_limits: dict[str, asyncio.Semaphore] = {}
+
+
+def route_limit(route: str) -> asyncio.Semaphore:
+    """
+    Returns the semaphore that bounds the concurrent data access of a route.
+    """
+    limit = _limits.get(route)
+
+    if limit is None:
+        limit = _limits[route] = asyncio.Semaphore(Config.ROUTE_CONCURRENCY)
+    return limit
+
+
+async def _submit(route: str, func: Callable, *args, **kwargs) -> asyncio.Future:
+    """
+    Waits for a slot of the route and submits the function to the pool.
+
+    Returns:
+        asyncio.Future: The future of the work; the slot is released when it finishes.
+    """
+    limit = route_limit(route)
+    await limit.acquire()
+
+    try:
+        context = copy_context()
+        session = profiling.get()
+
+        if session is not None:
+            func = session.wrap(func)
+
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, partial(context.run, func, *args, **kwargs)
+        )
+    except BaseException:
+        limit.release()
+        raise
+
+    future.add_done_callback(lambda _: limit.release())
+    return future
+
+
+async def run_blocking(
+        route: str, func: Callable, *args, timeout: float | None = None, **kwargs
+) -> Any:
+    """
+    Runs blocking data access off the event loop.
+
+    Args:
+        route (str): Name of the route, used for its concurrency limit.
+        func (Callable): The blocking function (typically a service method).
+        *args: Positional arguments of the function.
+        timeout (float | None): Seconds to wait (`Config.DATA_TIMEOUT` by default).
+        **kwargs: Keyword arguments of the function.
+
+    Returns:
+        Any: The result of the function. Its exceptions are raised unchanged.
+
+    Raises:
+        ServiceTimeout: If the function did not finish in time.
+    """
+    loop = asyncio.get_running_loop()
+    timeout = Config.DATA_TIMEOUT if timeout is None else timeout
+    deadline = loop.time() + timeout
+
+    try:
+        future = await asyncio.wait_for(_submit(route, func, *args, **kwargs), timeout)
+        return await asyncio.wait_for(asyncio.shield(future), max(deadline - loop.time(), 0))
+    except asyncio.TimeoutError as e:
+        raise ServiceTimeout() from e
@@ -0,0 +1,251 @@
+"""
+This module provides a vectorized grading engine: the `Ratings` rules of
+`utils.rating_tools`, applied to the columns of a whole grade, group or school at once.
+
+Instead of one `Ratings` object per student, with string-keyed lookups and "None"
+sentinel checks per subject, the engine takes NumPy arrays with one row per subject
+record and a group code per row (the student it belongs to), and computes:
+- The word equivalent (`PALABRA`) and status (`OBSERVA`) of every record.
+- The rounded semiannual average of every record (`PROMEDIO`, semiannual only).
+- The absence total (`TOTAL_FALTAS`) and final average (`PROMEDIO_FINAL`) of every student.
+
+Missing grades are NaN (as returned by `DBFReader.numbers`, or by `to_numbers` for the
+"None" sentinel of the model layer).
+
+Parity with `Ratings`:
+- Averages are formatted with the same `f"{value:.2f}"` rounding and `round()` calls,
+  applied once per distinct value (`np.unique`), so results are identical.
+- Every student gets a status telling what `Ratings` would do with their records:
+  `GRADED`, `INCOMPLETE` (it raises `InvalidTimePeriod`), `NO_DATA` (no records) or
+  `INVALID` (it fails on a grade that has no word equivalent or a missing absence count).
+  `BatchGrades.details` returns the same `DETALLES` or raises the same exception.
+
+Usage:
+    codes, students = group_codes(matriculas)
+    grades = grade_partials(codes, len(students), partial_1, faults_1)
+    grades.details(index)  # DETALLES of students[index]
+"""
+
+import numpy as np
+from errors.errors import InvalidTimePeriod, ServerError
+
+GRADED, INCOMPLETE, NO_DATA, INVALID = 0, 1, 2, 3
+
+WORDS = np.array(
+    ["CERO", "UNO", "DOS", "TRES", "CUATRO", "CINCO", "SEIS", "SIETE", "OCHO", "NUEVE", "DIEZ"],
+    dtype=object
+)
+OBSERVATIONS = np.array(["REPROBADO"] * 6 + ["APROBADO"] * 5, dtype=object)
+
+
+def to_numbers(values: list[str]) -> np.ndarray:
+    """
+    Converts grades of the model layer ("8.0", "None") to a float array with NaN
+    for missing values.
+    """
+    return np.array([np.nan if value == "None" else float(value) for value in values])
+
+
+def group_codes(keys) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Assigns a group code to every row from its key (e.g. `MATRICULA`).
+
+    Returns:
+        tuple[np.ndarray, np.ndarray]: The code of every row and the key of every code.
+    """
+    groups, codes = np.unique(np.asarray(keys), return_inverse=True)
+    return codes, groups
+
+
+def _format(values: np.ndarray, convert) -> np.ndarray:
+    """
+    Applies a Python conversion once per distinct value of an array.
+    """
+    if values.size == 0:
+        return values.astype(object)
+
+    distinct, inverse = np.unique(values, return_inverse=True)
+    return np.array([convert(value) for value in distinct.tolist()], dtype=object)[inverse]
+
+
+def _first(codes: np.ndarray, rows: np.ndarray, count: int) -> np.ndarray:
+    """
+    Returns, for every group, the index of its first row selected by `rows` (or the
+    number of rows when there is none).
+    """
+    first = np.full(count, len(codes), dtype=np.int64)
+    np.minimum.at(first, codes[rows], np.flatnonzero(rows))
+    return first
+
+
+class BatchGrades:
+    """
+    Grades of many students, computed at once.
+
+    Attributes:
+        partial (int): The partial graded (1, 2, 3, or 6 for semiannual).
+        status (np.ndarray): `GRADED`, `INCOMPLETE`, `NO_DATA` or `INVALID` per student.
+        final_average (np.ndarray): `PROMEDIO_FINAL` per student (None if not graded).
+        total_faults (np.ndarray | None): `TOTAL_FALTAS` per student (partials only).
+        words (np.ndarray): `PALABRA` per record (None if it has no grade).
+        observations (np.ndarray): `OBSERVA` per record (None if it has no grade).
+        averages (np.ndarray | None): `PROMEDIO` per record (semiannual only).
+    """
+
+    def __init__(self, partial: int, status, final_average, total_faults, words, observations,
+                 averages=None) -> None:
+        self.partial = partial
+        self.status = status
+        self.final_average = final_average
+        self.total_faults = total_faults
+        self.words = words
+        self.observations = observations
+        self.averages = averages
+
+    def details(self, student: int) -> dict:
+        """
+        Returns the `DETALLES` of a student, exactly as `Ratings` computes them.
+
+        Args:
+            student (int): The group code of the student.
+
+        Returns:
+            dict: The `TOTAL_FALTAS` (partials) and `PROMEDIO_FINAL` of the student.
+
+        Raises:
+            InvalidTimePeriod: If `Ratings` would reject the student's records.
+            ServerError: If `Ratings` would fail on them.
+        """
+        status = self.status[student]
+
+        if status == INCOMPLETE:
+            if self.partial == 6:
+                raise InvalidTimePeriod("You have not completed the three partials 🕓️")
+            raise InvalidTimePeriod()
+
+        if status == NO_DATA:
+            if self.partial == 6:
+                raise InvalidTimePeriod("There is no data on that history. 📋️")
+            raise InvalidTimePeriod()
+
+        if status == INVALID:
+            raise ServerError("Invalid grades on the academic record")
+
+        if self.partial == 6:
+            return {"PROMEDIO_FINAL": self.final_average[student]}
+
+        return {
+            "TOTAL_FALTAS": int(self.total_faults[student]),
+            "PROMEDIO_FINAL": self.final_average[student],
+        }
+
+
+def grade_partials(
+        codes: np.ndarray, count: int, grades: np.ndarray, faults: np.ndarray | None = None,
+        partial: int = 1
+) -> BatchGrades:
+    """
+    Grades one partial of many students (`Ratings._calculate_partials`).
+
+    Args:
+        codes (np.ndarray): The group code (student) of every record.
+        count (int): The number of students.
+        grades (np.ndarray): The grade of the partial of every record (NaN if missing).
+        faults (np.ndarray | None): The absences of every record (NaN if missing);
+        None for records without absences (e.g. histories), counted as 0.
+        partial (int): The partial graded (1 to 3).
+
+    Returns:
+        BatchGrades: The grades of every student and record.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    grades = np.asarray(grades, dtype=np.float64)
+    faults = np.zeros(len(grades)) if faults is None else np.asarray(faults, dtype=np.float64)
+
+    missing = np.isnan(grades)
+    known = (~missing) & (grades >= 0) & (grades <= 10) & (grades == np.floor(grades))
+    broken = (~missing) & ~known | known & np.isnan(faults)
+
+    # Ratings stops at the first record it can not grade: the kind of that record decides.
+    first_missing = _first(codes, missing, count)
+    first_broken = _first(codes, broken, count)
+    rows = np.bincount(codes, minlength=count)
+
+    status = np.full(count, GRADED, dtype=np.int8)
+    status[first_broken < first_missing] = INVALID
+    status[first_missing < first_broken] = INCOMPLETE
+    status[rows == 0] = NO_DATA
+
+    index = np.where(known, grades, 0).astype(np.int64)
+    words = np.where(known, WORDS[index], None)
+    observations = np.where(known, OBSERVATIONS[index], None)
+
+    graded = status == GRADED
+    totals = np.bincount(codes, weights=np.where(known, grades, 0), minlength=count)
+    total_faults = np.bincount(
+        codes, weights=np.where(known, np.nan_to_num(faults), 0), minlength=count
+    ).astype(np.int64)
+
+    final_average = np.full(count, None, dtype=object)
+    final_average[graded] = _format(
+        totals[graded] / rows[graded], lambda value: float(f"{value:.2f}")
+    )
+
+    return BatchGrades(partial, status, final_average, total_faults, words, observations)
+
+
+def grade_semiannual(
+        codes: np.ndarray, count: int, first: np.ndarray, second: np.ndarray, third: np.ndarray
+) -> BatchGrades:
+    """
+    Grades the semester of many students (`Ratings._calculate_semiannual`).
+
+    Args:
+        codes (np.ndarray): The group code (student) of every record.
+        count (int): The number of students.
+        first (np.ndarray): The grades of the first partial (NaN if missing).
+        second (np.ndarray): The grades of the second partial (NaN if missing).
+        third (np.ndarray): The grades of the third partial (NaN if missing).
+
+    Returns:
+        BatchGrades: The grades of every student and record.
+    """
+    codes = np.asarray(codes, dtype=np.int64)
+    sums = (
+        np.asarray(first, dtype=np.float64) + np.asarray(second, dtype=np.float64)
+        + np.asarray(third, dtype=np.float64)
+    )
+    missing = np.isnan(sums)
+
+    averages = np.full(len(sums), np.nan)
+    averages[~missing] = _format(
+        sums[~missing], lambda value: round(float(f"{value / 3:.2f}"))
+    ).astype(np.float64)
+    known = ~missing & (averages >= 0) & (averages <= 10)
+
+    # Ratings only checks the first record; a later missing grade makes it fail.
+    rows = np.bincount(codes, minlength=count)
+    heads = _first(codes, np.ones(len(codes), dtype=bool), count)
+    head_missing = np.zeros(count, dtype=bool)
+    head_missing[rows > 0] = missing[heads[rows > 0]]
+
+    status = np.full(count, GRADED, dtype=np.int8)
+    status[np.bincount(codes, weights=~known, minlength=count) > 0] = INVALID
+    status[head_missing] = INCOMPLETE
+    status[rows == 0] = NO_DATA
+
+    index = np.where(known, averages, 0).astype(np.int64)
+    words = np.where(known, WORDS[index], None)
+    observations = np.where(known, OBSERVATIONS[index], None)
+
+    graded = status == GRADED
+    totals = np.bincount(codes, weights=index, minlength=count)
+    final_average = np.full(count, None, dtype=object)
+    final_average[graded] = _format(
+        totals[graded] / rows[graded], lambda value: float(f"{value:.2f}")
+    )
+
+    return BatchGrades(
+        6, status, final_average, None, words, observations,
+        np.where(missing, None, np.nan_to_num(averages).astype(np.int64).astype(object))
+    )
@@ -0,0 +1,147 @@
+"""
+This module provides the token buckets of the rate limiter
+(`middlewares.rate_limit_middleware`).
+
+Every bucket holds up to `burst` tokens and is refilled at `rate` tokens per second; a
+request takes one token, or is rejected with the seconds it must wait for the next one.
+Buckets are identified by a key (e.g. "ip:10.0.0.7" or "curp:CAFA070122HCSBLNA2").
+
+Backends (`Config.RATE_LIMIT_BACKEND`):
+- "memory": `MemoryBuckets`, kept in the process (per uvicorn worker), bounded to
+  `max_keys` buckets in LRU order.
+- "redis": `RedisBuckets`, shared by every worker and server through `Config.URL_REDIS`.
+  A bucket is updated atomically by a Lua script and expires once it would be full again.
+- "none": no limits.
+
+Usage:
+    buckets = create_buckets()
+    wait = await buckets.take("ip:10.0.0.7", rate=5, burst=20)  # 0.0 when allowed
+"""
+
+from collections import OrderedDict
+from time import time
+from utils.config_secrets import Config
+
+TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local state = redis.call("HMGET", KEYS[1], "tokens", "updated")
+local tokens = tonumber(state[1]) or burst
+local updated = tonumber(state[2]) or now
+local wait = 0
+
+tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+
+redis.call("HSET", KEYS[1], "tokens", tostring(tokens), "updated", tostring(now))
+redis.call("PEXPIRE", KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+
+def refill(tokens: float, updated: float, now: float, rate: float, burst: float
+           ) -> tuple[float, float]:
+    """
+    Takes a token from a bucket (the same rule as `TAKE_SCRIPT`).
+
+    Returns:
+        tuple[float, float]: The tokens left and the seconds to wait (0 when allowed).
+    """
+    tokens = min(burst, tokens + max(0.0, now - updated) * rate)
+
+    if tokens >= 1:
+        return tokens - 1, 0.0
+    return tokens, (1 - tokens) / rate
+
+
+class MemoryBuckets:
+    """
+    Token buckets kept in the process.
+
+    Attributes:
+        max_keys (int): Maximum number of buckets; the least recently used is dropped
+        (which refills it).
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        """
+        Takes a token from a bucket.
+
+        Returns:
+            float: The seconds to wait for the next token (0 when allowed).
+        """
+        now = time()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens, wait = refill(tokens, updated, now, rate, burst)
+
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+
+        return wait
+
+
+class RedisBuckets:
+    """
+    Token buckets shared through Redis.
+
+    Attributes:
+        prefix (str): Prefix of the Redis keys of the buckets.
+    """
+
+    def __init__(self, client, prefix: str = "ratelimit:") -> None:
+        """
+        Args:
+            client: An asyncio Redis client (`redis.asyncio.Redis` or a compatible one).
+            prefix (str): Prefix of the Redis keys of the buckets.
+        """
+        self.prefix = prefix
+        self._take = client.register_script(TAKE_SCRIPT)
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        """
+        Takes a token from a bucket.
+
+        Returns:
+            float: The seconds to wait for the next token (0 when allowed).
+        """
+        wait = await self._take(keys=[self.prefix + key], args=[rate, burst, time()])
+        return float(wait)
+
+
+def create_buckets(backend: str | None = None) -> MemoryBuckets | RedisBuckets | None:
+    """
+    Creates the buckets of a backend ("memory", "redis" or "none").
+
+    Args:
+        backend (str | None): The backend (`Config.RATE_LIMIT_BACKEND` by default).
+
+    Returns:
+        MemoryBuckets | RedisBuckets | None: The buckets, or None without limits.
+    """
+    backend = backend or Config.RATE_LIMIT_BACKEND
+
+    if backend == "redis":
+        from redis.asyncio import Redis
+
+        return RedisBuckets(Redis.from_url(Config.URL_REDIS))
+
+    if backend == "memory":
+        return MemoryBuckets()
+
+    return None
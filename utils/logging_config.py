@@ -1,22 +1,122 @@
 """
 This module configures logging for the application, specifically setting up a logger
-to capture and store logs related to server operations and exceptions. The logs are stored
-in a rotating log file, ensuring that the file size does not grow beyond a set limit.
+to capture and store logs related to server operations and exceptions, and a logger for
+the access log of the HTTP requests. The logs are stored in rotating log files, ensuring
+that the file size does not grow beyond a set limit.
+
+Writing to the files never happens on the thread that logs: both loggers put their
+records on a queue (`QueueHandler`) and a background thread (`QueueListener`) formats and
+writes them. Logging on the event loop costs an enqueue instead of a blocking file write.
+
+Loggers:
+- `app_logger` ("server"): server operations and exceptions, in `server_exceptions.log`.
+- `access_logger` ("server.access"): one JSON document per request (see
+  `middlewares.logging_middleware`), in `server_access.log`. The document is passed
+  as the `access` attribute of the record and serialized by `AccessFormatter` on the
+  background thread, which also redacts the sensitive headers and query parameters.
 
 Dependencies:
 - logging: Standard library for logging functionality.
 - logging.handlers.RotatingFileHandler: A handler that writes logs to a file with rotation.
+- logging.handlers.QueueHandler and QueueListener: Hand the records to a background thread.
 """
 
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from queue import SimpleQueue
+from urllib.parse import parse_qsl, urlencode
+import orjson
+
+REDACTED = "[REDACTED]"
+REDACTED_HEADERS = frozenset({
+    "authorization", "proxy-authorization", "cookie", "set-cookie", "x-api-key", "x-profile",
+})
+REDACTED_PARAMS = frozenset({"access", "token", "password", "profile"})
 
 log_format = '%(asctime)s - %(levelname)s - %(message)s'
 formatter = logging.Formatter(log_format)
 
+
+def redact_headers(headers: list[tuple[bytes, bytes]]) -> dict[str, str]:
+    """
+    Decodes the raw headers of an ASGI scope, hiding the values of `REDACTED_HEADERS`.
+    """
+    redacted = {}
+
+    for name, value in headers:
+        name = name.decode("latin-1").lower()
+        redacted[name] = REDACTED if name in REDACTED_HEADERS else value.decode("latin-1")
+
+    return redacted
+
+
+def redact_query(query: bytes) -> str:
+    """
+    Decodes the raw query string of an ASGI scope, hiding the values of `REDACTED_PARAMS`.
+    """
+    if not query:
+        return ""
+
+    return urlencode([
+        (name, REDACTED if name.lower() in REDACTED_PARAMS else value)
+        for name, value in parse_qsl(query.decode("latin-1"), keep_blank_values=True)
+    ], safe="[]")
+
+
+class AccessFormatter(logging.Formatter):
+    """
+    Serializes the access document of a record as one JSON line.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        access = dict(getattr(record, "access", None) or {"message": record.getMessage()})
+
+        if "headers" in access:
+            access["headers"] = redact_headers(access["headers"])
+        if "query" in access:
+            access["query"] = redact_query(access["query"])
+
+        return orjson.dumps({
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            **access,
+        }).decode()
+
+
+class LoggerFilter(logging.Filter):
+    """
+    Passes the records of a logger (and its children), or every other record when
+    `exclude` is set.
+    """
+
+    def __init__(self, name: str, exclude: bool = False) -> None:
+        super().__init__(name)
+        self.exclude = exclude
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return super().filter(record) != self.exclude
+
+
 log_handler_app = RotatingFileHandler('server_exceptions.log', maxBytes=10 ** 6, backupCount=5)
 log_handler_app.setFormatter(formatter)
+log_handler_app.addFilter(LoggerFilter("server.access", exclude=True))
+
+log_handler_access = RotatingFileHandler('server_access.log', maxBytes=10 ** 7, backupCount=5)
+log_handler_access.setFormatter(AccessFormatter())
+log_handler_access.addFilter(LoggerFilter("server.access"))
+
+log_queue = SimpleQueue()
+log_listener = QueueListener(log_queue, log_handler_app, log_handler_access)
+log_listener.start()
+atexit.register(log_listener.stop)
 
 app_logger = logging.getLogger('server')
 app_logger.setLevel(logging.INFO)
-app_logger.addHandler(log_handler_app)
+app_logger.addHandler(QueueHandler(log_queue))
+
+access_logger = logging.getLogger('server.access')
+access_logger.setLevel(logging.INFO)
+access_logger.propagate = False
+access_logger.addHandler(QueueHandler(log_queue))
@@ -0,0 +1,106 @@
+"""
+This module defines the Prometheus metrics of the API and the registry `/metrics` exposes.
+
+Metrics:
+- `http_requests_total{method,route,status}`: Requests answered, by route template
+  (e.g. `/students/{enrollment}/loads`, "unmatched" when no route matched).
+- `http_request_duration_seconds{method,route}`: Latency histogram by route template.
+- `http_requests_in_flight`: Requests being processed.
+- `dbf_opens_total{table,source}`: DBF files opened by the model layer (`dbfmapper`,
+  one open per query) and by `DBFReader`.
+- `dbf_read_duration_seconds{table,operation}`: Duration of the model queries
+  (`get`, `get_all`, `save`) and of the `DBFReader` maps (`map`).
+- `api_errors_total{error_code,exception}`: Error responses by the `error_code` of
+  `errors.errors`.
+- `dbf_ingest_duration_seconds{table,stage}`: Duration of the stages of an upload
+  (`upload`, `promote`) and of the work it triggers (`snapshot`, `rebuild`, `materialize`).
+
+Multi-worker deployments (gunicorn): set `PROMETHEUS_MULTIPROC_DIR` to an empty directory
+shared by the workers (cleared before the server starts). Every worker then writes its
+values to memory-mapped files and `/metrics` aggregates them all; the in-flight gauge
+adds up the live workers. The server should call `mark_process_dead(worker.pid)` when a
+worker exits (gunicorn's `child_exit` hook). Without the variable, the metrics are those
+of the process.
+
+Updating a metric is a dictionary lookup and an add under a lock, so they can stay on
+in production.
+"""
+
+from contextlib import contextmanager
+from os import environ, path
+from time import perf_counter
+from prometheus_client import (
+    CollectorRegistry, Counter, Gauge, Histogram, CONTENT_TYPE_LATEST, REGISTRY,
+    generate_latest, multiprocess
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+REQUESTS = Counter(
+    "http_requests_total", "HTTP requests answered.", ["method", "route", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ["method", "route"],
+    buckets=LATENCY_BUCKETS
+)
+IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests being processed.", multiprocess_mode="livesum"
+)
+DBF_OPENS = Counter("dbf_opens_total", "DBF files opened.", ["table", "source"])
+DBF_READS = Histogram(
+    "dbf_read_duration_seconds", "Duration of the DBF reads.", ["table", "operation"],
+    buckets=LATENCY_BUCKETS
+)
+ERRORS = Counter("api_errors_total", "Error responses.", ["error_code", "exception"])
+INGEST = Histogram(
+    "dbf_ingest_duration_seconds", "Duration of the stages of a DBF upload.",
+    ["table", "stage"], buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+)
+
+
+def registry() -> CollectorRegistry:
+    """
+    Returns the registry to expose: the aggregate of every worker in multiprocess mode,
+    or the registry of the process.
+    """
+    if environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        collector = CollectorRegistry()
+        multiprocess.MultiProcessCollector(collector)
+        return collector
+    return REGISTRY
+
+
+def exposition() -> tuple[bytes, str]:
+    """
+    Returns the metrics in the Prometheus text format, with its content type.
+    """
+    return generate_latest(registry()), CONTENT_TYPE_LATEST
+
+
+def table(file: str) -> str:
+    """
+    Returns the label of a DBF file: its name, without the suffix of a staged upload.
+    """
+    name = path.basename(file)
+    end = name.lower().find(".dbf")
+    return name if end < 0 else name[:end + 4]
+
+
+@contextmanager
+def timed(histogram: Histogram, **labels):
+    """
+    Observes the duration of a block in a histogram, even if it raises.
+    """
+    started = perf_counter()
+
+    try:
+        yield
+    finally:
+        histogram.labels(**labels).observe(perf_counter() - started)
+
+
+def count_error(exc) -> None:
+    """
+    Counts an error response of a `ServerBaseException`.
+    """
+    ERRORS.labels(error_code=str(exc.error_code), exception=type(exc).__name__).inc()
@@ -0,0 +1,167 @@
+"""
+This module renders the report cards (boletas) of the school as PDF documents.
+
+The pages are described by Jinja2 templates (`templates/`) that emit PDF content stream
+operators (text and rules); `build_pdf` wraps them into a minimal PDF 1.4 file with the
+standard Helvetica fonts, which every reader provides, so nothing is embedded and the
+documents are a few kilobytes each.
+
+Everything that does not depend on the student is cached per process:
+- The Jinja2 environment and the parsed templates (`template`).
+- The font objects of the page resources (`font_objects`).
+
+So a worker of the rendering pool (`services.boleta_services`) parses them once and then
+only fills in the data of every student.
+
+Usage:
+    document = render("boleta.j2", context)  # bytes of the PDF
+"""
+
+import zlib
+from functools import lru_cache
+from os import path
+from jinja2 import Environment, FileSystemLoader, StrictUndefined, Template
+
+TEMPLATES = path.abspath(path.join(path.dirname(__file__), "../templates"))
+
+PAGE_SIZE = (612, 792)
+
+FONTS = {"F1": "Helvetica", "F2": "Helvetica-Bold"}
+
+
+def escape(value) -> str:
+    """
+    Escapes a value for a PDF string literal (`(...)`).
+    """
+    text = "" if value is None else str(value)
+    return (
+        text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+        .replace("\r", " ").replace("\n", " ")
+    )
+
+
+@lru_cache(maxsize=1)
+def environment() -> Environment:
+    """
+    Returns the Jinja2 environment of the PDF templates (one per process).
+    """
+    env = Environment(
+        loader=FileSystemLoader(TEMPLATES), autoescape=False, undefined=StrictUndefined,
+        trim_blocks=True, lstrip_blocks=True
+    )
+    env.filters["pdf"] = escape
+    return env
+
+
+@lru_cache(maxsize=None)
+def template(name: str) -> Template:
+    """
+    Returns a parsed template, loaded once per process.
+    """
+    return environment().get_template(name)
+
+
+@lru_cache(maxsize=1)
+def font_objects() -> tuple[bytes, ...]:
+    """
+    Returns the font objects of the page resources (WinAnsi encoded), built once per process.
+    """
+    return tuple(
+        f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} /Encoding /WinAnsiEncoding >>".encode()
+        for font in FONTS.values()
+    )
+
+
+def build_pdf(pages: list[bytes]) -> bytes:
+    """
+    Builds a PDF document from the content streams of its pages.
+
+    Args:
+        pages (list[bytes]): The content stream (PDF operators) of every page.
+
+    Returns:
+        bytes: The PDF file.
+    """
+    fonts = font_objects()
+    first_font = 3
+    first_page = first_font + len(fonts)
+    kids = " ".join(f"{first_page + 2 * index} 0 R" for index in range(len(pages)))
+    resources = " ".join(
+        f"/{name} {first_font + index} 0 R" for index, name in enumerate(FONTS)
+    )
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode(),
+        *fonts,
+    ]
+
+    for index, content in enumerate(pages):
+        stream = zlib.compress(content)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_SIZE[0]} {PAGE_SIZE[1]}] "
+            f"/Resources << /Font << {resources} >> >> "
+            f"/Contents {first_page + 2 * index + 1} 0 R >>".encode()
+        )
+        objects.append(
+            f"<< /Length {len(stream)} /Filter /FlateDecode >>\nstream\n".encode()
+            + stream + b"\nendstream"
+        )
+
+    output = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    output += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+
+    return bytes(output)
+
+
+def render(name: str, context: dict, rows_per_page: int = 24) -> bytes:
+    """
+    Renders a PDF document from a template.
+
+    The `rows` of the context are split in pages of `rows_per_page`; the template is
+    rendered once per page with `rows`, `page` and `pages`.
+
+    Args:
+        name (str): The template (in `templates/`).
+        context (dict): The data of the document.
+        rows_per_page (int): The table rows that fit in a page.
+
+    Returns:
+        bytes: The PDF file.
+    """
+    rows = context.get("rows", [])
+    chunks = [rows[start:start + rows_per_page] for start in range(0, len(rows), rows_per_page)]
+    chunks = chunks or [[]]
+    page = template(name)
+
+    return build_pdf([
+        page.render(
+            {**context, "rows": chunk, "page": number, "pages": len(chunks)}
+        ).encode("cp1252", errors="replace")
+        for number, chunk in enumerate(chunks, 1)
+    ])
+
+
+def render_batch(name: str, documents: list[tuple[str, dict]]) -> list[tuple[str, bytes]]:
+    """
+    Renders many documents with the same template (the unit of work of the rendering pool).
+
+    Args:
+        name (str): The template (in `templates/`).
+        documents (list[tuple[str, dict]]): The file name and context of every document.
+
+    Returns:
+        list[tuple[str, bytes]]: The file name and PDF of every document, in order.
+    """
+    return [(file_name, render(name, context)) for file_name, context in documents]
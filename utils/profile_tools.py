@@ -0,0 +1,143 @@
+"""
+This module provides the on-demand profiling of single requests.
+
+A request the administration asks to profile (see `middlewares.profiling_middleware`)
+gets a `ProfileSession` in the `profiling` context variable. The session runs the
+deterministic profiler of the standard library (`cProfile`):
+- On the event loop, around the whole request.
+- In the worker thread of every blocking call the request makes through
+  `utils.executor_tools.run_blocking` (the context variable is copied to the thread),
+  which is where the DBF reads, `Ratings`, `_merge_topics` and `to_repr()` run.
+
+When the request ends, the profiles are merged and stored under the ID of the session
+in `PROFILE_DIR`: the `pstats` dump (`<id>.pstats`, for `pstats`, snakeviz, etc.) and a
+text report sorted by cumulative time (`<id>.txt`). Only the last `Config.PROFILE_KEEP`
+sessions are kept.
+
+The event loop serves other requests while the profiled one awaits, so their time on
+the loop may show up in its profile; only one request is profiled at a time.
+
+Without a session (the normal case), `run_blocking` only reads the context variable.
+"""
+
+import cProfile
+import pstats
+from contextlib import contextmanager
+from contextvars import ContextVar
+from io import StringIO
+from os import listdir, makedirs, path, remove
+from threading import Lock
+from typing import Callable
+from uuid import uuid4
+from utils.config_secrets import Config
+
+PROFILE_DIR = path.abspath(path.join(path.dirname(__file__), "../profiles"))
+REPORT_LINES = 80
+FORMATS = {"pstats": "application/octet-stream", "txt": "text/plain; charset=utf-8"}
+
+profiling: ContextVar["ProfileSession | None"] = ContextVar("profiling", default=None)
+
+_active = Lock()
+
+
+class ProfileSession:
+    """
+    Profiles of one request, collected from every thread it ran on.
+
+    Attributes:
+        id (str): The ID the outputs are stored under.
+    """
+
+    def __init__(self) -> None:
+        self.id = uuid4().hex
+        self._profiles: list[cProfile.Profile] = []
+        self._lock = Lock()
+
+    @contextmanager
+    def profile(self):
+        """
+        Profiles a block on the current thread.
+        """
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        try:
+            yield
+        finally:
+            profiler.disable()
+
+            with self._lock:
+                self._profiles.append(profiler)
+
+    def wrap(self, func: Callable) -> Callable:
+        """
+        Returns the function profiled in the thread it runs on.
+        """
+        def profiled(*args, **kwargs):
+            with self.profile():
+                return func(*args, **kwargs)
+
+        return profiled
+
+    def save(self) -> str | None:
+        """
+        Merges the profiles and stores the `pstats` dump and the text report.
+
+        Returns:
+            str | None: The ID of the session, or None if nothing was profiled.
+        """
+        if not self._profiles:
+            return None
+
+        makedirs(PROFILE_DIR, exist_ok=True)
+        report = StringIO()
+        stats = pstats.Stats(*self._profiles, stream=report)
+        stats.dump_stats(output_path(self.id, "pstats"))
+        stats.sort_stats("cumulative").print_stats(REPORT_LINES)
+
+        with open(output_path(self.id, "txt"), "w", encoding="utf-8") as file:
+            file.write(report.getvalue())
+
+        prune(Config.PROFILE_KEEP)
+        return self.id
+
+
+def start() -> ProfileSession | None:
+    """
+    Starts a session, or returns None if another request is being profiled.
+    """
+    return ProfileSession() if _active.acquire(blocking=False) else None
+
+
+def finish(session: ProfileSession) -> str | None:
+    """
+    Stores the outputs of a session and lets another request be profiled.
+    """
+    try:
+        return session.save()
+    finally:
+        _active.release()
+
+
+def output_path(profile_id: str, output_format: str) -> str:
+    """
+    Returns the path of an output of a session.
+    """
+    return path.join(PROFILE_DIR, f"{profile_id}.{output_format}")
+
+
+def prune(keep: int) -> None:
+    """
+    Removes the outputs of every session but the last `keep`.
+    """
+    files = sorted(
+        (path.getmtime(path.join(PROFILE_DIR, name)), name) for name in listdir(PROFILE_DIR)
+    )
+    sessions = list(dict.fromkeys(path.splitext(name)[0] for _, name in files))
+
+    for profile_id in sessions[:max(len(sessions) - keep, 0)]:
+        for output_format in FORMATS:
+            try:
+                remove(output_path(profile_id, output_format))
+            except FileNotFoundError:
+                ...
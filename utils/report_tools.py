@@ -0,0 +1,256 @@
+"""
+This module provides the on-disk store of materialized report cards (boletas).
+
+Every response body of the student, load and history endpoints is precomputed at ingest
+(see `services.report_services`) and written to a single file per dataset generation,
+`db/reports/<generation>.rpt`, which every worker memory-maps:
+
+    +--------+----------------+-----------------------+----------------+----------------------+
+    | "RPT2" | count (uint32) | index offset (uint64) | bodies (bytes) | index: count entries |
+    +--------+----------------+-----------------------+----------------+----------------------+
+
+The index entries are fixed-size (key, offset, length) records sorted by key, so a
+lookup is a binary search (`np.searchsorted`) over the mapped index and a slice of the
+mapped bodies. No document is parsed or copied until it is served.
+
+The bodies are streamed to the file as they are computed and the index, sorted, is
+written at the end, so writing a store only keeps the index entries in memory.
+
+A key packs the route, the enrollment, the partial and the rank of a request (see
+`report_key`). The store of a generation is only used while that generation is the
+current one; with no store for the current generation, every lookup misses and the
+endpoints compute the response as usual.
+"""
+
+import mmap
+from os import path, makedirs, listdir, remove, replace, fsync, stat
+from threading import Lock
+from typing import Callable, Iterable
+import numpy as np
+from utils.dataset_tools import DB_DIR, staging_file, fsync_dir, current_generation
+
+REPORTS_DIR = path.join(DB_DIR, "reports")
+MAGIC = b"RPT2"
+PREFIX_SIZE = 16
+INDEX_BLOCK = 65536
+INDEX_DTYPE = np.dtype([("key", "S18"), ("offset", "<u8"), ("length", "<u4")])
+
+# One character per materialized endpoint, used as the first byte of the keys.
+ROUTES = {
+    "get_student": "s",
+    "get_academic_load": "l",
+    "get_semiannual_academic_load": "L",
+    "get_academic_histories": "h",
+    "get_semiannual_academic_histories": "H",
+}
+
+
+def report_key(route: str, enrollment: str, partial: int | None, rank: int | None) -> bytes | None:
+    """
+    Packs the arguments of a request into a store key.
+
+    Args:
+        route (str): Name of the endpoint.
+        enrollment (str): The student's enrollment number (MATRICULA).
+        partial (int | None): The partial of the request, if any.
+        rank (int | None): The rank (grade) of the request, if any.
+
+    Returns:
+        bytes | None: The key, or None if the request can not be materialized.
+    """
+    code = ROUTES.get(route)
+
+    if code is None or enrollment is None or len(enrollment) != 15:
+        return None
+
+    return f"{code}{enrollment}{'-' if partial is None else partial}{'-' if rank is None else rank}".encode()
+
+
+def report_path(generation: int) -> str:
+    """
+    Returns the path of the store of a generation.
+    """
+    return path.join(REPORTS_DIR, f"{generation}.rpt")
+
+
+def report_signature(generation: int) -> tuple | None:
+    """
+    Returns the (inode, mtime, size) signature of the store of a generation, or None
+    if it does not exist.
+    """
+    try:
+        info = stat(report_path(generation))
+    except FileNotFoundError:
+        return None
+
+    return info.st_ino, info.st_mtime_ns, info.st_size
+
+
+def write_reports(
+        generation: int, documents: Iterable[tuple[bytes, bytes]] | dict[bytes, bytes],
+        still_current: Callable[[], bool] | None = None
+) -> int | None:
+    """
+    Writes the store of a generation atomically and removes the stores of older ones
+    (never the store of a newer generation another process may have just written).
+
+    Args:
+        generation (int): The dataset generation the documents were computed from.
+        documents (Iterable[tuple[bytes, bytes]] | dict[bytes, bytes]): (`report_key`,
+        response body) pairs, e.g. a generator; every key must be unique.
+        still_current (Callable[[], bool] | None): Checked before the store is promoted;
+        if it returns False, the store is discarded.
+
+    Returns:
+        int | None: The number of documents stored, or None if the store was discarded.
+    """
+    if isinstance(documents, dict):
+        documents = documents.items()
+
+    makedirs(REPORTS_DIR, exist_ok=True)
+    staged = staging_file(f"{generation}.rpt")
+    blocks, block = [], []
+    target = report_path(generation)
+
+    try:
+        with open(staged, "wb") as file:
+            file.write(bytes(PREFIX_SIZE))
+            offset = PREFIX_SIZE
+
+            for key, body in documents:
+                file.write(body)
+                block.append((key, offset, len(body)))
+                offset += len(body)
+
+                if len(block) == INDEX_BLOCK:
+                    blocks.append(np.array(block, dtype=INDEX_DTYPE))
+                    block = []
+
+            blocks.append(np.array(block, dtype=INDEX_DTYPE))
+            index = np.concatenate(blocks)
+            del blocks, block
+            index = index[np.argsort(index["key"], kind="stable")]
+            file.write(index.tobytes())
+
+            file.seek(0)
+            file.write(MAGIC + len(index).to_bytes(4, "little") + offset.to_bytes(8, "little"))
+            file.flush()
+            fsync(file.fileno())
+
+        if still_current is not None and not still_current():
+            return None
+
+        replace(staged, target)
+        fsync_dir(REPORTS_DIR)
+
+    finally:
+        if path.exists(staged):
+            remove(staged)
+
+    for name in listdir(REPORTS_DIR):
+        stem = name.removesuffix(".rpt")
+
+        if name.endswith(".rpt") and stem.isdigit() and int(stem) < generation:
+            try:
+                remove(path.join(REPORTS_DIR, name))
+            except FileNotFoundError:
+                pass
+
+    return len(index)
+
+
+class ReportFile:
+    """
+    Memory-mapped store of one generation.
+
+    Attributes:
+        generation (int): The dataset generation of the store.
+        index (np.ndarray): The sorted (key, offset, length) entries, mapped from the file.
+    """
+
+    def __init__(self, generation: int) -> None:
+        self.generation = generation
+
+        with open(report_path(generation), "rb") as file:
+            self._buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._buffer[:4] != MAGIC:
+            self._buffer.close()
+            raise ValueError(f"{report_path(generation)} is not a report store")
+
+        count = int.from_bytes(self._buffer[4:8], "little")
+        offset = int.from_bytes(self._buffer[8:PREFIX_SIZE], "little")
+        self.index = np.frombuffer(self._buffer, dtype=INDEX_DTYPE, count=count, offset=offset)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def get(self, key: bytes) -> bytes | None:
+        """
+        Returns the body stored under `key`, or None.
+        """
+        position = int(np.searchsorted(self.index["key"], key))
+
+        if position == len(self.index) or self.index["key"][position] != key:
+            return None
+
+        _, offset, length = self.index[position].item()
+        return self._buffer[offset:offset + length]
+
+
+class ReportStore:
+    """
+    Gives access to the store of the current dataset generation, mapping it the
+    first time it is needed and whenever the generation changes.
+
+    A generation without a (valid) store is remembered too, with the signature of its
+    store file, so the lookups of every request miss without taking the lock until the
+    generation or the file changes (e.g. when the materialization finishes).
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._generation = None
+        self._file = None
+        self._missing = None
+
+    def current(self, generation: int | None = None) -> ReportFile | None:
+        """
+        Returns the store of the current generation, or None if it was not
+        materialized (yet).
+        """
+        generation = current_generation() if generation is None else generation
+
+        if self._generation == generation:
+            if self._file is not None or report_signature(generation) == self._missing:
+                return self._file
+
+        with self._lock:
+            signature = report_signature(generation)
+
+            if self._generation != generation or (
+                    self._file is None and signature != self._missing
+            ):
+                try:
+                    self._file = ReportFile(generation)
+                except (FileNotFoundError, ValueError):
+                    self._file = None
+
+                self._generation, self._missing = generation, signature
+
+            return self._file
+
+    def get(
+            self, route: str, enrollment: str, partial: int | None, rank: int | None,
+            generation: int | None = None
+    ) -> bytes | None:
+        """
+        Returns the materialized body of a request, or None on a miss.
+        """
+        key = report_key(route, enrollment, partial, rank)
+        store = self.current(generation) if key is not None else None
+
+        return None if store is None else store.get(key)
+
+
+reports = ReportStore()
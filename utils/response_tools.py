@@ -0,0 +1,187 @@
+"""
+This module provides the response layer of the API: JSON serialization with `orjson` and
+content-coding negotiation (brotli and gzip) with pre-encoded bodies.
+
+Key Features:
+- `dumps`: Serializes a payload to compact UTF-8 JSON with `orjson`.
+- `negotiate`: Picks the best content-coding a client accepts (`Accept-Encoding`,
+  with q-values), preferring brotli, then gzip, then identity.
+- `EncodedBody`: A serialized body together with its compressed variants, built lazily:
+  a variant is compressed the first time a client negotiates its coding, and kept.
+  Cacheable payloads are stored as `EncodedBody` objects, so compression happens at
+  most once per payload and coding, and only for the codings that are served.
+- `encoded_response`: Builds the response of an `EncodedBody` for a content-coding.
+- `StreamSink`: A write-only file drained chunk by chunk, to stream the output of file
+  writers (Parquet, ZIP) as it is produced.
+
+Brotli is optional: without the `brotli` package, only gzip and identity are offered.
+Bodies smaller than `MIN_COMPRESS_SIZE` are never compressed.
+"""
+
+import gzip
+from io import RawIOBase
+import orjson
+from fastapi.responses import Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+MIN_COMPRESS_SIZE = 512
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+ENCODERS = {"gzip": lambda body: gzip.compress(body, GZIP_LEVEL, mtime=0)}
+
+if brotli is not None:
+    ENCODERS["br"] = lambda body: brotli.compress(body, quality=BROTLI_QUALITY)
+
+# Server preference when a client accepts several codings with the same q-value.
+PREFERENCE = ("br", "gzip", "identity")
+
+
+def dumps(content) -> bytes:
+    """
+    Serializes a payload to JSON bytes with `orjson`.
+    """
+    return orjson.dumps(content)
+
+
+def negotiate(accept_encoding: str | None) -> str:
+    """
+    Picks the content-coding of a response from the `Accept-Encoding` header.
+
+    Args:
+        accept_encoding (str | None): The header sent by the client.
+
+    Returns:
+        str: "br", "gzip" or "identity".
+    """
+    if not accept_encoding:
+        return "identity"
+
+    weights = {}
+
+    for item in accept_encoding.split(","):
+        coding, _, parameters = item.strip().partition(";")
+        weight = 1.0
+
+        if parameters.strip().startswith("q="):
+            try:
+                weight = float(parameters.strip()[2:])
+            except ValueError:
+                weight = 0.0
+
+        weights[coding.strip().lower()] = weight
+
+    wildcard = weights.get("*")
+    best, best_weight = "identity", 0.0
+
+    for coding in PREFERENCE:
+        if coding != "identity" and coding not in ENCODERS:
+            continue
+
+        weight = weights.get(coding, wildcard if wildcard is not None else 0.0)
+
+        if weight > best_weight:
+            best, best_weight = coding, weight
+
+    return best
+
+
+class EncodedBody:
+    """
+    A serialized JSON body and its compressed variants, compressed on first use.
+
+    Attributes:
+        variants (dict[str, bytes | None]): Bytes of the body by content-coding, for the
+        codings negotiated so far (None when compressing did not make it smaller).
+        size (int): Bytes the body may take with every variant, charged by the cache up
+        front (a compressed variant is only kept when it is smaller than the body).
+    """
+
+    def __init__(self, body: bytes) -> None:
+        """
+        Keeps the body; nothing is compressed until a coding is negotiated.
+
+        Args:
+            body (bytes): The serialized JSON body.
+        """
+        self.variants = {"identity": body}
+        self.compressible = len(body) >= MIN_COMPRESS_SIZE
+        self.size = len(body) * (1 + len(ENCODERS) if self.compressible else 1)
+
+    def variant(self, coding: str) -> bytes | None:
+        """
+        Returns the bytes of the body for a content-coding, compressing and keeping them
+        the first time, or None if compressing does not make the body smaller.
+        """
+        if coding not in self.variants:
+            body = self.variants["identity"]
+            compressed = ENCODERS[coding](body)
+            self.variants[coding] = compressed if len(compressed) < len(body) else None
+
+        return self.variants[coding]
+
+    def coding(self, accept_encoding: str | None) -> str:
+        """
+        Returns the content-coding to serve to a client, compressing the body for it if
+        needed.
+        """
+        coding = negotiate(accept_encoding)
+
+        if coding == "identity" or not self.compressible or self.variant(coding) is None:
+            return "identity"
+        return coding
+
+
+def encoded_response(body: EncodedBody, coding: str, headers: dict | None = None) -> Response:
+    """
+    Builds a JSON response with the variant of a body for a content-coding.
+
+    Args:
+        body (EncodedBody): The pre-encoded body.
+        coding (str): The content-coding chosen with `EncodedBody.coding`.
+        headers (dict | None): Extra headers of the response.
+
+    Returns:
+        Response: The response, with `Content-Encoding` when compressed.
+    """
+    headers = dict(headers or {})
+
+    if coding != "identity":
+        headers["Content-Encoding"] = coding
+
+    return Response(
+        content=body.variant(coding), status_code=200, headers=headers,
+        media_type="application/json"
+    )
+
+
+class StreamSink(RawIOBase):
+    """
+    Write-only file that keeps what was written until it is drained, so file writers
+    (e.g. Parquet or ZIP) can be streamed part by part.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
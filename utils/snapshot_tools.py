@@ -0,0 +1,287 @@
+"""
+This module provides a read-side snapshot of the read-only tables of the system
+(`alumnos.dbf`, `cargas.dbf` and `asignaturas.dbf`).
+
+The tables are loaded once through the model layer and kept in memory as compact
+tuples with hash indexes, so the hot read endpoints can resolve a student, their
+academic load or a subject in O(1) instead of scanning the DBF files per request.
+
+Key Features:
+- Hash indexes on `MATRICULA` and `CURP` (students), (`GRADO`, `GRUPO`) (groups) and
+  `MATRICULA` (academic loads).
+- The subject catalog (`utils.catalog_tools.SubjectCatalog`), indexed by `CLAVE_IN`.
+- Lookups return detached `SnapshotRecord` copies, so callers (e.g. `Ratings`) can
+  mutate them without touching the shared snapshot.
+- The snapshot is keyed by the dataset generation (`utils.dataset_tools`) and rebuilt
+  only when a new upload is promoted.
+- Every worker builds it ahead of the requests: at startup and from a watcher thread
+  that polls the generation (`SnapshotManager.watch`), so a request does not pay for
+  the build under its deadline (`Config.DATA_TIMEOUT`).
+
+Usage:
+    snapshot = snapshots.current()
+    student = snapshot.get_student("22A0710217M0001")
+"""
+
+from threading import Lock, Thread
+from time import sleep
+from errors.errors import NotFoundStudent
+from models.student_model import ALUMNO
+from models.load_model import CARGA
+from models.topic_model import ASIGNATURA
+from services.rebuild_services import normalize
+from utils.catalog_tools import SubjectCatalog
+from utils.dataset_tools import current_generation
+from utils.logging_config import app_logger
+
+
+class SnapshotRecord:
+    """
+    Detached, mutable view of a snapshot row.
+
+    It mimics the parts of the `dbfmapper` model interface the services rely on:
+    attribute access to the fields and `to_repr()`.
+    """
+
+    def __init__(self, **fields) -> None:
+        self.__dict__.update(fields)
+
+    def to_repr(self) -> dict:
+        """
+        Returns the record (and any attribute added later, like `CARGA` or
+        `DETALLES`) as a dictionary.
+
+        Returns:
+            dict: The record representation.
+        """
+        return dict(self.__dict__)
+
+
+class Table:
+    """
+    Compact in-memory copy of a DBF table: one field-name tuple shared by all rows,
+    which are stored as tuples.
+
+    Attributes:
+        fields (tuple[str]): Ordered field names of the table.
+        rows (list[tuple]): Row values, in the same order as `fields`.
+    """
+
+    def __init__(self, records: list[dict]) -> None:
+        self.fields = tuple(records[0]) if records else ()
+        self.rows = [tuple(record.values()) for record in records]
+
+    def position(self, field: str) -> int:
+        """
+        Returns the position of a field inside the row tuples.
+        """
+        return self.fields.index(field)
+
+    def as_dict(self, row: tuple) -> dict:
+        """
+        Materializes a row tuple as a new dictionary.
+        """
+        return dict(zip(self.fields, row))
+
+
+class Snapshot:
+    """
+    Immutable, indexed copy of the student, academic load and subject tables.
+
+    Attributes:
+        generation (int): Dataset generation the snapshot was built from.
+        students (Table): Rows of `alumnos.dbf`.
+        loads (Table): Rows of `cargas.dbf`.
+        catalog (SubjectCatalog): Subjects of `asignaturas.dbf` by `CLAVE_IN`.
+    """
+
+    def __init__(
+            self, generation: int, students: list[dict], loads: list[dict], subjects: list[dict]
+    ) -> None:
+        self.generation = generation
+        self.students = Table(students)
+        self.loads = Table(loads)
+        self.catalog = SubjectCatalog(subjects)
+
+        self._by_enrollment = self._index(self.students, "MATRICULA")
+        self._by_curp = self._index(self.students, "CURP")
+        self._loads_by_enrollment = self._group(self.loads, "MATRICULA")
+        self._groups = self._index_groups(self.students)
+
+    @staticmethod
+    def _index(table: Table, field: str) -> dict:
+        """
+        Builds a unique hash index; on duplicated keys the last row wins.
+        """
+        if not table.rows:
+            return {}
+
+        position = table.position(field)
+        return {row[position]: row for row in table.rows}
+
+    @staticmethod
+    def _group(table: Table, field: str) -> dict:
+        """
+        Builds a hash index that groups every row sharing the same key,
+        preserving the original record order.
+        """
+        groups = {}
+
+        if not table.rows:
+            return groups
+
+        position = table.position(field)
+
+        for row in table.rows:
+            groups.setdefault(row[position], []).append(row)
+
+        return {key: tuple(rows) for key, rows in groups.items()}
+
+    @staticmethod
+    def _index_groups(table: Table) -> dict:
+        """
+        Builds the enrollments of every (`GRADO`, `GRUPO`), in file order and without
+        duplicates.
+        """
+        groups = {}
+
+        if not table.rows:
+            return groups
+
+        enrollment, grade, group = (
+            table.position(field) for field in ("MATRICULA", "GRADO", "GRUPO")
+        )
+
+        for row in table.rows:
+            key = (normalize(row[grade]), normalize(row[group]))
+            groups.setdefault(key, {})[row[enrollment]] = None
+
+        return {key: tuple(enrollments) for key, enrollments in groups.items()}
+
+    def get_student(self, enrollment: str) -> SnapshotRecord:
+        """
+        Fetches a student by enrollment number (MATRICULA).
+
+        Raises:
+            NotFoundStudent: If there is no student with that enrollment.
+        """
+        row = self._by_enrollment.get(enrollment)
+
+        if row is None:
+            raise NotFoundStudent()
+        return SnapshotRecord(**self.students.as_dict(row))
+
+    def get_student_by_curp(self, curp: str) -> SnapshotRecord:
+        """
+        Fetches a student by CURP.
+
+        Raises:
+            NotFoundStudent: If there is no student with that CURP.
+        """
+        row = self._by_curp.get(curp)
+
+        if row is None:
+            raise NotFoundStudent()
+        return SnapshotRecord(**self.students.as_dict(row))
+
+    def get_group(self, grade: int | str, group: str) -> tuple[str]:
+        """
+        Returns the enrollments of the students of a (`GRADO`, `GRUPO`), in file order.
+        """
+        return self._groups.get((normalize(grade), normalize(group)), ())
+
+    def get_grade(self, grade: int | str) -> tuple[str]:
+        """
+        Returns the enrollments of the students of every group of a `GRADO`, by group.
+        """
+        grade = normalize(grade)
+        return tuple(
+            enrollment
+            for key in sorted(key for key in self._groups if key[0] == grade)
+            for enrollment in self._groups[key]
+        )
+
+    def get_academic_load(self, enrollment: str) -> list[dict]:
+        """
+        Returns fresh copies of the student's academic load (CARGA) rows.
+        """
+        return [
+            self.loads.as_dict(row)
+            for row in self._loads_by_enrollment.get(enrollment, ())
+        ]
+
+
+class SnapshotManager:
+    """
+    Keeps the current `Snapshot` of the process and rebuilds it when the
+    dataset generation changes.
+
+    The generation check is a `stat()` of the generation file, so every worker picks
+    up a new upload without a restart. Requests keep the snapshot they started with.
+    """
+
+    models = (ALUMNO, CARGA, ASIGNATURA)
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._key = None
+        self._snapshot = None
+        self._watcher = None
+
+    def current(self) -> Snapshot:
+        """
+        Returns the snapshot for the current dataset generation, building it
+        if needed.
+
+        Returns:
+            Snapshot: The up-to-date snapshot.
+        """
+        key = current_generation()
+
+        if self._key == key:
+            return self._snapshot
+
+        with self._lock:
+            if self._key != key:
+                self._snapshot = Snapshot(key, *(
+                    model().get_all(easy_view=True) for model in self.models
+                ))
+                self._key = key
+
+            return self._snapshot
+
+    def watch(self, interval: float) -> None:
+        """
+        Starts (once per process) a daemon thread that builds the snapshot of every new
+        dataset generation as soon as it is promoted, before a request needs it. A
+        generation whose build failed is not retried by the watcher.
+
+        Args:
+            interval (float): Seconds between two checks of the generation (0 disables
+            the watcher).
+        """
+        if interval <= 0 or self._watcher is not None:
+            return
+
+        self._watcher = Thread(
+            target=self._watch, args=(interval,), name="snapshot-watcher", daemon=True
+        )
+        self._watcher.start()
+
+    def _watch(self, interval: float) -> None:
+        failed = None
+
+        while True:
+            try:
+                key = current_generation()
+
+                if key not in (self._key, failed):
+                    failed = key
+                    self.current()
+                    failed = None
+            except Exception as e:
+                app_logger.error(f"Error on <SnapshotManager.watch>: {str(e)}")
+
+            sleep(interval)
+
+snapshots = SnapshotManager()
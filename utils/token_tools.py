@@ -8,7 +8,9 @@ The module includes the following functionalities:
    - A subclass of `HTTPBearer` that overrides the `__call__` method to extract the
      authorization token from incoming requests.
    - If the token is missing from the request, it raises a `NotFoundTokenError`.
-   - If the token is found, it stores the token in the request's state.
+   - If the token is found, it verifies it and stores the token and its claims in the
+     request's state (`request.state.token`, `request.state.claims`), so the routes reuse
+     that verification instead of decoding the token again.
 
 2. **create_token**:
    - This function generates a JSON Web Token (JWT) using the provided payload.
@@ -20,6 +22,8 @@ The module includes the following functionalities:
    - If the token is expired, it raises an `ExpiredTokenError`.
    - If the token is invalid or the signature doesn't match, it raises an `InvalidTokenError`.
    - If valid, it returns the decoded payload of the token.
+   - Verified tokens are kept in a bounded cache (`TokenCache`), keyed by a digest of the
+     token, until their `exp`: repeat requests with the same token skip the signature check.
 
 Dependencies:
 - `fastapi.requests.Request`: For extracting and handling HTTP request objects.
@@ -31,7 +35,11 @@ The utility functions and custom bearer class allow FastAPI to securely handle a
 tokens.
 """
 
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from hashlib import blake2b
+from threading import Lock
+from time import time
 from fastapi.requests import Request
 from jose import jwt, JWTError
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -39,6 +47,86 @@ from errors.errors import NotFoundTokenError, ExpiredTokenError, InvalidTokenErr
 from utils.config_secrets import Config
 
 
+class TokenCache:
+    """
+    Bounded LRU cache of verified tokens.
+
+    Entries are keyed by a digest of the token (the tokens themselves are not kept) and
+    hold the decoded claims until the `exp` of the token. Tokens without `exp` and tokens
+    that failed verification are never cached.
+
+    Attributes:
+        max_entries (int): Maximum number of tokens kept.
+        hits (int): Verifications served from the cache.
+        misses (int): Verifications that had to decode the token.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[dict, int]] = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        return blake2b(token.encode(), digest_size=16).digest()
+
+    def get(self, token: str) -> dict | None:
+        """
+        Returns a copy of the claims of a verified token, or None on a miss.
+
+        Raises:
+            ExpiredTokenError: If the token was verified but its `exp` has passed.
+        """
+        key = self.digest(token)
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            claims, expire = entry
+
+            if expire < int(time()):
+                del self._entries[key]
+                raise ExpiredTokenError()
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(claims)
+
+    def put(self, token: str, claims: dict) -> None:
+        """
+        Caches the claims of a verified token until its `exp`.
+        """
+        expire = claims.get("exp")
+
+        if not isinstance(expire, (int, float)) or self.max_entries <= 0:
+            return
+
+        key = self.digest(token)
+
+        with self._lock:
+            self._entries[key] = (dict(claims), int(expire))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+tokens = TokenCache(Config.TOKEN_CACHE_SIZE)
+
+
 class CustomHTTPBearer(HTTPBearer):
     """
     A custom HTTPBearer class to handle bearer token authorization in FastAPI.
@@ -55,13 +143,16 @@ class CustomHTTPBearer(HTTPBearer):
 
     async def __call__(self, request: Request) -> HTTPAuthorizationCredentials:
         """
-        Extracts the Bearer token from the request headers and assigns it to the request's state.
+        Extracts and verifies the Bearer token from the request headers and assigns it,
+        with its claims, to the request's state.
 
         Args:
             request (Request): The incoming HTTP request object.
 
         Raises:
             NotFoundTokenError: If the authorization token is missing from the request.
+            ExpiredTokenError: If the token has expired.
+            InvalidTokenError: If the token is invalid or the signature doesn't match.
 
         Returns:
             HTTPAuthorizationCredentials: The credentials object containing the token.
@@ -73,6 +164,7 @@ class CustomHTTPBearer(HTTPBearer):
             raise NotFoundTokenError()
 
         request.state.token = credentials.credentials
+        request.state.claims = verify_token(credentials.credentials)
         return credentials
 
 
@@ -106,7 +198,8 @@ def verify_token(token: str) -> dict:
 
     This function attempts to decode the provided JWT token using the HS256 algorithm.
     If the token is expired or invalid, it raises the corresponding error
-    (`ExpiredTokenError` or `InvalidTokenError`).
+    (`ExpiredTokenError` or `InvalidTokenError`). Tokens already verified are served
+    from the token cache (`tokens`) until they expire, without decoding them again.
 
     Args:
         token (str): The JWT token to be verified and decoded.
@@ -118,8 +211,13 @@ def verify_token(token: str) -> dict:
     Returns:
         dict: The decoded payload of the JWT token if valid.
     """
+    claims = tokens.get(token)
+
+    if claims is not None:
+        return claims
+
     try:
-        return jwt.decode(
+        claims = jwt.decode(
             token, Config.SECRET_KEY,
             algorithms=[Config.ALGORITHM]
         )
@@ -128,3 +226,6 @@ def verify_token(token: str) -> dict:
         if str(e) == "Signature has expired.":
             raise ExpiredTokenError() from e
         raise InvalidTokenError() from e
+
+    tokens.put(token, claims)
+    return claims
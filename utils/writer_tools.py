@@ -0,0 +1,198 @@
+"""
+This module provides `BulkWriter`, an all-or-nothing batch writer for the DBF tables the
+system writes to (mainly `HISTORIALES.dbf`).
+
+Instead of one model `.save()` per record, which reopens and rewrites part of the file
+every time, the writer collects thousands of inserts, updates and deletes and applies
+them with a single table open:
+1. The live table is copied to the staging directory, under the dataset lock.
+2. Updates and deletes are applied by record number and inserts are appended
+   sequentially; deleted records are compacted with a single `pack()`.
+3. The copy is fsynced and atomically renamed over the live table, and the dataset
+   generation is bumped (see `utils.dataset_tools`).
+
+A crash or an error at any point before the rename leaves the live table untouched,
+so a batch can never be partially applied.
+
+Values are coerced to the type of each column: numbers accept floats, ints or their
+text form ("None" or blank for missing values); character columns store the text form,
+keeping the "None" sentinel the model layer writes for missing values.
+"""
+
+from datetime import date
+from os import path, remove, replace, stat, fsync
+from shutil import copyfile
+import dbf
+from errors.errors import ServerError
+from utils.dataset_tools import DatasetLock, staging_file, bump_generation, fsync_dir
+
+
+def table_signature(table_path: str) -> tuple:
+    """
+    Returns the (inode, mtime, size) signature of a table, used to detect that it
+    changed between planning a batch and committing it.
+    """
+    info = stat(table_path)
+    return info.st_ino, info.st_mtime_ns, info.st_size
+
+
+def coerce(value, field_type: str, length: int, decimals: int):
+    """
+    Converts a value to what the `dbf` library expects for a column.
+
+    Args:
+        value: The value to store.
+        field_type (str): DBF type code of the column.
+        length (int): Width of the column.
+        decimals (int): Decimal places of numeric columns.
+
+    Returns:
+        The coerced value.
+    """
+    blank = value is None or (isinstance(value, str) and value.strip() in ("", "None"))
+
+    if field_type in "NF":
+        if blank:
+            return None
+        return int(float(value)) if decimals == 0 else float(value)
+
+    if field_type == "L":
+        return None if blank else value in (True, "T", "t", "Y", "y", "True")
+
+    if field_type == "D":
+        if blank or isinstance(value, date):
+            return None if blank else value
+        return date.fromisoformat(str(value))
+
+    return ("None" if value is None else str(value))[:length]
+
+
+class BulkWriter:
+    """
+    All-or-nothing batch of inserts, updates and deletes over one DBF table.
+
+    Attributes:
+        table_path (str): Path of the live table.
+        expected (tuple | None): Signature the table must still have at commit time.
+        inserts (list[dict]): Records to append.
+        updates (dict[int, dict]): Changes by record number.
+        deletes (set[int]): Record numbers to delete.
+    """
+
+    def __init__(self, table_path: str, expected: tuple | None = None) -> None:
+        """
+        Args:
+            table_path (str): Path of the live table.
+            expected (tuple | None): Optional `table_signature` taken when the batch was
+            planned; the commit fails if the table changed since then.
+        """
+        self.table_path = table_path
+        self.expected = expected
+        self.inserts = []
+        self.updates = {}
+        self.deletes = set()
+
+    def insert(self, record: dict) -> None:
+        """
+        Queues a record to append. Keys that are not columns of the table are ignored.
+        """
+        self.inserts.append(record)
+
+    def update(self, number: int, changes: dict) -> None:
+        """
+        Queues changes to the record with physical number `number`.
+        """
+        self.updates.setdefault(number, {}).update(changes)
+
+    def delete(self, number: int) -> None:
+        """
+        Queues the deletion of the record with physical number `number`.
+        """
+        self.deletes.add(number)
+
+    def _apply(self, table: dbf.Table) -> None:
+        """
+        Applies the queued operations to an open table.
+        """
+        info = {
+            name.upper(): table.field_info(name) for name in table.field_names
+        }
+
+        def values(record: dict) -> dict:
+            return {
+                field.lower(): coerce(
+                    value, chr(info[field.upper()].field_type),
+                    info[field.upper()].length, info[field.upper()].decimal
+                )
+                for field, value in record.items() if field.upper() in info
+            }
+
+        for number, changes in self.updates.items():
+            dbf.write(table[number], **values(changes))
+
+        for number in self.deletes:
+            dbf.delete(table[number])
+
+        if self.deletes:
+            table.pack()
+
+        for record in self.inserts:
+            table.append(values(record))
+
+    def commit(self) -> dict:
+        """
+        Applies the whole batch atomically and bumps the dataset generation.
+
+        Returns:
+            dict: The number of inserts, updates and deletes applied.
+
+        Raises:
+            ServerError: If the table changed since the batch was planned or the
+            batch could not be applied. The live table is left untouched.
+        """
+        summary = {
+            "inserts": len(self.inserts),
+            "updates": len(self.updates),
+            "deletes": len(self.deletes),
+        }
+
+        if not any(summary.values()):
+            return summary
+
+        name = path.basename(self.table_path)
+
+        with DatasetLock():
+            if self.expected is not None and table_signature(self.table_path) != self.expected:
+                raise ServerError(f"The table {name} changed while the batch was planned")
+
+            staged = staging_file(name)
+
+            try:
+                copyfile(self.table_path, staged)
+                table = dbf.Table(staged)
+                table.open(mode=dbf.READ_WRITE)
+
+                try:
+                    self._apply(table)
+                finally:
+                    table.close()
+
+                with open(staged, "rb+") as file:
+                    fsync(file.fileno())
+
+                replace(staged, self.table_path)
+                fsync_dir(path.dirname(self.table_path))
+
+            except ServerError:
+                raise
+
+            except Exception as e:
+                raise ServerError(str(e)) from e
+
+            finally:
+                if path.exists(staged):
+                    remove(staged)
+
+            bump_generation(name, **summary)
+
+        return summary